@@ -1,90 +1,139 @@
 import mysql.connector
-from mysql.connector import Error
 from dotenv import load_dotenv
+from contextlib import ExitStack, contextmanager
+from importlib import import_module
 import os
+import sys
+import time
 import pandas as pd
 import streamlit as st
 
-from components.dashboard import dashboard_page
-from components.reg import registration_page
-from components.admin import admin_page
-from components.reports import reports_page
-from components.view_table import table_viewer_page
+load_dotenv()
+
+from db.pool import get_pool, PoolTimeoutError
+from db.routing import get_router, routing_session, READ_ONLY_PROCEDURES, READ_ONLY_FUNCTIONS
+from db.cache import query_cache
+from db.statements import call_function
+from db.instrumentation import db_metrics, read_sql_query
+from db.loader import read_frame
 
 st.set_page_config(page_title="Campus Event Management", layout="wide")
-load_dotenv()
 
 @st.cache_resource
-def get_db_connection():
-    try:
-        return mysql.connector.connect(
-            host=os.getenv("DB_HOST"),
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASSWORD"),
-            database=os.getenv("DB_NAME"),
-            # IMPORTANT: autocommit=False for explicit transaction control in execute_procedure
-            autocommit=False 
-        )
-    except mysql.connector.Error as err:
-        st.error(f"❌ DB Connection Error: {err}")
-        return None
-
-def db_conn():
-    conn = get_db_connection()
-    if not conn:
-        st.stop()
-
-    try:
-        if not conn.is_connected():
-            conn.reconnect(attempts=3, delay=2)
-        return conn
-    except mysql.connector.Error as err:
-        st.error(f"❌ Database Error: {err}")
-        st.stop()
+def get_db_pool():
+    # One pool per server process; each rerun checks out its own connection from it
+    return get_pool()
+
+@st.cache_resource
+def get_db_router():
+    # Read replicas (DB_REPLICA_HOSTS); without any, every read stays on the primary pool
+    return get_router()
+
+@contextmanager
+def db_conn(read_only=False):
+    # Read-only pages get a replica connection when one is usable, otherwise a primary one
+    # Only the checkout is reported here: errors raised while the page renders are the page's own
+    source = get_db_router().read_connection() if read_only else get_db_pool().connection()
+    with ExitStack() as stack:
+        try:
+            conn = stack.enter_context(source)
+        except PoolTimeoutError as err:
+            st.error(f"❌ Database is busy, please try again: {err}")
+            st.stop()
+        except mysql.connector.Error as err:
+            st.error(f"❌ DB Connection Error: {err}")
+            st.stop()
+        yield conn
 
 # Helper: Execute Stored Procedure (Modified to return Status='Success' for DML)
+# Read-only procedures may run on a replica; any other procedure runs on the primary
 def execute_procedure(conn, procedure_name, args=None):
-    try:
-        cursor = conn.cursor()
-        if args:
-            cursor.callproc(procedure_name, args)
-        else:
-            cursor.callproc(procedure_name)
-        
-        results = []
-        columns = None
-        for result in cursor.stored_results():
-            if result.description:
-                columns = [col[0] for col in result.description]
-                results.extend(result.fetchall())
-
-        conn.commit() # Explicitly commit after successful procedure execution
-
-        cursor.close()
-
-        if results:
-            return pd.DataFrame(results, columns=columns), "Success"
-        # For DML procedures that return no rows (like UPDATE), return dummy data
-        return pd.DataFrame(columns=columns or ['Status']), "Success" 
-    except Exception as e:
-        conn.rollback() # Rollback on error
-        return None, str(e)
-
-# Helper: Execute Function
-def execute_function(conn, func_call, params=None):
-    try:
-        cursor = conn.cursor()
-        if params: 
-            param_str = ', '.join(map(str, params))
-            query = f"SELECT {func_call}({param_str}) AS result"
-        else: query = f"SELECT {func_call} AS result"
-        cursor.execute(query)
-        result = cursor.fetchone()[0]
-        cursor.close()
-        return result
-    except Exception as e:
-        # st.error(f"❌ Function execution failed: {e}") # Suppress error for cleaner UI
-        return None
+    router = get_db_router()
+    route = router.read_connection(conn) if procedure_name in READ_ONLY_PROCEDURES else router.write_connection(conn)
+    with route as conn, db_metrics.timed("procedure", procedure_name) as call:
+        try:
+            cursor = conn.cursor()
+            if args:
+                cursor.callproc(procedure_name, args)
+            else:
+                cursor.callproc(procedure_name)
+            
+            # Each result set is read in chunks straight into typed columns (db/loader.py)
+            frames = [read_frame(result) for result in cursor.stored_results() if result.description]
+
+            conn.commit() # Explicitly commit after successful procedure execution
+
+            cursor.close()
+            call.rows = sum(len(df) for df in frames)
+
+            if frames:
+                return (pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]), "Success"
+            # For DML procedures that return no rows (like UPDATE), return dummy data
+            return pd.DataFrame(columns=['Status']), "Success" 
+        except Exception as e:
+            conn.rollback() # Rollback on error
+            call.error = e
+            return None, str(e)
+
+# Helper: Execute Function, e.g. execute_function(conn, "GetEventName", (3001,))
+# Arguments are bound server-side and the prepared statement is reused per connection
+def execute_function(conn, func_name, args=()):
+    router = get_db_router()
+    route = router.read_connection(conn) if func_name in READ_ONLY_FUNCTIONS else router.primary_connection(conn)
+    with route as conn, db_metrics.timed("function", func_name) as call:
+        try:
+            result = call_function(conn, func_name, args)
+            call.rows = 1
+            return result
+        except Exception as e:
+            # Not shown on the page (cleaner UI) but recorded on the Performance page
+            call.error = e
+            return None
+
+# Helper: Cached Stored Procedure read (shared across sessions until TTL expiry or invalidation)
+# Cache fills read the primary: a lagging replica read right after an invalidation would keep
+# the pre-write result cached for every session until the TTL, and fills are rare anyway
+def cached_procedure(conn, procedure_name, args=None, tables=()):
+    key = query_cache.make_key("procedure", procedure_name, args)
+    df = query_cache.get(key)
+    if df is None:
+        with get_db_router().primary_connection(conn) as primary, routing_session(primary_only=True):
+            df, status = execute_procedure(primary, procedure_name, args)
+        if status != "Success":
+            return df, status
+        query_cache.put(key, df, tables)
+    return df.copy(), "Success"
+
+# Helper: Cached SQL read (raises like pd.read_sql_query on failure, errors are never cached)
+def cached_query(conn, query, params=None, tables=()):
+    key = query_cache.make_key("query", query, params)
+    df = query_cache.get(key)
+    if df is None:
+        with get_db_router().primary_connection(conn) as primary:
+            df = read_sql_query(query, primary, params=params)
+        query_cache.put(key, df, tables)
+    return df.copy()
+
+
+# Page modules are imported on first navigation (then reused from sys.modules), so a cold
+# start only pays for the page actually opened
+PAGES = {
+    "Dashboard": ("components.dashboard", "dashboard_page"),
+    "Registration": ("components.reg", "registration_page"),
+    "Reports": ("components.reports", "reports_page"),
+    "Search": ("components.search", "search_page"),
+    "Table Viewer": ("components.view_table", "table_viewer_page"),
+    "Admin": ("components.admin", "admin_page"),
+    "Performance": ("components.performance", "performance_page"),
+}
+
+def load_page(page):
+    module_name, func_name = PAGES[page]
+    if module_name not in sys.modules:
+        started = time.perf_counter()
+        import_module(module_name)
+        db_metrics.record_import(module_name, page, (time.perf_counter() - started) * 1000)
+    return getattr(sys.modules[module_name], func_name)
 
 
 # --- LOGIN LOGIC ---
@@ -117,40 +166,48 @@ def login_form():
         st.session_state['user_role'] = 'Guest'
         st.rerun()
 
-# Establish DB Connection and Helper Functions
-connection = db_conn()
-helper_funcs = {"execute_procedure": execute_procedure, "execute_function": execute_function}
+# Helper Functions shared by every page
+helper_funcs = {
+    "execute_procedure": execute_procedure,
+    "execute_function": execute_function,
+    "cached_procedure": cached_procedure,
+    "cached_query": cached_query,
+}
 
 # --- NAVIGATION ---
 st.sidebar.title("Navigation")
-menu_options = ["Dashboard", "Registration", "Reports", "Table Viewer"]
+menu_options = ["Dashboard", "Registration", "Reports", "Search", "Table Viewer"]
 
 if st.session_state['user_role'] == 'Admin':
-    menu_options.append("Admin")
+    menu_options += ["Admin", "Performance"]
     page = st.sidebar.radio("Go To", menu_options, index=0)
-    
-    # Render page based on selection
-    if page == "Dashboard":
-        dashboard_page(connection, **helper_funcs)
-    elif page == "Registration":
-        registration_page(connection, **helper_funcs)
-    elif page == "Admin":
-        admin_page(connection, **helper_funcs)
-    elif page == "Reports":
-        reports_page(connection, **helper_funcs)
-    elif page == "Table Viewer":
-        table_viewer_page(connection)
-        
 else: # Guest/Unauthenticated view
     login_form()
-    
-    # Guests can only access Dashboard, Registration, and Reports
-    guest_options = ["Dashboard", "Registration", "Reports"]
+
+    # Guests can only access Dashboard, Registration, Reports and Search
+    guest_options = ["Dashboard", "Registration", "Reports", "Search"]
     page = st.sidebar.radio("Go To", guest_options, index=0)
 
-    if page == "Dashboard":
-        dashboard_page(connection, **helper_funcs)
-    elif page == "Registration":
-        registration_page(connection, **helper_funcs)
-    elif page == "Reports":
-        reports_page(connection, **helper_funcs)
\ No newline at end of file
+# Pages that only read run on a replica connection when one is usable. Pages that write keep every
+# read on the primary, and so does a session for DB_REPLICA_STICKY_SECONDS after it was on one,
+# so users always see their own registrations and edits.
+READ_ONLY_PAGES = {"Reports", "Search", "Table Viewer"}
+WRITE_PAGES = {"Registration", "Admin"}
+
+# Render page based on selection; the rerun time recorded for the page includes its first import,
+# and the connection is checked out for this rerun only, after the page module is loaded
+with db_metrics.page_scope(page), routing_session(st.session_state.get("last_write"), primary_only=page in WRITE_PAGES) as routing:
+    render_page = load_page(page)
+    if page == "Performance":
+        # In-process metrics only; no connection needed
+        render_page()
+    else:
+        with db_conn(read_only=page in READ_ONLY_PAGES) as connection:
+            if page == "Table Viewer":
+                render_page(connection)
+            else:
+                render_page(connection, **helper_funcs)
+# A rerun of a page that writes counts as a write: not all of its writes go through execute_procedure
+if page in WRITE_PAGES:
+    routing["last_write"] = time.monotonic()
+st.session_state["last_write"] = routing["last_write"]
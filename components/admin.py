@@ -1,29 +1,39 @@
 import streamlit as st
 import pandas as pd
 import mysql.connector
+from datetime import timedelta
 
-def admin_page(conn, execute_procedure, execute_function):
+from db.cache import query_cache
+from db.calendar import venue_calendar, venue_is_free
+from db.bulk_import import import_registrations, REQUIRED_COLUMNS
+from db.instrumentation import read_sql_query
+from db.scheduling import VenueSchedule, parse_schedule, SCHEDULE_COLUMNS
+from db.cancellations import bulk_cancel
+from db.metrics import PAYMENT_STATUSES
+from db.audit import (
+    query_audit_logs, list_partitions, ensure_partitions, archive_partitions, verify_archive,
+    ARCHIVE_FORMATS, DEFAULT_ARCHIVE_FORMAT, AUDIT_ARCHIVE_DIR,
+)
+from components.typeahead import typeahead_select
+
+def admin_page(conn, execute_procedure, execute_function, cached_procedure, cached_query):
     st.title("⚙️ Admin & Setup Operations")
 
     # ====================================================================
     st.subheader("1. New Event Creation")
-    with st.expander("➕ Create a New Event"):
-        with st.form("Add New Event Form"):
-            # Fetch FK references for selection boxes
-            try:
-                clubs_df = pd.read_sql_query("SELECT Club_ID, Club_Name FROM Clubs", conn)
-                venue_df = pd.read_sql_query("SELECT Venue_ID, Venue_Name FROM Venue", conn)
-                faculty_df = pd.read_sql_query("SELECT Faculty_ID, Name FROM Faculty", conn)
-                
-                club_map = clubs_df.set_index('Club_Name')['Club_ID'].to_dict()
-                venue_map = venue_df.set_index('Venue_Name')['Venue_ID'].to_dict()
-                faculty_map = faculty_df.set_index('Name')['Faculty_ID'].to_dict()
-                
-            except Exception as e:
-                st.error(f"Error fetching lookup data: {e}")
-                # Use return instead of st.stop() since st.stop() may be restricted
-                # return
+    # A toggle rather than an expander: expander contents (and these lookups) run on every rerun even when collapsed
+    if st.toggle("➕ Create a New Event", key="show_create_event"):
+        # FK references are searched by name (a few matching rows, not whole tables) outside the
+        # form, since typing inside a form does not rerun the page
+        col_club, col_venue, col_faculty = st.columns(3)
+        with col_club:
+            club = typeahead_select(conn, "club", "Organizing Club", key="new_event_club")
+        with col_venue:
+            venue = typeahead_select(conn, "venue", "Venue", key="new_event_venue")
+        with col_faculty:
+            faculty = typeahead_select(conn, "faculty", "Faculty Incharge", key="new_event_faculty")
 
+        with st.form("Add New Event Form"):
             event_name = st.text_input("Event Name")
             event_type = st.text_input("Event Type (e.g., Workshop, Competition, Seminar)")
             date = st.date_input("Date")
@@ -33,20 +43,14 @@ def admin_page(conn, execute_procedure, execute_function):
             catering = st.radio("Catering Required", ['Yes', 'No'])
             budget = st.number_input("Budget (e.g., 50000.00)", min_value=0.00, value=10000.00)
             
-            # Select boxes using display name but storing ID
-            club_name = st.selectbox("Organizing Club", clubs_df['Club_Name'].tolist())
-            venue_name = st.selectbox("Venue", venue_df['Venue_Name'].tolist())
-            faculty_name = st.selectbox("Faculty Incharge", faculty_df['Name'].tolist())
-
             submitted = st.form_submit_button("Create Event")
 
-            if submitted:
+            if submitted and (club is None or venue is None or faculty is None):
+                st.error("Choose an organizing club, a venue and a faculty in charge above first.")
+            elif submitted:
+                club_id, venue_id, faculty_id = club[0], venue[0], faculty[0]
+                cursor = conn.cursor()
                 try:
-                    club_id = club_map[club_name]
-                    venue_id = venue_map[venue_name]
-                    faculty_id = faculty_map[faculty_name]
-                    
-                    cursor = conn.cursor()
                     cursor.execute(
                         """
                         INSERT INTO Event (Event_Name, Event_Type, Date, Start_Time, End_Time, Catering, Budget, Club_ID, Venue_ID, Faculty_ID)
@@ -55,6 +59,8 @@ def admin_page(conn, execute_procedure, execute_function):
                         (event_name, event_type, date, start_time.strftime("%H:%M:%S"), end_time.strftime("%H:%M:%S"), catering, budget, club_id, venue_id, faculty_id)
                     )
                     conn.commit()
+                    query_cache.invalidate("Event")
+                    venue_calendar.sync(conn, force=True)
                     st.success(f"✅ Event '{event_name}' created successfully with ID {cursor.lastrowid}.")
                 except Exception as e:
                     st.error(f"❌ Failed to create event: {e}")
@@ -77,6 +83,7 @@ def admin_page(conn, execute_procedure, execute_function):
         if submitted:
             df_result, error = execute_procedure(conn, "AssignOrganisingTeamMember", args=(oteam_id, student_id_p9))
             if error == "Success":
+                query_cache.invalidate("OTeam_Members")
                 if df_result is not None and not df_result.empty:
                     st.success(df_result.iloc[0, 0])
                 else:
@@ -94,6 +101,7 @@ def admin_page(conn, execute_procedure, execute_function):
         if submitted:
             df_result, error = execute_procedure(conn, "UpdateTeamBudget", args=(event_id_p6, new_budget))
             if error == "Success":
+                query_cache.invalidate("Event")
                 if df_result is not None and not df_result.empty:
                     st.success(df_result.iloc[0, 0])
                 else:
@@ -114,6 +122,7 @@ def admin_page(conn, execute_procedure, execute_function):
         if submitted:
             df_result, error = execute_procedure(conn, "UpdateFacultyIncharge", args=(event_id, new_faculty_id))
             if error == "Success":
+                query_cache.invalidate("Event")
                 if df_result is not None and not df_result.empty:
                     st.success(df_result.iloc[0, 0])
                 else:
@@ -140,14 +149,17 @@ def admin_page(conn, execute_procedure, execute_function):
                 start_str = new_start_time.strftime("%H:%M:%S")
                 end_str = new_end_time.strftime("%H:%M:%S")
                 
-                # Fetch current venue_id to check availability
-                cursor = conn.cursor()
+                # Fetch current venue_id to check availability (buffered: the check below reads on the same connection)
+                cursor = conn.cursor(buffered=True)
                 cursor.execute("SELECT Venue_ID FROM Event WHERE Event_ID = %s", (event_id_dt,))
                 venue_id_check = cursor.fetchone()[0]
                 
-                venue_ok = execute_function(conn, f"CheckVenueAvailability({venue_id_check}, '{new_date}', '{start_str}', '{end_str}')")
+                # F-4 in the database right before the write, ignoring the event's own current slot; the
+                # venue's day stays locked until the update commits
+                venue_ok = venue_is_free(conn, venue_id_check, new_date, start_str, end_str, exclude_event_id=event_id_dt)
                 
-                if venue_ok == 0:
+                if not venue_ok:
+                    conn.rollback()
                     st.error("❌ Cannot update date/time: New schedule conflicts with another event at the same venue.")
                 else:
                     # Perform the Raw SQL Update
@@ -160,6 +172,8 @@ def admin_page(conn, execute_procedure, execute_function):
                         (new_date, start_str, end_str, event_id_dt)
                     )
                     conn.commit()
+                    query_cache.invalidate("Event")
+                    venue_calendar.sync(conn, force=True)
                     st.success(f"✅ Date/Time updated for Event ID {event_id_dt}. (New Date: {new_date}, {start_str}-{end_str})")
             except Exception as e:
                 conn.rollback()
@@ -174,36 +188,55 @@ def admin_page(conn, execute_procedure, execute_function):
         event_id_v = st.number_input("Event ID", min_value=1, value=3004, key="p8_event")
         new_venue_id = st.number_input("New Venue ID", min_value=1, value=11005, key="p8_venue_id")
 
-        st.caption("--- Availability Check (F-4) ---")
-        # For the check, we need the event's current date/time
-        # Fetch current event details for F-4 check consistency
-        try:
-            current_details = pd.read_sql_query("SELECT Date, Start_Time, End_Time FROM Event WHERE Event_ID = %s", conn, params=(event_id_v,)).iloc[0]
-            check_date = st.date_input("Check Date (current event date)", value=current_details['Date'], key="p8_venue_date")
-            start_time = st.time_input("Start Time (current event start)", value=current_details['Start_Time'], key="p8_venue_start")
-            end_time = st.time_input("End Time (current event end)", value=current_details['End_Time'], key="p8_venue_end")
-            
-            start_str = start_time.strftime("%H:%M:%S")
-            end_str = end_time.strftime("%H:%M:%S")
-            venue_ok = execute_function(conn, f"CheckVenueAvailability({new_venue_id}, '{check_date}', '{start_str}', '{end_str}')") # F-4
-        except Exception:
-            venue_ok = None
-            st.warning("Could not fetch current event details for F-4 check.")
-
-        if venue_ok is not None:
-            if venue_ok == 0:
-                st.warning("⚠️ Venue looks booked at this time.")
-            else:
-                st.info("✅ Venue is available for this time window.")
-        
-        st_submit = st.form_submit_button("Update Venue (P-8)")
+        # F-4 runs against the event's current date/time, only when asked for (not on every rerun)
+        col_chk, col_upd = st.columns(2)
+        check_submit = col_chk.form_submit_button("Check Availability (F-4)")
+        st_submit = col_upd.form_submit_button("Update Venue (P-8)")
+
+        if check_submit:
+            try:
+                current_details = read_sql_query("SELECT Date, Start_Time, End_Time FROM Event WHERE Event_ID = %s", conn, params=(event_id_v,)).iloc[0]
+                start_time = (pd.Timestamp(0) + current_details['Start_Time']).time()
+                end_time = (pd.Timestamp(0) + current_details['End_Time']).time()
+                venue_ok = venue_calendar.is_available(conn, new_venue_id, current_details['Date'], start_time, end_time, exclude_event_id=event_id_v)
+                if venue_ok is None:
+                    venue_ok = execute_function(conn, "CheckVenueAvailability", (int(new_venue_id), current_details['Date'], start_time, end_time)) # F-4
+            except Exception:
+                venue_ok = None
+                st.warning("Could not fetch current event details for F-4 check.")
+
+            if venue_ok is not None:
+                st.caption(f"Event {event_id_v}: {current_details['Date']}, {start_time:%H:%M}-{end_time:%H:%M}")
+                if venue_ok == 0:
+                    st.warning("⚠️ Venue looks booked at this time.")
+                else:
+                    st.info("✅ Venue is available for this time window.")
 
         if st_submit:
-            df_result, error = execute_procedure(conn, "UpdateEventVenue", args=(event_id_v, new_venue_id)) # P-8
-            if error == "Success":
-                st.success(f"Venue updated for Event ID {event_id_v}.")
+            # F-4 in the database right before the move (the check above is only a preview); the
+            # venue's day stays locked until P-8 commits
+            try:
+                cursor = conn.cursor(buffered=True)
+                cursor.execute("SELECT Date, Start_Time, End_Time FROM Event WHERE Event_ID = %s", (event_id_v,))
+                current = cursor.fetchone()
+                cursor.close()
+                venue_ok = current is None or venue_is_free(conn, new_venue_id, *current, exclude_event_id=event_id_v)
+            except Exception as e:
+                venue_ok = None
+                st.error(f"❌ Could not check the venue: {e}")
+
+            if venue_ok is False:
+                st.error("❌ Cannot move the event: the new venue is booked at its time.")
+            if not venue_ok:
+                conn.rollback()
             else:
-                st.error(error)
+                df_result, error = execute_procedure(conn, "UpdateEventVenue", args=(event_id_v, new_venue_id)) # P-8
+                if error == "Success":
+                    query_cache.invalidate("Event")
+                    venue_calendar.sync(conn, force=True)
+                    st.success(f"Venue updated for Event ID {event_id_v}.")
+                else:
+                    st.error(error)
 
     # ====================================================================
     st.subheader("4. Resource Allocation")
@@ -220,9 +253,261 @@ def admin_page(conn, execute_procedure, execute_function):
         if submitted:
             df_result, error = execute_procedure(conn, "AllocateResourceToEvent", args=(event_id_r, resource_name, resource_type, quantity)) # P-3
             if error == "Success":
+                query_cache.invalidate("Resources")
                 if df_result is not None and not df_result.empty:
                     st.success(df_result.iloc[0, 0])
                 else:
                     st.success(f"Resource '{resource_name}' allocated/updated for Event ID {event_id_r}.")
             else:
-                st.error(error)
\ No newline at end of file
+                st.error(error)
+
+    # ====================================================================
+    st.subheader("5. Bulk Registration Import")
+    with st.expander("📤 Import Registrations from CSV"):
+        st.caption(f"Columns: {', '.join(REQUIRED_COLUMNS)}, Team_Name (optional; rows sharing Event_ID and Team_Name form one team and must be kept together, blank = solo)")
+        upload = st.file_uploader("Registrations CSV", type=["csv"], key="bulk_reg_csv")
+        chunk_size = st.number_input("Teams per transaction", min_value=1, max_value=5000, value=500, key="bulk_reg_chunk")
+
+        if upload is not None and st.button("Import Registrations", key="bulk_reg_btn"):
+            try:
+                report, summary = import_registrations(conn, upload, chunk_size=int(chunk_size))
+            except Exception as e:
+                st.error(f"❌ Import failed: {e}")
+            else:
+                c1, c2, c3, c4 = st.columns(4)
+                c1.metric("Rows", summary["Rows"])
+                c2.metric("Registered", summary["Registered"])
+                c3.metric("Failed", summary["Failed"])
+                c4.metric("Throughput", f"{summary['Rows_Per_Second']} rows/s")
+                st.caption(f"Completed in {summary['Seconds']} s")
+
+                failed = report[report["Status"] == "Failed"]
+                if failed.empty:
+                    st.success("✅ All rows imported.")
+                else:
+                    st.dataframe(failed, hide_index=True, use_container_width=True)
+                st.download_button("📥 Download Row Report", report.to_csv(index=False).encode('utf-8'), file_name="registration_import_report.csv", mime="text/csv")
+
+    # ====================================================================
+    st.subheader("6. Event Statistics Maintenance")
+    st.caption("S-3 compares the Event_Stats counters with the base tables; S-2 rebuilds them if they drifted.")
+    col_v, col_r = st.columns(2)
+    if col_v.button("Verify Event_Stats (S-3)", key="verify_stats_btn"):
+        df_drift, error = execute_procedure(conn, "VerifyEventStats")
+        if error != "Success":
+            st.error(error)
+        elif df_drift is None or df_drift.empty:
+            st.success("✅ Event_Stats matches the base tables.")
+        else:
+            st.warning(f"⚠️ {len(df_drift)} event(s) have drifted counters.")
+            st.dataframe(df_drift, hide_index=True, use_container_width=True)
+    if col_r.button("Rebuild Event_Stats (S-2)", key="rebuild_stats_btn"):
+        df_result, error = execute_procedure(conn, "RebuildEventStats")
+        if error == "Success":
+            query_cache.invalidate("Event_Stats")
+            st.success(df_result.iloc[0, 0] if df_result is not None and not df_result.empty else "Event_Stats rebuilt.")
+        else:
+            st.error(error)
+
+    # ====================================================================
+    st.subheader("7. Bulk Schedule Check")
+    with st.expander("🗓️ Check Venue Bookings for a Date Range or a Proposed Schedule"):
+        st.caption("Loads every event of the range in one query and checks all venues together, instead of one F-4 call per event.")
+        col_from, col_to = st.columns(2)
+        range_from = col_from.date_input("From", key="sched_from")
+        range_to = col_to.date_input("To", value=range_from + timedelta(days=30), key="sched_to")
+        tab_conf, tab_free, tab_upload = st.tabs(["Existing Conflicts", "Free Slots", "Validate Upload"])
+
+        with tab_conf:
+            if st.button("Find Conflicts", key="sched_conf_btn"):
+                try:
+                    df_conf = VenueSchedule.load(conn, range_from, range_to).conflicts()
+                except Exception as e:
+                    st.error(f"❌ Schedule check failed: {e}")
+                else:
+                    if df_conf.empty:
+                        st.success("✅ No double-booked venues in this range.")
+                    else:
+                        st.warning(f"⚠️ {len(df_conf)} overlapping booking(s).")
+                        st.dataframe(df_conf, hide_index=True, use_container_width=True)
+
+        with tab_free:
+            # The venue list is only loaded when asked for; otherwise free_slots() covers every venue
+            chosen_venues = None
+            if st.toggle("Only some venues", key="sched_free_some"):
+                df_venues = cached_query(conn, "SELECT Venue_ID, Venue_Name FROM Venue", tables=("Venue",))
+                venue_names = dict(zip(df_venues["Venue_ID"].tolist(), df_venues["Venue_Name"]))
+                chosen_venues = st.multiselect(
+                    "Venues", list(venue_names), format_func=lambda v: f"{venue_names[v]} ({v})", key="sched_free_venues"
+                )
+            col_s, col_e, col_m = st.columns(3)
+            day_start = col_s.time_input("Day Starts", value=pd.to_datetime('08:00:00').time(), key="sched_day_start")
+            day_end = col_e.time_input("Day Ends", value=pd.to_datetime('22:00:00').time(), key="sched_day_end")
+            min_minutes = col_m.number_input("Minimum Minutes", min_value=15, max_value=720, value=60, step=15, key="sched_min")
+            if st.button("Find Free Slots", key="sched_free_btn"):
+                try:
+                    schedule = VenueSchedule.load(conn, range_from, range_to)
+                    dates = pd.date_range(range_from, range_to).date
+                    df_free = schedule.free_slots(chosen_venues, dates, day_start, day_end, int(min_minutes))
+                except Exception as e:
+                    st.error(f"❌ Schedule check failed: {e}")
+                else:
+                    st.dataframe(df_free, hide_index=True, use_container_width=True)
+                    st.download_button("📥 Download Free Slots", df_free.to_csv(index=False).encode('utf-8'), file_name="free_slots.csv", mime="text/csv")
+
+        with tab_upload:
+            st.caption(f"Columns: {', '.join(SCHEDULE_COLUMNS)}, Event_ID (optional; an existing event being moved), Event_Name (optional). The date range above is ignored here.")
+            schedule_upload = st.file_uploader("Proposed Schedule CSV", type=["csv"], key="sched_csv")
+            if schedule_upload is not None and st.button("Validate Schedule", key="sched_upload_btn"):
+                try:
+                    proposed = parse_schedule(schedule_upload)
+                    dates = proposed["Date"].dropna()
+                    schedule = VenueSchedule.load(conn, dates.min(), dates.max()) if not dates.empty else VenueSchedule.load(conn, range_from, range_from)
+                    report, pairs = schedule.check(proposed)
+                except Exception as e:
+                    st.error(f"❌ Schedule check failed: {e}")
+                else:
+                    c1, c2, c3 = st.columns(3)
+                    c1.metric("OK", int((report["Status"] == "OK").sum()))
+                    c2.metric("Conflicts", int((report["Status"] == "Conflict").sum()))
+                    c3.metric("Invalid", int((report["Status"] == "Invalid").sum()))
+                    problems = report[report["Status"] != "OK"]
+                    if problems.empty:
+                        st.success("✅ No conflicts: every proposed event fits.")
+                    else:
+                        st.dataframe(problems, hide_index=True, use_container_width=True)
+                    st.download_button("📥 Download Schedule Report", report.to_csv(index=False).encode('utf-8'), file_name="schedule_check_report.csv", mime="text/csv")
+
+    if st.toggle("📅 Venue Calendar (in-memory P-10 / F-4)", key="show_venue_calendar"):
+        st.caption("Date listings and availability checks inside this window are answered from memory, kept current from Change_Log.")
+        st.dataframe(pd.DataFrame([venue_calendar.summary()]), hide_index=True, use_container_width=True)
+        col_v, col_b = st.columns(2)
+        if col_v.button("Verify Against Database", key="calendar_check_btn"):
+            try:
+                df_diff = venue_calendar.check(conn)
+            except Exception as e:
+                st.error(f"❌ Calendar check failed: {e}")
+            else:
+                if df_diff.empty:
+                    st.success("✅ The calendar matches the database.")
+                else:
+                    st.warning(f"⚠️ {len(df_diff)} event(s) differ; rebuild the calendar.")
+                    st.dataframe(df_diff, hide_index=True, use_container_width=True)
+        if col_b.button("Rebuild Calendar", key="calendar_rebuild_btn"):
+            try:
+                venue_calendar.rebuild(conn)
+                st.success(f"✅ Calendar rebuilt: {venue_calendar.summary()['Events']} events.")
+            except Exception as e:
+                st.error(f"❌ Calendar rebuild failed: {e}")
+
+    # ====================================================================
+    st.subheader("8. Bulk Cancellation")
+    with st.expander("🚫 Cancel Many Registrations at Once"):
+        st.caption("Cancels the whole selection in one transaction, with the same Cancellations and audit entries as P-2, written in bulk.")
+        target = st.radio("Cancel", ["Registration IDs", "A Team", "An Event"], horizontal=True, key="bulk_cancel_target")
+        kwargs = {}
+        if target == "Registration IDs":
+            ids_text = st.text_area("Registration IDs (comma or newline separated)", key="bulk_cancel_ids")
+            kwargs["registration_ids"] = [int(part) for part in ids_text.replace("\n", ",").replace(" ", "").split(",") if part.isdigit()]
+        elif target == "A Team":
+            kwargs["team_id"] = st.number_input("Team ID (PTeam_ID)", min_value=1, step=1, key="bulk_cancel_team")
+        else:
+            col_ev, col_st = st.columns(2)
+            kwargs["event_id"] = col_ev.number_input("Event ID", min_value=1, step=1, key="bulk_cancel_event")
+            kwargs["statuses"] = col_st.multiselect("Only these payment statuses (all if empty)", [s for s in PAYMENT_STATUSES if s != "Cancelled"], key="bulk_cancel_statuses")
+        reason = st.text_input("Reason", value="Event called off", key="bulk_cancel_reason")
+        confirm = st.checkbox("I understand every selected registration will be cancelled.", key="bulk_cancel_confirm")
+
+        if confirm and st.button("❌ Cancel Selected Registrations", key="bulk_cancel_btn"):
+            if target == "Registration IDs" and not kwargs["registration_ids"]:
+                st.error("Enter at least one Registration ID.")
+            else:
+                try:
+                    summary = bulk_cancel(conn, reason, **kwargs)
+                except Exception as e:
+                    st.error(f"❌ Bulk cancellation failed: {e}")
+                else:
+                    c1, c2, c3, c4 = st.columns(4)
+                    c1.metric("Cancelled", summary["Cancelled"])
+                    c2.metric("Teams", summary["Teams"])
+                    c3.metric("Events", summary["Events"])
+                    c4.metric("Throughput", f"{summary['Rows_Per_Second']} rows/s")
+                    st.caption(f"Previously Paid: {summary['Were_Paid']} · Pending: {summary['Were_Pending']} · Completed in {summary['Seconds']} s")
+                    if summary["Cancelled"] == 0:
+                        st.info("Nothing to cancel: no active registrations matched.")
+                    else:
+                        st.success(f"✅ {summary['Cancelled']} registration(s) cancelled.")
+
+    st.subheader("9. Audit Log")
+    with st.expander("📜 Search the Audit Log"):
+        st.caption("Searches the live table and, when needed, the archived months. Time-range searches only read the months they cover.")
+        col_from, col_to = st.columns(2)
+        log_from = col_from.date_input("From", value=None, key="audit_from")
+        log_to = col_to.date_input("To (inclusive)", value=None, key="audit_to")
+        col_actor, col_id, col_action = st.columns(3)
+        actor = col_actor.selectbox("Performed by", ["Anyone", "Student", "Faculty", "Admin"], key="audit_actor")
+        actor_id = col_id.number_input("Actor ID", min_value=1, step=1, key="audit_actor_id", disabled=actor == "Anyone")
+        action = col_action.text_input("Action contains", key="audit_action")
+        col_limit, col_archive = st.columns(2)
+        limit = col_limit.number_input("Max rows", min_value=10, max_value=100_000, value=1000, step=100, key="audit_limit")
+        include_archive = col_archive.checkbox("Include archived months", value=True, key="audit_include_archive")
+
+        if st.button("🔍 Search Audit Log", key="audit_search_btn"):
+            actors = {f"{actor.lower()}_id": int(actor_id)} if actor != "Anyone" else {}
+            try:
+                logs = query_audit_logs(
+                    conn,
+                    start=log_from,
+                    end=log_to + timedelta(days=1) if log_to else None,
+                    action=action.strip() or None,
+                    limit=int(limit),
+                    include_archive=include_archive,
+                    **actors,
+                )
+            except Exception as e:
+                st.error(f"❌ Audit search failed: {e}")
+            else:
+                st.write(f"{len(logs)} entr{'y' if len(logs) == 1 else 'ies'}")
+                st.dataframe(logs, use_container_width=True, hide_index=True)
+
+    with st.expander("🗄️ Audit Log Partitions & Archive"):
+        if st.toggle("Show current partitions", key="audit_show_partitions"):
+            try:
+                st.dataframe(list_partitions(conn), use_container_width=True, hide_index=True)
+            except Exception as e:
+                st.error(f"❌ {e}")
+        col_ahead, col_add = st.columns([3, 1])
+        months_ahead = col_ahead.number_input("Months to keep ready ahead", min_value=1, max_value=24, value=3, key="audit_months_ahead")
+        if col_add.button("➕ Add Partitions", key="audit_add_partitions"):
+            try:
+                added = ensure_partitions(conn, int(months_ahead))
+            except Exception as e:
+                st.error(f"❌ {e}")
+            else:
+                st.success(f"✅ Added {', '.join(added)}." if added else "Partitions are already in place.")
+
+        col_keep, col_fmt = st.columns(2)
+        keep_months = col_keep.number_input("Keep this many months live", min_value=1, max_value=120, value=12, key="audit_keep_months")
+        fmt = col_fmt.selectbox("Archive format", ARCHIVE_FORMATS, index=ARCHIVE_FORMATS.index(DEFAULT_ARCHIVE_FORMAT), key="audit_archive_fmt")
+        st.caption(f"Archives are written to {AUDIT_ARCHIVE_DIR} (set AUDIT_ARCHIVE_DIR to change it).")
+        if st.button("📦 Archive Cold Months", key="audit_archive_btn"):
+            try:
+                archived = archive_partitions(conn, keep_months=int(keep_months), fmt=fmt)
+            except Exception as e:
+                st.error(f"❌ Archiving failed: {e}")
+            else:
+                if archived:
+                    st.success(f"✅ Archived {len(archived)} month(s), {sum(a['Rows'] for a in archived)} rows.")
+                    st.dataframe(pd.DataFrame(archived), use_container_width=True, hide_index=True)
+                else:
+                    st.info("No month is old enough to archive.")
+
+        if st.button("🔎 Verify Archive", key="audit_verify_btn"):
+            try:
+                manifest = verify_archive(conn)
+            except Exception as e:
+                st.error(f"❌ {e}")
+            else:
+                bad = (manifest["Status"] != "OK").sum()
+                (st.warning if bad else st.success)(f"{len(manifest) - bad} of {len(manifest)} archived month(s) verified.")
+                st.dataframe(manifest, use_container_width=True, hide_index=True)
@@ -1,35 +1,51 @@
+import os
+
 import streamlit as st
 import pandas as pd
 
-def dashboard_page(conn, execute_procedure, execute_function):
-    """Main Dashboard for overview metrics and reports."""
-    st.title("🏛️ Campus Event Management")
-    
-    # Fetch future events
-    df_events, error = execute_procedure(conn, "GetFutureEvents")
-    if error != "Success" or df_events.empty:
-        st.error(f"⚠️ Unable to load events: {error}")
+from db.calendar import venue_calendar
+from db.change_feed import upcoming_feed
+from db.instrumentation import db_metrics
+from db.pool import get_pool
+
+# Seconds between automatic refreshes of the overview; each one reads the shared snapshot, which
+# polls the change feed at most every couple of seconds for all viewers together
+REFRESH_SECONDS = float(os.getenv("DASHBOARD_REFRESH_SECONDS", 5))
+
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def live_overview():
+    """Upcoming events (P-11) and their metrics from the change-fed snapshot; reruns on its own."""
+    with db_metrics.page_scope("Dashboard (live)"):
+        try:
+            df_events, df_metrics, _ = upcoming_feed.current(get_pool())
+        except Exception as e:
+            st.error(f"⚠️ Unable to load events: {e}")
+            return
+    if df_events.empty:
+        st.info("No upcoming events available!")
         return
 
-    # Create display column for dropdown
-    df_events["Display"] = df_events["Event_Name"] + " (ID: " + df_events["Event_ID"].astype(str) + ")"
+    # Dropdown labels by Event_ID, so events sharing a name stay distinct
+    labels = dict(zip(df_events["Event_ID"].tolist(), df_events["Event_Name"] + " — " + df_events["Date"].astype(str)
+                      + " (ID: " + df_events["Event_ID"].astype(str) + ")"))
 
     # Overview Metrics
     col1, col2, col3 = st.columns(3)
-    upcoming_count = execute_function(conn, "GetUpcomingEventCount()")
-    col1.metric("Upcoming Events", f"{upcoming_count} 🎉")
-    
+    col1.metric("Upcoming Events", f"{len(df_events)} 🎉")
+
     # Event selection dropdown over col2, col3
     with st.container():
         cols = st.columns([1.5, 2.3, 1])
-        with cols[1]: 
-            selected_event = st.selectbox("Select Event to View Details 📝", df_events["Display"], key='event_dropdown')
-
-    selected_event_id = df_events.loc[df_events["Display"] == selected_event, "Event_ID"].iloc[0]
+        with cols[1]:
+            selected_event_id = st.selectbox("Select Event to View Details 📝", list(labels), format_func=labels.get, key='event_dropdown')
 
-    # Fetch dynamic metrics based on event selection
-    total_regs = execute_function(conn, f"GetTotalRegistrations({selected_event_id})")
-    avg_rating = execute_function(conn, f"GetAvgEventRating({selected_event_id})")
+    # Dynamic metrics for the selected event, looked up from the snapshot
+    if selected_event_id in df_metrics.index:
+        total_regs = int(df_metrics.at[selected_event_id, "Total_Registrations"])
+        avg_rating = float(df_metrics.at[selected_event_id, "Avg_Rating"])
+    else:
+        total_regs, avg_rating = None, None
 
     col2.metric("Total Registrations", f"{total_regs or 0} 👥")
     if avg_rating is not None and avg_rating >= 0:
@@ -41,11 +57,15 @@ def dashboard_page(conn, execute_procedure, execute_function):
 
     # Upcoming Events Table
     st.subheader("📅 Upcoming Events Schedule")
+    metric_cols = ["Total_Registrations", "Paid_Registrations", "Avg_Rating", "Capacity_Usage", "Duration_Hours"]
+    df_events = df_events.merge(df_metrics[metric_cols], left_on="Event_ID", right_index=True, how="left")
+    st.dataframe(df_events, hide_index=True, use_container_width=True)
 
-    if isinstance(df_events, pd.DataFrame) and not df_events.empty:
-        st.dataframe(df_events, hide_index=True, use_container_width=True)
-    else:
-        st.info("No upcoming events available!")
+def dashboard_page(conn, execute_procedure, execute_function, cached_procedure, cached_query):
+    """Main Dashboard for overview metrics and reports."""
+    st.title("🏛️ Campus Event Management")
+
+    live_overview()
 
     st.markdown("---")
     
@@ -54,7 +74,13 @@ def dashboard_page(conn, execute_procedure, execute_function):
     
     selected_date = st.date_input("Choose a date to view events")
     if st.button("Load Events for Selected Date"):
-        df_events_by_date, error = execute_procedure(conn, "GetEventsForDate", args=(selected_date,))
+        # Answered from the in-memory venue calendar; P-10 only for dates outside its window
+        try:
+            df_events_by_date, error = venue_calendar.events_on(conn, selected_date), "Success"
+        except Exception as e:
+            df_events_by_date, error = None, f"⚠️ Unable to load events for {selected_date}: {e}"
+        if error == "Success" and df_events_by_date is None:
+            df_events_by_date, error = execute_procedure(conn, "GetEventsForDate", args=(selected_date,))
         if error != "Success":
             st.error(error)
         elif isinstance(df_events_by_date, pd.DataFrame) and not df_events_by_date.empty:
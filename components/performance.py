@@ -0,0 +1,90 @@
+import time
+
+import streamlit as st
+
+from db.instrumentation import db_metrics
+from db.routing import get_router
+from db.rush import registration_queue
+
+def performance_page():
+    st.title("⏱️ Database Performance")
+    st.caption(
+        "Every database call made by this server process since "
+        f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(db_metrics.since))}. "
+        f"Calls slower than {db_metrics.slow_ms:.0f} ms (DB_SLOW_CALL_MS) or failed are also listed individually."
+    )
+
+    df_calls = db_metrics.calls_frame()
+    df_reruns = db_metrics.reruns_frame()
+    df_slow = db_metrics.slow_calls_frame()
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("DB Calls", int(df_calls["Calls"].sum()))
+    col2.metric("Errors", int(df_calls["Errors"].sum()))
+    col3.metric("Total DB Time", f"{df_calls['Total_ms'].sum() / 1000:.2f} s")
+    col4.metric("Page Reruns", int(df_reruns["Reruns"].sum()))
+
+    if df_calls.empty:
+        st.info("No database calls recorded yet. Open a few pages and come back.")
+
+    # ====================================================================
+    st.subheader("1. Slowest Calls")
+    top_n = st.slider("Show top", min_value=5, max_value=100, value=20, step=5)
+    sort_by = st.selectbox("Sort by", ["p95_ms", "p99_ms", "Max_ms", "Avg_ms", "Total_ms"])
+    st.dataframe(
+        df_calls.sort_values(sort_by, ascending=False).head(top_n),
+        hide_index=True, use_container_width=True
+    )
+
+    st.markdown("---")
+    # ====================================================================
+    st.subheader("2. DB Time per Rerun by Page")
+    st.dataframe(df_reruns.sort_values("Avg_DB_ms", ascending=False), hide_index=True, use_container_width=True)
+    st.caption("Page modules are imported on first navigation; a page's first rerun includes its import time below.")
+    st.dataframe(db_metrics.imports_frame(), hide_index=True, use_container_width=True)
+
+    st.markdown("---")
+    # ====================================================================
+    st.subheader("3. Call Counts")
+    df_counts = (
+        df_calls.groupby(["Kind", "Name"], as_index=False)[["Calls", "Errors", "Total_ms", "Rows"]].sum()
+        .sort_values("Calls", ascending=False)
+    )
+    st.dataframe(df_counts, hide_index=True, use_container_width=True)
+    rush = registration_queue.stats
+    st.caption(
+        f"Registration queue: {rush['submitted']} requests in {rush['batches']} batches "
+        f"({rush['registered']} registered, {rush['full']} full, {rush['rejected']} rejected, {rush['failed']} failed), "
+        f"{registration_queue.depth()} waiting."
+    )
+    router = get_router()
+    routed = router.stats
+    st.caption(
+        f"Read routing: {routed['replica']} reads on a replica; on the primary {routed['primary']} (write pages or "
+        f"no replica), {routed['sticky']} right after a write, {routed['lagging']} replica lagging over "
+        f"{router.max_lag:.0f}s, {routed['unavailable']} replica unavailable, {routed['busy']} replica pool busy."
+    )
+    if router.replica_status():
+        st.dataframe(router.replica_status(), hide_index=True, use_container_width=True)
+
+    st.markdown("---")
+    # ====================================================================
+    st.subheader("4. Recent Slow and Failed Calls")
+    if df_slow.empty:
+        st.info("No slow or failed calls recorded.")
+    else:
+        st.dataframe(df_slow, hide_index=True, use_container_width=True)
+
+    st.markdown("---")
+    # ====================================================================
+    st.subheader("5. Export")
+    col_prom, col_json, col_reset = st.columns(3)
+    col_prom.download_button(
+        "📥 Prometheus Text", db_metrics.to_prometheus(), file_name="db_metrics.prom", mime="text/plain"
+    )
+    col_json.download_button(
+        "📥 JSON Dump", db_metrics.to_json(), file_name="db_metrics.json", mime="application/json"
+    )
+    if col_reset.button("🔄 Reset Metrics"):
+        db_metrics.reset()
+        st.rerun()
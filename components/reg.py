@@ -1,8 +1,12 @@
 import streamlit as st
 import pandas as pd
-import mysql.connector
 
-def registration_page(conn, execute_procedure, execute_function):
+from components.typeahead import typeahead_select
+from db.cache import query_cache
+from db.rush import registration_queue
+from db.students import active_registrations
+
+def registration_page(conn, execute_procedure, execute_function, cached_procedure, cached_query):
     st.title("🎟️ Event Registration & Cancellation")
 
     tabs = st.tabs(["📝 Register", "❌ Cancel Registration"])
@@ -14,16 +18,12 @@ def registration_page(conn, execute_procedure, execute_function):
 
         student_id = st.number_input("Enter Student ID", min_value=1, step=1)
         
-        # Fetch available events (future events)
-        events_df, status = execute_procedure(conn, "GetFutureEvents") # P-11
-
-        if events_df is None or events_df.empty:
-            st.warning("⚠️ No upcoming events found.")
+        # Event selection among upcoming events (P-11's scope), looked up by name as it is typed
+        event = typeahead_select(conn, "event", "Event", key="reg_event", upcoming=True)
+        if event is None:
+            st.warning("⚠️ No matching upcoming event.")
             return
-
-        # Event selection
-        event_name = st.selectbox("Select Event", events_df["Event_Name"].tolist())
-        event_id = int(events_df.loc[events_df["Event_Name"] == event_name, "Event_ID"].values[0])
+        event_id, event_name = event
 
         reg_for = st.selectbox("Participation Type", ["Solo", "Team"])
 
@@ -54,58 +54,24 @@ def registration_page(conn, execute_procedure, execute_function):
             # Combine leader and members for the transaction
             all_students = [student_id] + member_ids
             
-            try:
-                # Use a raw connection/cursor to manage the transaction for atomicity
-                cursor = conn.cursor(prepared=True)
-                conn.start_transaction() 
-
-                # 1. Insert into Participating_Team
-                final_team_name = team_name if reg_for == "Team" else None
-                total_members = len(all_students)
-
-                cursor.execute(
-                    """
-                    INSERT INTO Participating_Team (Event_ID, Team_Name, No_of_Participants)
-                    VALUES (%s, %s, %s)
-                    """,
-                    (event_id, final_team_name, total_members)
-                )
-                pteam_id = cursor.lastrowid
-                
-                # 2. Insert all students into PTeam_Members & Registrations
-                for stud_id in all_students:
-                    if stud_id == 0: continue # Skip if a team member ID was left at 0
-                    
-                    # Insert into PTeam_Members (T-7: before_pteam_member_insert trigger runs here)
-                    cursor.execute(
-                        "INSERT INTO PTeam_Members (PTeam_ID, Student_ID) VALUES (%s, %s)",
-                        (pteam_id, stud_id)
-                    )
-                    
-                    # Insert into Registrations (T-4 & T-9: before/after_registration_insert triggers run here)
-                    cursor.execute(
-                        """
-                        INSERT INTO Registrations (Reg_For, Reg_Date, Payment_Status, Student_ID, PTeam_ID)
-                        VALUES (%s, CURDATE(), %s, %s, %s)
-                        """,
-                        (event_name, payment_status, stud_id, pteam_id)
-                    )
-                
-                conn.commit()
+            # P-1 write path through the registration queue: batched per event, capacity enforced
+            final_team_name = team_name if reg_for == "Team" else None
+            with st.spinner("Registering..."):
+                ticket = registration_queue.register(event_id, event_name, all_students, payment_status, team_name=final_team_name)
+
+            total_members = len(ticket.student_ids)
+            if ticket.status == "Registered":
                 msg_list = ["All" if total_members > 1 else "", f"{total_members} members" if total_members > 1 else "Student"]
                 st.success(f"🎉 {msg_list[0]} {msg_list[1]} successfully registered for {event_name}.")
-
-            except mysql.connector.Error as e:
-                conn.rollback() 
-                # Display the error message from the database (often from a trigger SIGNAL)
-                st.error(f"❌ Registration failed. Error: {e.msg}")
-            
-            except Exception as e:
-                conn.rollback() 
-                st.error(f"❌ An unexpected error occurred: {e}")
-                
-            finally:
-                cursor.close()
+            elif ticket.status == "Full":
+                st.warning(f"⚠️ {event_name} is full: not enough seats left for {total_members} member(s).")
+            elif ticket.status == "Rejected":
+                # The registration rule that failed, with the trigger's message
+                st.error(f"❌ Registration failed. Error: {ticket.message}")
+            elif ticket.status == "Failed":
+                st.error(f"❌ An unexpected error occurred: {ticket.message}")
+            else:
+                st.warning("⏳ Registration is still queued; check your registrations in the Cancel tab shortly.")
 
     # ======================= CANCEL TAB =======================
     with tabs[1]:
@@ -115,23 +81,14 @@ def registration_page(conn, execute_procedure, execute_function):
         student_id = st.number_input("Enter Student ID to Cancel", min_value=1, step=1, key="cancel_id")
 
         if st.button("🔍 Fetch Registrations", key="fetch_reg_btn"):
-            # Using raw query as the F-11 function was dropped in Functions.sql
+            # Active registrations only, filtered in SQL from the student's covering index (V006)
             try:
-                query = """
-                    SELECT r.Registration_ID, e.Event_Name, pt.Team_Name, r.Reg_Date, r.Payment_Status
-                    FROM Registrations r
-                    LEFT JOIN Participating_Team pt ON r.PTeam_ID = pt.PTeam_ID
-                    LEFT JOIN Event e ON pt.Event_ID = e.Event_ID
-                    WHERE r.Student_ID = %s
-                """
-                regs_df = pd.read_sql_query(query, conn, params=(student_id,))
+                regs_df = active_registrations(conn, student_id)
             except Exception as e:
                 st.error(f"Error fetching registrations: {e}")
                 regs_df = pd.DataFrame()
 
             if not regs_df.empty:
-                # Filter out cancelled registrations
-                regs_df = regs_df[regs_df["Payment_Status"] != "Cancelled"]
                 st.session_state["regs_df"] = regs_df
                 st.dataframe(regs_df, hide_index=True, use_container_width=True)
             else:
@@ -148,12 +105,15 @@ def registration_page(conn, execute_procedure, execute_function):
                     del st.session_state["regs_df"] # Clear session state
                 return
 
-            # Let student select event to cancel
-            selected_event = st.selectbox("Select Event to Cancel", regs_df["Event_Name"].unique().tolist(), key="cancel_event_select")
+            # Let student select the registration to cancel; by ID, so events sharing a name stay apart
+            labels = {
+                int(row.Registration_ID): f"{row.Event_Name} — {row.Event_Date} (Registration {row.Registration_ID})"
+                for row in regs_df.itertuples(index=False)
+            }
+            selected_reg = st.selectbox("Select Event to Cancel", list(labels), format_func=labels.get, key="cancel_event_select")
             
-            if selected_event:
-                # Ensure we select the row corresponding to the selected event name
-                reg_row = regs_df.loc[regs_df["Event_Name"] == selected_event].iloc[0]
+            if selected_reg:
+                reg_row = regs_df.loc[regs_df["Registration_ID"] == selected_reg].iloc[0]
                 reg_id = int(reg_row["Registration_ID"])
                 team_name = reg_row.get("Team_Name")
 
@@ -176,6 +136,8 @@ def registration_page(conn, execute_procedure, execute_function):
                         try:
                             # P-2: ProcessCancellation(reg_id_in, reason_in, team_cancel=TRUE)
                             result_df, msg = execute_procedure(conn, "ProcessCancellation", (reg_id, reason, True))
+                            if msg == "Success":
+                                query_cache.invalidate("Registrations", "Cancellations")
                             if result_df is not None and not result_df.empty:
                                 st.success(result_df.iloc[0, 0])
                             else:
@@ -190,6 +152,8 @@ def registration_page(conn, execute_procedure, execute_function):
                         try:
                             # P-2: ProcessCancellation(reg_id_in, reason_in, team_cancel=FALSE)
                             result_df, msg = execute_procedure(conn, "ProcessCancellation", (reg_id, reason, False))
+                            if msg == "Success":
+                                query_cache.invalidate("Registrations", "Cancellations")
                             if result_df is not None and not result_df.empty:
                                 st.success(result_df.iloc[0, 0])
                             else:
@@ -1,8 +1,15 @@
 import streamlit as st
 import pandas as pd
 import mysql.connector
+from datetime import date, timedelta
 
-def reports_page(conn, execute_procedure, execute_function):
+from db.executor import gather
+from db.metrics import get_event_metrics
+from db.instrumentation import read_sql_query
+from db.reports import event_report, report_totals, semester_range, SEMESTERS
+from components.typeahead import typeahead_select
+
+def reports_page(conn, execute_procedure, execute_function, cached_procedure, cached_query):
     st.title("📈 Reports and Detailed Analytics")
 
     # ====================================================================
@@ -12,9 +19,17 @@ def reports_page(conn, execute_procedure, execute_function):
     col_rep, col_met = st.columns([2, 1])
 
     with col_rep:
-        if st.button("Generate Detailed Report (P-5)"):
-            # P-5: GenerateEventReport
-            df_report, error = execute_procedure(conn, "GenerateEventReport", args=(int(report_event_id),))
+        generate_report = st.button("Generate Detailed Report (P-5)")
+
+    # F-7, F-5 and F-10 for this event in a single batched query, alongside P-5 when it was asked for
+    tasks = [lambda c: get_event_metrics(c, event_ids=[report_event_id])]
+    if generate_report:
+        tasks.append(lambda c: execute_procedure(c, "GenerateEventReport", args=(int(report_event_id),))) # P-5
+    results = gather(conn, *tasks, return_exceptions=True)
+
+    with col_rep:
+        if generate_report:
+            df_report, error = results[1] if not isinstance(results[1], Exception) else (None, str(results[1]))
             if error == "Success":
                 if df_report is not None and not df_report.empty:
                     st.markdown("##### Event Summary Report")
@@ -29,20 +44,23 @@ def reports_page(conn, execute_procedure, execute_function):
 
     with col_met:
         st.markdown("##### Event Metrics (Functions)")
+        df_metrics = results[0] if not isinstance(results[0], Exception) else pd.DataFrame()
+        metrics = df_metrics.loc[report_event_id] if report_event_id in df_metrics.index else None
+
         # F-7: GetRegistrationCountByPaymentStatus
         status = st.selectbox("Registration Status", ["Paid", "Pending", "Cancelled"], key="reg_status")
-        reg_count = execute_function(conn, f"GetRegistrationCountByPaymentStatus({report_event_id}, '{status}')")
-        st.metric(f"Registrations ({status})", reg_count if reg_count is not None else 0)
+        reg_count = metrics[f"{status}_Registrations"] if metrics is not None else None
+        st.metric(f"Registrations ({status})", int(reg_count) if reg_count is not None else 0)
 
         # F-5: GetEventCapacityUsage
-        usage = execute_function(conn, f"GetEventCapacityUsage({report_event_id})")
+        usage = metrics["Capacity_Usage"] if metrics is not None else None
         try:
             st.metric("Venue Usage", f"{float(usage):.2f}%" if usage is not None else "N/A")
         except Exception:
             st.metric("Venue Usage", "N/A")
             
         # F-10: Get Event Duration in Hours
-        duration = execute_function(conn, f"GetEventDurationInHours({report_event_id})")
+        duration = metrics["Duration_Hours"] if metrics is not None else None
         try:
             st.metric("Duration", f"{float(duration):.2f} hrs" if duration is not None else "N/A")
         except Exception:
@@ -53,27 +71,24 @@ def reports_page(conn, execute_procedure, execute_function):
     st.subheader("2. Event Filtering and Listings")
     
     # P-7: Get Events by Club and Type
-    with st.expander("Filter Events by Club and Type (P-7)"):
-        # Fetch Club and Event Types for selection boxes
+    # A toggle rather than an expander, so the lookups below only run once the filter is opened
+    if st.toggle("Filter Events by Club and Type (P-7)", key="show_p7_filter"):
+        # Event types are few and cached; clubs are searched by name
+        type_list = []
         try:
-            clubs_df = pd.read_sql_query("SELECT Club_ID, Club_Name FROM Clubs", conn)
-            types_df = pd.read_sql_query("SELECT DISTINCT Event_Type FROM Event", conn)
-            
-            club_list = clubs_df['Club_Name'].tolist()
+            types_df = cached_query(conn, "SELECT DISTINCT Event_Type FROM Event", tables=("Event",))
             type_list = types_df['Event_Type'].tolist()
-            club_map = clubs_df.set_index('Club_Name')['Club_ID'].to_dict()
-            
         except Exception as e:
             st.error(f"Error fetching lookup data: {e}")
-            # return
 
         col_c, col_t = st.columns(2)
-        selected_club_name = col_c.selectbox("Select Club", club_list, key="filter_club")
+        with col_c:
+            club = typeahead_select(conn, "club", "Club", key="filter_club")
         selected_event_type = col_t.selectbox("Select Event Type", type_list, key="filter_type")
         
         if st.button("Get Events (P-7)"):
-            club_id = club_map.get(selected_club_name)
-            if club_id:
+            if club:
+                club_id, selected_club_name = club
                 df_events, error = execute_procedure(conn, "GetEventsByClubAndType", args=(club_id, selected_event_type)) # P-7
                 if error == "Success" and df_events is not None and not df_events.empty:
                     st.dataframe(df_events, hide_index=True, use_container_width=True)
@@ -93,7 +108,7 @@ def reports_page(conn, execute_procedure, execute_function):
             try:
                 # Direct SQL query to fetch resources
                 query = "SELECT Resource_Name, Resource_Type, Quantity FROM Resources WHERE Event_ID = %s"
-                df_resources = pd.read_sql_query(query, conn, params=(event_id_res,))
+                df_resources = read_sql_query(query, conn, params=(event_id_res,))
                 if not df_resources.empty:
                     st.dataframe(df_resources, hide_index=True, use_container_width=True)
                 else:
@@ -114,7 +129,7 @@ def reports_page(conn, execute_procedure, execute_function):
                     JOIN Organising_Team o ON otm.OTeam_ID = o.OTeam_ID
                     WHERE o.Event_ID = %s
                 """
-                df_ot = pd.read_sql_query(query, conn, params=(event_id_ot,))
+                df_ot = read_sql_query(query, conn, params=(event_id_ot,))
                 if not df_ot.empty:
                     st.dataframe(df_ot, hide_index=True, use_container_width=True)
                 else:
@@ -125,6 +140,7 @@ def reports_page(conn, execute_procedure, execute_function):
     st.markdown("---")
     # ====================================================================
     st.subheader("4. Grievance Review")
+    st.caption("To find grievances or feedback comments by what they say, use the Search page.")
     
     # Latest Grievance(s)
     num_grievances = st.slider("Number of Latest Grievances to Show", 1, 10, 3)
@@ -139,11 +155,68 @@ def reports_page(conn, execute_procedure, execute_function):
                 ORDER BY g.Submitted_On DESC, g.Grievance_ID DESC
                 LIMIT %s
             """
-            df_grievances = pd.read_sql_query(query, conn, params=(num_grievances,))
+            df_grievances = read_sql_query(query, conn, params=(num_grievances,))
             if not df_grievances.empty:
                 st.markdown(f"##### Top {len(df_grievances)} Latest Grievances")
                 st.dataframe(df_grievances, hide_index=True, use_container_width=True)
             else:
                 st.info("No grievances found.")
         except Exception as e:
-            st.error(f"Error fetching grievances: {e}")
\ No newline at end of file
+            st.error(f"Error fetching grievances: {e}")
+
+    st.markdown("---")
+    # ====================================================================
+    st.subheader("5. Multi-Event Report")
+    st.caption("P-5 metrics for a whole club, date range or semester at once (a few set-based queries, not one call per event).")
+
+    scope_kind = st.radio("Report Scope", ["Club", "Date Range", "Semester", "Event IDs"], horizontal=True, key="mr_scope")
+    filters = {}
+    if scope_kind == "Club":
+        club = typeahead_select(conn, "club", "Club", key="mr_club")
+        if club:
+            filters["club_id"] = club[0]
+    elif scope_kind == "Date Range":
+        col_from, col_to = st.columns(2)
+        filters["start_date"] = col_from.date_input("From", value=date.today() - timedelta(days=90), key="mr_from")
+        filters["end_date"] = col_to.date_input("To", value=date.today() + timedelta(days=90), key="mr_to")
+    elif scope_kind == "Semester":
+        col_y, col_s = st.columns(2)
+        year = col_y.number_input("Year", min_value=2000, max_value=2100, value=date.today().year, key="mr_year")
+        semester = col_s.selectbox("Semester", list(SEMESTERS), key="mr_semester")
+        filters["start_date"], filters["end_date"] = semester_range(int(year), semester)
+    else:
+        ids_text = st.text_input("Event IDs (comma separated)", value="3001, 3002", key="mr_ids")
+        filters["event_ids"] = [int(part) for part in ids_text.replace(" ", "").split(",") if part.isdigit()]
+    event_type = st.text_input("Event Type (optional)", key="mr_type")
+
+    if st.button("Generate Multi-Event Report", key="mr_btn"):
+        # Without a club the scope would fall back to every event
+        if scope_kind == "Club" and "club_id" not in filters:
+            st.warning("Please select a club.")
+        else:
+            try:
+                st.session_state["multi_report"] = event_report(conn, event_type=event_type.strip() or None, **filters)
+            except Exception as e:
+                st.error(f"❌ Report failed: {e}")
+
+    if "multi_report" in st.session_state:
+        report = st.session_state["multi_report"]
+        totals = report_totals(report)
+        c1, c2, c3, c4, c5 = st.columns(5)
+        c1.metric("Events", totals["Events"])
+        c2.metric("Registrations", totals["Registrations"])
+        c3.metric("Cancelled", totals["Cancelled"])
+        c4.metric("Avg Rating", f"{totals['Avg_Rating']:.2f}")
+        c5.metric("Grievances", totals["Grievances"])
+
+        col_q, col_sort, col_dir = st.columns([2, 2, 1])
+        name_filter = col_q.text_input("Filter by Event Name", key="mr_name_filter")
+        sort_col = col_sort.selectbox("Sort By", list(report.columns), index=list(report.columns).index("Date"), key="mr_sort")
+        descending = col_dir.checkbox("Descending", key="mr_desc")
+
+        view = report
+        if name_filter:
+            view = view[view["Event_Name"].str.contains(name_filter, case=False, na=False, regex=False)]
+        view = view.sort_values(sort_col, ascending=not descending, ignore_index=True)
+        st.dataframe(view, hide_index=True, use_container_width=True)
+        st.download_button("📥 Download Report CSV", view.to_csv(index=False).encode('utf-8'), file_name="event_report.csv", mime="text/csv")
@@ -0,0 +1,72 @@
+import streamlit as st
+
+from db.search import MATCH_MODES, SEARCH_ORDERS, SEARCH_SOURCES, search_text
+
+PAGE_SIZES = (25, 50, 100)
+
+MODE_LABELS = {
+    "all": "All words",
+    "any": "Any word (ranked)",
+    "boolean": "Boolean (+word -word \"phrase\" word*)",
+}
+
+
+def search_page(conn, execute_procedure, execute_function, cached_procedure, cached_query):
+    st.title("🔎 Search Grievances and Feedback")
+    st.caption("Full-text search (FULLTEXT indexes, migration V009) ranked by relevance, with keyset paging.")
+
+    col_source, col_text = st.columns([1, 3])
+    source = col_source.radio("Search In", list(SEARCH_SOURCES), key="search_source")
+    text = col_text.text_input("Search Text", placeholder="e.g. projector broke", key="search_text")
+
+    col_mode, col_order, col_size = st.columns([2, 1, 1])
+    mode = col_mode.selectbox("Match", list(MATCH_MODES), format_func=MODE_LABELS.get, key="search_mode")
+    order = col_order.selectbox("Order By", list(SEARCH_ORDERS), format_func=str.capitalize, key="search_order")
+    page_size = col_size.selectbox("Rows per page", PAGE_SIZES, index=1, key="search_page_size")
+
+    filters = {}
+    col_event, col_from, col_to = st.columns(3)
+    event_id = col_event.number_input("Event ID (0 for all)", min_value=0, value=0, key="search_event")
+    if event_id:
+        filters["event_id"] = int(event_id)
+    filters["start"] = col_from.date_input("From", value=None, key="search_from")
+    filters["end"] = col_to.date_input("To (inclusive)", value=None, key="search_to")
+    if SEARCH_SOURCES[source]["rating"]:
+        low, high = st.slider("Rating", 1, 5, (1, 5), key="search_rating")
+        if (low, high) != (1, 5):
+            filters["min_rating"], filters["max_rating"] = low, high
+
+    if not text.strip():
+        st.info("Enter a word or phrase to search for.")
+        return
+
+    # Any change to the search starts again from the first page
+    shape = (source, text, mode, order, page_size, tuple(sorted(filters.items())))
+    if st.session_state.get("search_shape") != shape:
+        st.session_state["search_shape"] = shape
+        st.session_state["search_cursors"] = [None]
+
+    cursors = st.session_state["search_cursors"]
+    try:
+        df, next_cursor = search_text(conn, source, text, mode=mode, order=order, after=cursors[-1],
+                                      page_size=page_size, **filters)
+    except ValueError as e:
+        st.warning(str(e))
+        return
+    except Exception as e:
+        st.error(f"Search failed: {e}")
+        return
+
+    if df.empty:
+        st.info("No matching entries." if len(cursors) == 1 else "No more matching entries.")
+    else:
+        st.dataframe(df, hide_index=True, use_container_width=True)
+
+    nav_prev, nav_page, nav_next = st.columns([1, 2, 1])
+    if nav_prev.button("⬅️ Previous", disabled=len(cursors) == 1, key="search_prev"):
+        cursors.pop()
+        st.rerun()
+    nav_page.caption(f"Page {len(cursors)} · {len(df)} rows")
+    if nav_next.button("Next ➡️", disabled=next_cursor is None, key="search_next"):
+        cursors.append(next_cursor)
+        st.rerun()
@@ -0,0 +1,26 @@
+import streamlit as st
+
+from db.typeahead import suggest
+
+
+def typeahead_select(conn, source, label, key, upcoming=False, placeholder="Type a name or an ID"):
+    """Search box plus a dropdown of the few matching rows; returns the chosen (ID, Name) or None.
+
+    Only the matches for what has been typed are loaded (db/typeahead.py), and the choice is
+    kept by ID, so rows sharing a name stay distinct. Not usable inside st.form, where typing
+    does not rerun the page.
+    """
+    text = st.text_input(f"Search {label}", key=f"{key}_search", placeholder=placeholder)
+    try:
+        matches = suggest(conn, source, text, upcoming=upcoming)
+    except Exception as e:
+        st.error(f"Error searching {label.lower()}: {e}")
+        return None
+    if matches.empty:
+        st.caption(f"No {label.lower()} matches '{text}'." if text.strip() else f"No {label.lower()} found.")
+        return None
+
+    labels = dict(zip(matches["ID"].tolist(), matches["Label"]))
+    names = dict(zip(matches["ID"].tolist(), matches["Name"]))
+    choice = st.selectbox(label, list(labels), format_func=labels.get, key=f"{key}_choice")
+    return int(choice), names[choice]
@@ -1,40 +1,259 @@
+import csv
+import os
+import secrets
+import time
+
 import streamlit as st
-import pandas as pd
 
-def view_table(conn, table_name):
+from db.instrumentation import db_metrics, fingerprint
+from db.loader import load_frame, memory_report
+
+# Tables available for direct viewing and the primary key used to page through each
+TABLE_KEYS = {
+    "students": ("Student_ID",),
+    "faculty": ("Faculty_ID",),
+    "venue": ("Venue_ID",),
+    "event": ("Event_ID",),
+    "registrations": ("Registration_ID",),
+    "feedback": ("Feedback_ID",),
+    "resources": ("Resource_ID",),
+    "organising_team": ("OTeam_ID",),
+    "audit_logs": ("Log_ID",),
+    "grievances": ("Grievance_ID",),
+    "participating_team": ("PTeam_ID",),
+    "pteam_members": ("PTeam_ID", "Student_ID"),
+    "oteam_members": ("OTeam_ID", "Student_ID"),
+    "cancellations": ("Cancellation_ID",),
+    "clubs": ("Club_ID",),
+}
+
+FILTER_OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "LIKE")
+PAGE_SIZES = (50, 100, 500, 1000)
+
+# Rows per keyset page and per fetchmany() call while exporting
+EXPORT_PAGE_SIZE = 5000
+EXPORT_FETCH_SIZE = 1000
+
+# Finished exports are served by Streamlit's static file server (.streamlit/config.toml), which
+# streams them from disk; st.download_button would read the whole file into memory
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "exports")
+EXPORT_URL = "app/static/exports"
+# Exports of sessions that have moved on are deleted once they are this old
+EXPORT_MAX_AGE_SECONDS = 3600
+
+_table_columns = {}
+
+
+def table_columns(conn, tbl):
+    # Column lists never change at runtime, so look each table up once per process
+    if tbl not in _table_columns:
+        cursor = conn.cursor()
+        cursor.execute(f"SHOW COLUMNS FROM {tbl}")
+        _table_columns[tbl] = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+    return _table_columns[tbl]
+
+
+def build_page_query(conn, table_name, columns=None, filters=None, after=None, page_size=100):
+    """Keyset-paginated SELECT for one page of `table_name`.
+
+    `filters` is a list of (column, operator, value) tuples and `after` is the primary key
+    of the last row on the previous page. Only known tables, columns and operators are
+    interpolated; every value is bound as a parameter.
+    """
+    # Nautrally guard against SQL injection: allow only known table names
+    tbl = table_name.strip().lower()
+    if tbl not in TABLE_KEYS:
+        raise ValueError(f"Table '{table_name}' is not allowed for direct viewing.")
+
+    keys = TABLE_KEYS[tbl]
+    known = table_columns(conn, tbl)
+    known_lower = {c.lower(): c for c in known}
+    selected = [known_lower[c.lower()] for c in columns if c.lower() in known_lower] if columns else list(known)
+    # Key columns are always selected so the next page can be located
+    selected = list(keys) + [c for c in selected if c not in keys]
+
+    where, params = [], []
+    for column, op, value in filters or []:
+        if column.lower() not in known_lower or op not in FILTER_OPERATORS:
+            raise ValueError(f"Invalid filter: {column} {op}")
+        where.append(f"{known_lower[column.lower()]} {op} %s")
+        params.append(value)
+    if after is not None:
+        if len(keys) == 1:
+            where.append(f"{keys[0]} > %s")
+        else:
+            where.append(f"({', '.join(keys)}) > ({', '.join(['%s'] * len(keys))})")
+        params.extend(after)
+
+    query = f"SELECT {', '.join(selected)} FROM {tbl}"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    query += f" ORDER BY {', '.join(keys)} LIMIT {int(page_size)}"
+    return query, params, keys
+
+
+def view_table(conn, table_name, columns=None, filters=None, after=None, page_size=100):
+    """Fetch one page; returns (df, next_cursor, "Success") or (None, None, error)."""
     try:
-        # Nautrally guard against SQL injection: allow only known table names
-        allowed_tables = {
-            "students", "faculty", "venue", "event", "registrations",
-            "feedback", "resources", "organising_team", "audit_logs", "grievances",
-            "participating_team", "pteam_members", "ot eam_members", "cancellations", "clubs"
-        }
-        # normalize
-        tbl = table_name.strip().lower()
-        if tbl not in allowed_tables:
-            return None, f"Table '{table_name}' is not allowed for direct viewing."
-
-        query = f"SELECT * FROM {tbl} LIMIT 10000"  # limit to avoid huge loads
-        df = pd.read_sql_query(query, conn)
-        return df, "Success"
+        query, params, keys = build_page_query(conn, table_name, columns, filters, after, page_size)
+        # Typed, categorical columns: a fraction of the memory of a plain read_sql_query frame
+        df = load_frame(conn, query, params)
+        # Plain Python values so the cursor can be bound as query parameters next time
+        next_cursor = tuple(v.item() if hasattr(v, "item") else v for v in df.iloc[-1][list(keys)]) if len(df) == page_size else None
+        return df, next_cursor, "Success"
     except Exception as e:
-        return None, str(e)
+        return None, None, str(e)
+
+
+def export_table_csv(conn, table_name, out, columns=None, filters=None):
+    """Stream every matching row to the text file `out` as CSV and return the row count.
+
+    Pages through the table by primary key with an unbuffered cursor, so memory stays
+    bounded by EXPORT_FETCH_SIZE rows however large the table is.
+    """
+    writer = csv.writer(out)
+    after, total = None, 0
+    cursor = conn.cursor(buffered=False)
+    try:
+        while True:
+            query, params, keys = build_page_query(conn, table_name, columns, filters, after, EXPORT_PAGE_SIZE)
+            # Each page is recorded as one call, including the time spent writing its rows
+            with db_metrics.timed("query", fingerprint(query)) as call:
+                cursor.execute(query, params)
+                names = [d[0] for d in cursor.description]
+                if after is None:
+                    writer.writerow(names)
+                key_positions = [names.index(k) for k in keys]
+
+                page_rows, last = 0, None
+                while True:
+                    rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+                    if not rows:
+                        break
+                    writer.writerows(rows)
+                    page_rows += len(rows)
+                    last = rows[-1]
+                call.rows = page_rows
+            total += page_rows
+            if page_rows < EXPORT_PAGE_SIZE:
+                return total
+            after = tuple(last[i] for i in key_positions)
+    finally:
+        cursor.close()
+
+
+def _remove_export(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def discard_export():
+    """Delete this session's prepared export, if any."""
+    export = st.session_state.pop("tv_export", None)
+    if export is not None:
+        _remove_export(export[0])
+
+
+def sweep_exports(max_age=EXPORT_MAX_AGE_SECONDS):
+    """Delete exports older than `max_age` seconds (left by sessions that ended)."""
+    cutoff = time.time() - max_age
+    with os.scandir(EXPORT_DIR) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                _remove_export(entry.path)
+
 
 def table_viewer_page(conn):
     st.title("📊 Database Table Viewer")
     st.markdown("Explore tables in Campus Event Management System.")
 
-    tables = ["students", "faculty", "venue", "event", "registrations", "feedback", "resources", "organising_team", "audit_logs", "grievances", "participating_team", "pteam_members", "oTeam_members", "cancellations", "clubs"]
+    tables = list(TABLE_KEYS)
     selected_table = st.selectbox("Select Table", tables)
 
-    if st.button("🔍 View Table Data"):
-        df, msg = view_table(conn, selected_table)
-        if msg == "Success" and df is not None:
-            if df.empty:
-                st.info("No rows found in selected table.")
-            else:
-                st.dataframe(df, use_container_width=True)
-                csv = df.to_csv(index=False).encode('utf-8')
-                st.download_button("📥 Download CSV", csv, file_name=f"{selected_table}.csv", mime="text/csv")
+    # Reset paging whenever the table changes
+    if st.session_state.get("tv_table") != selected_table:
+        st.session_state["tv_table"] = selected_table
+        st.session_state["tv_cursors"] = [None]
+        discard_export()
+
+    try:
+        all_columns = table_columns(conn, selected_table)
+    except Exception as e:
+        st.error(f"Error fetching data: {e}")
+        return
+
+    col_cols, col_size = st.columns([3, 1])
+    columns = col_cols.multiselect("Columns (all if empty)", all_columns, key=f"tv_columns_{selected_table}")
+    page_size = col_size.selectbox("Rows per page", PAGE_SIZES, index=1, key="tv_page_size")
+
+    filters = []
+    with st.expander("Filter rows"):
+        f1, f2, f3 = st.columns([2, 1, 2])
+        filter_col = f1.selectbox("Column", ["—"] + all_columns, key=f"tv_filter_col_{selected_table}")
+        filter_op = f2.selectbox("Operator", FILTER_OPERATORS, key="tv_filter_op")
+        filter_val = f3.text_input("Value", key="tv_filter_val")
+        if filter_col != "—" and filter_val != "":
+            filters.append((filter_col, filter_op, filter_val))
+
+    # Any change to the query shape starts again from the first page
+    shape = (tuple(columns), page_size, tuple(filters))
+    if st.session_state.get("tv_shape") != shape:
+        st.session_state["tv_shape"] = shape
+        st.session_state["tv_cursors"] = [None]
+        discard_export()
+
+    cursors = st.session_state["tv_cursors"]
+    df, next_cursor, msg = view_table(conn, selected_table, columns, filters, cursors[-1], page_size)
+    if msg != "Success" or df is None:
+        st.error(f"Error fetching data: {msg}")
+        return
+
+    if df.empty:
+        st.info("No rows found in selected table.")
+    else:
+        st.dataframe(df, use_container_width=True)
+
+    nav_prev, nav_page, nav_next = st.columns([1, 2, 1])
+    if nav_prev.button("⬅️ Previous", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    caption = f"Page {len(cursors)} · {len(df)} rows"
+    if not df.empty:
+        memory = memory_report(df).iloc[-1]
+        caption += f" · {memory['Bytes'] / 1024:.0f} KB in memory ({memory['Share_%']}% of untyped)"
+    nav_page.caption(caption)
+    if nav_next.button("Next ➡️", disabled=next_cursor is None):
+        cursors.append(next_cursor)
+        st.rerun()
+
+    st.markdown("---")
+    if st.button("📦 Prepare Full CSV Export"):
+        discard_export()
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        sweep_exports()
+        # Written to disk page by page under an unguessable name: the static server hands any
+        # file in EXPORT_DIR to whoever has its URL
+        path = os.path.join(EXPORT_DIR, f"{selected_table}_{secrets.token_urlsafe(16)}.csv")
+        try:
+            with open(path, "w", newline="", encoding="utf-8") as out:
+                rows = export_table_csv(conn, selected_table, out, columns, filters)
+            st.session_state["tv_export"] = (path, rows)
+        except Exception as e:
+            _remove_export(path)
+            st.error(f"Error exporting data: {e}")
+
+    if "tv_export" in st.session_state:
+        path, rows = st.session_state["tv_export"]
+        if os.path.exists(path):
+            st.caption(f"{rows} rows exported ({os.path.getsize(path) / 1e6:.1f} MB)")
+            # A plain link, so the browser downloads the file straight from disk
+            st.markdown(
+                f'<a href="{EXPORT_URL}/{os.path.basename(path)}" download="{selected_table}.csv">📥 Download CSV</a>',
+                unsafe_allow_html=True,
+            )
         else:
-            st.error(f"Error fetching data: {msg}")
\ No newline at end of file
+            # Swept after EXPORT_MAX_AGE_SECONDS
+            discard_export()
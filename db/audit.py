@@ -0,0 +1,326 @@
+import csv
+import gzip
+import hashlib
+import os
+from datetime import date, datetime
+
+import pandas as pd
+
+from db.instrumentation import db_metrics, read_sql_query
+from db.loader import load_frame
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet is optional; archives fall back to gzip-compressed CSV
+    pa = pq = None
+
+AUDIT_ARCHIVE_DIR = os.getenv(
+    "AUDIT_ARCHIVE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "archive", "audit_logs"),
+)
+ARCHIVE_FORMATS = ("parquet", "csv.gz")
+DEFAULT_ARCHIVE_FORMAT = "parquet" if pq is not None else "csv.gz"
+
+AUDIT_COLUMNS = ["Log_ID", "Action_Type", "Performed_On", "Student_ID", "Faculty_ID", "Admin_ID"]
+ACTOR_COLUMNS = ("Student_ID", "Faculty_ID", "Admin_ID")
+
+# Rows per fetch while writing an archive segment
+ARCHIVE_FETCH_SIZE = 10_000
+
+PARTITIONS_QUERY = """
+    SELECT PARTITION_NAME AS Partition_Name,
+           IF(PARTITION_DESCRIPTION = 'MAXVALUE', NULL, FROM_UNIXTIME(PARTITION_DESCRIPTION)) AS Range_End,
+           TABLE_ROWS AS Approx_Rows
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND LOWER(TABLE_NAME) = 'audit_logs'
+    ORDER BY PARTITION_ORDINAL_POSITION
+"""
+
+
+def _month_start(day, offset=0):
+    month = day.year * 12 + day.month - 1 + offset
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def list_partitions(conn):
+    """Partitions of Audit_Logs in order with their (exclusive) upper bound; the catch-all has none."""
+    df = read_sql_query(PARTITIONS_QUERY, conn)
+    if df["Partition_Name"].isna().all():
+        raise RuntimeError("Audit_Logs is not partitioned; apply migration V004 first.")
+    df["Range_Start"] = df["Range_End"].shift()
+    return df[["Partition_Name", "Range_Start", "Range_End", "Approx_Rows"]]
+
+
+def ensure_partitions(conn, months_ahead=3):
+    """Split monthly partitions off p_future until `months_ahead` months past the current one exist.
+
+    Returns the names of the partitions added. Run it regularly (scripts/archive_audit_logs.py does).
+    """
+    months = list_partitions(conn).dropna(subset=["Range_End"])
+    target = _month_start(date.today(), months_ahead + 1)
+    next_month = _month_start(months["Range_End"].iloc[-1].date()) if not months.empty else _month_start(date.today())
+    added = []
+    while next_month < target:
+        added.append((f"p{next_month:%Y%m}", _month_start(next_month, 1)))
+        next_month = _month_start(next_month, 1)
+    if added:
+        parts = ", ".join(f"PARTITION {name} VALUES LESS THAN (UNIX_TIMESTAMP('{end} 00:00:00'))" for name, end in added)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"ALTER TABLE Audit_Logs REORGANIZE PARTITION p_future INTO ({parts}, PARTITION p_future VALUES LESS THAN MAXVALUE)")
+        finally:
+            cursor.close()
+    return [name for name, _ in added]
+
+
+def _write_segment(cursor, path, fmt):
+    """Stream the cursor's rows into `path`; returns (rows, min Log_ID, max Log_ID)."""
+    rows_written, min_id, max_id = 0, None, None
+    if fmt == "parquet":
+        if pq is None:
+            raise RuntimeError("Parquet archives need pyarrow; install it or use the csv.gz format.")
+        schema = pa.schema([("Log_ID", pa.int64()), ("Action_Type", pa.string()), ("Performed_On", pa.timestamp("s")),
+                            ("Student_ID", pa.int64()), ("Faculty_ID", pa.int64()), ("Admin_ID", pa.int64())])
+        with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+            while True:
+                rows = cursor.fetchmany(ARCHIVE_FETCH_SIZE)
+                if not rows:
+                    break
+                writer.write_table(pa.Table.from_pylist([dict(zip(AUDIT_COLUMNS, row)) for row in rows], schema=schema))
+                rows_written += len(rows)
+                min_id = rows[0][0] if min_id is None else min_id
+                max_id = rows[-1][0]
+    else:
+        with gzip.open(path, "wt", newline="", encoding="utf-8") as out:
+            writer = csv.writer(out)
+            writer.writerow(AUDIT_COLUMNS)
+            while True:
+                rows = cursor.fetchmany(ARCHIVE_FETCH_SIZE)
+                if not rows:
+                    break
+                writer.writerows(rows)
+                rows_written += len(rows)
+                min_id = rows[0][0] if min_id is None else min_id
+                max_id = rows[-1][0]
+    return rows_written, min_id, max_id
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _swap_table(partition):
+    """Holding table for one partition's rows between EXCHANGE PARTITION and the manifest commit."""
+    return f"Audit_Logs_Swap_{partition}"
+
+
+def _recover_partition(conn, partition):
+    """Finish or undo an earlier archive run of `partition` that stopped part way.
+
+    EXCHANGE PARTITION commits on its own, so a run that failed after it leaves the month's
+    rows only in the partition's swap table. With a manifest row the archive is complete and
+    only the cleanup is finished; returns that summary. Otherwise the rows are swapped back
+    into the (empty) live partition and None is returned, so the month is archived afresh.
+    """
+    swap = _swap_table(partition)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (swap,)
+        )
+        swap_exists = cursor.fetchone()[0] > 0
+        cursor.execute("SELECT Row_Count, Path, Format FROM Audit_Archive WHERE Partition_Name = %s", (partition,))
+        manifest = cursor.fetchone()
+        conn.commit()
+
+        if manifest is not None:
+            rows, path, fmt = manifest
+            cursor.execute(f"SELECT COUNT(*) FROM Audit_Logs PARTITION ({partition})")
+            if cursor.fetchone()[0]:
+                raise RuntimeError(f"{partition} is archived in {path} but still holds rows; check it by hand.")
+            if swap_exists:
+                cursor.execute(f"DROP TABLE {swap}")
+            cursor.execute(f"ALTER TABLE Audit_Logs DROP PARTITION {partition}")
+            return {"Partition": partition, "Rows": rows, "Path": path, "Format": fmt}
+
+        if swap_exists:
+            cursor.execute(f"SELECT COUNT(*) FROM {swap}")
+            if cursor.fetchone()[0]:
+                cursor.execute(f"ALTER TABLE Audit_Logs EXCHANGE PARTITION {partition} WITH TABLE {swap}")
+                cursor.execute(f"SELECT COUNT(*) FROM {swap}")
+                if cursor.fetchone()[0]:
+                    raise RuntimeError(f"{partition} and {swap} both hold rows; merge them by hand before archiving.")
+            cursor.execute(f"DROP TABLE {swap}")
+        return None
+    finally:
+        cursor.close()
+
+
+def archive_partition(conn, partition, range_start, range_end, directory=AUDIT_ARCHIVE_DIR, fmt=DEFAULT_ARCHIVE_FORMAT):
+    """Move one month out of Audit_Logs into a compressed file without deleting a single row.
+
+    The partition is first copied to disk. It is then swapped out of the live table with
+    EXCHANGE PARTITION, and the row counts of the file and the swapped-out rows must match
+    before the manifest row is written. Only then is the (now empty) partition dropped.
+    On a mismatch the partition is swapped back and nothing changes. A run interrupted
+    after the swap is finished or undone first (_recover_partition), and an existing
+    archive file is never overwritten.
+    """
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format '{fmt}'; choose from {', '.join(ARCHIVE_FORMATS)}.")
+    recovered = _recover_partition(conn, partition)
+    if recovered is not None:
+        return recovered
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"audit_logs_{partition}.{fmt}")
+    tmp_path = path + ".tmp"
+    if os.path.exists(path):
+        raise RuntimeError(f"{path} already exists but is not in Audit_Archive; move it aside before archiving {partition}.")
+    swap = _swap_table(partition)
+
+    with db_metrics.timed("transaction", "archive_audit_partition") as call:
+        cursor = conn.cursor(buffered=False)
+        try:
+            cursor.execute(f"SELECT {', '.join(AUDIT_COLUMNS)} FROM Audit_Logs PARTITION ({partition}) ORDER BY Log_ID")
+            rows, min_id, max_id = _write_segment(cursor, tmp_path, fmt)
+        finally:
+            cursor.close()
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"CREATE TABLE {swap} LIKE Audit_Logs")
+            cursor.execute(f"ALTER TABLE {swap} REMOVE PARTITIONING")
+            cursor.execute(f"ALTER TABLE Audit_Logs EXCHANGE PARTITION {partition} WITH TABLE {swap}")
+            # From here until the manifest commit the month's rows live only in the swap table
+            cursor.execute(f"SELECT COUNT(*) FROM {swap}")
+            swapped = cursor.fetchone()[0]
+            if swapped != rows:
+                cursor.execute(f"ALTER TABLE Audit_Logs EXCHANGE PARTITION {partition} WITH TABLE {swap}")
+                cursor.execute(f"DROP TABLE {swap}")
+                os.remove(tmp_path)
+                raise RuntimeError(f"{partition}: wrote {rows} rows but {swapped} were swapped out; partition restored.")
+
+            if os.path.exists(path):
+                raise RuntimeError(f"{path} appeared while archiving {partition}; the rows are kept in {swap}.")
+            os.replace(tmp_path, path)
+            cursor.execute(
+                """
+                INSERT INTO Audit_Archive (Partition_Name, Range_Start, Range_End, Row_Count, Min_Log_ID, Max_Log_ID, Path, Format, SHA256)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                (partition, range_start, range_end, rows, min_id, max_id, path, fmt, _sha256(path))
+            )
+            conn.commit()
+            cursor.execute(f"DROP TABLE {swap}")
+            cursor.execute(f"ALTER TABLE Audit_Logs DROP PARTITION {partition}")
+        finally:
+            cursor.close()
+        call.rows = rows
+    return {"Partition": partition, "Rows": rows, "Path": path, "Format": fmt}
+
+
+def archive_partitions(conn, keep_months=12, directory=AUDIT_ARCHIVE_DIR, fmt=DEFAULT_ARCHIVE_FORMAT):
+    """Archive every monthly partition that ends before the last `keep_months` months; returns their summaries."""
+    cutoff = datetime.combine(_month_start(date.today(), -keep_months), datetime.min.time())
+    cold = list_partitions(conn).dropna(subset=["Range_End"])
+    cold = cold[cold["Range_End"] <= cutoff]
+    archived = []
+    for part in cold.itertuples(index=False):
+        # The oldest partition also holds anything older than its month
+        start = part.Range_Start if pd.notna(part.Range_Start) else datetime(1970, 1, 1)
+        archived.append(archive_partition(conn, part.Partition_Name, start, part.Range_End, directory, fmt))
+    return archived
+
+
+def archive_manifest(conn):
+    return read_sql_query("SELECT * FROM Audit_Archive ORDER BY Range_Start", conn)
+
+
+def verify_archive(conn):
+    """Manifest rows with a Status column: OK, Missing or Checksum mismatch."""
+    manifest = archive_manifest(conn)
+    manifest["Status"] = [
+        "Missing" if not os.path.exists(path) else ("OK" if _sha256(path) == digest else "Checksum mismatch")
+        for path, digest in zip(manifest["Path"], manifest["SHA256"])
+    ]
+    return manifest
+
+
+def _audit_scope(start, end, student_id, faculty_id, admin_id, action):
+    where, params = [], []
+    if start is not None:
+        where.append("Performed_On >= %s")
+        params.append(start)
+    if end is not None:
+        where.append("Performed_On < %s")
+        params.append(end)
+    for column, value in zip(ACTOR_COLUMNS, (student_id, faculty_id, admin_id)):
+        if value is not None:
+            where.append(f"{column} = %s")
+            params.append(int(value))
+    if action:
+        where.append("Action_Type LIKE %s")
+        params.append(f"%{action}%")
+    return " AND ".join(where) or "TRUE", params
+
+
+def _read_segment(path, fmt):
+    if fmt == "parquet":
+        if pq is None:
+            raise RuntimeError(f"{path} is a Parquet archive; install pyarrow to read it.")
+        return pd.read_parquet(path)
+    df = pd.read_csv(path, compression="gzip", parse_dates=["Performed_On"])
+    return df.astype({column: "Int64" for column in ACTOR_COLUMNS})
+
+
+def query_audit_logs(conn, start=None, end=None, student_id=None, faculty_id=None, admin_id=None,
+                     action=None, limit=1000, include_archive=True):
+    """Newest-first audit entries in [start, end), filtered by actor and action text, across live and archived data.
+
+    The live query reads only the partitions the range covers. Archived months are always older
+    than live ones, so segments are read (newest first) only while fewer than `limit` rows
+    have been found, and only those overlapping the range.
+    """
+    scope, params = _audit_scope(start, end, student_id, faculty_id, admin_id, action)
+    live = load_frame(
+        conn, f"SELECT {', '.join(AUDIT_COLUMNS)} FROM Audit_Logs WHERE {scope} ORDER BY Performed_On DESC, Log_ID DESC LIMIT {int(limit)}",
+        params
+    )
+    live["Source"] = "live"
+    frames = [live]
+    found = len(live)
+
+    if include_archive and found < limit:
+        segments = archive_manifest(conn).sort_values("Range_Start", ascending=False)
+        if start is not None:
+            segments = segments[segments["Range_End"] > pd.Timestamp(start)]
+        if end is not None:
+            segments = segments[segments["Range_Start"] < pd.Timestamp(end)]
+        for segment in segments.itertuples(index=False):
+            with db_metrics.timed("archive", segment.Partition_Name) as call:
+                df = _read_segment(segment.Path, segment.Format)
+                mask = pd.Series(True, index=df.index)
+                if start is not None:
+                    mask &= df["Performed_On"] >= pd.Timestamp(start)
+                if end is not None:
+                    mask &= df["Performed_On"] < pd.Timestamp(end)
+                for column, value in zip(ACTOR_COLUMNS, (student_id, faculty_id, admin_id)):
+                    if value is not None:
+                        mask &= df[column] == int(value)
+                if action:
+                    mask &= df["Action_Type"].str.contains(action, case=False, regex=False, na=False)
+                df = df[mask].assign(Source=segment.Partition_Name)
+                call.rows = len(df)
+            frames.append(df)
+            found += len(df)
+            if found >= limit:
+                break
+
+    result = pd.concat(frames, ignore_index=True) if len(frames) > 1 else live
+    return result.sort_values(["Performed_On", "Log_ID"], ascending=False, ignore_index=True).head(limit)
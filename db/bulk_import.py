@@ -0,0 +1,293 @@
+import csv
+import io
+import time
+from collections import OrderedDict
+
+import mysql.connector
+import pandas as pd
+
+from db.cache import query_cache
+from db.instrumentation import db_metrics
+from db.metrics import PAYMENT_STATUSES
+from db.pool import reset_session
+from db.registrations import lock_event, participating, refusal, write_teams
+
+# Team_Name is optional: rows sharing an Event_ID and Team_Name form one team, blank means solo
+REQUIRED_COLUMNS = ("Event_ID", "Student_ID", "Payment_Status")
+
+# Ids per IN (...) lookup during validation
+LOOKUP_CHUNK = 1000
+
+# CSV rows read, validated and written at a time, so the file is never held in memory whole
+IMPORT_CHUNK_ROWS = 10_000
+
+SPLIT_TEAM = "Team rows must be kept together: this team was already imported from earlier rows."
+
+
+def _chunks(items, size):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def parse_registrations(source, errors):
+    """Yield the rows of a CSV from a path, text or binary file object, one at a time.
+
+    Rows are dicts with the parsed fields. Rows that cannot be parsed are skipped, and
+    `errors` maps their CSV line numbers to the reason.
+    """
+    if isinstance(source, str):
+        with open(source, newline="", encoding="utf-8") as f:
+            yield from parse_registrations(f, errors)
+        return
+    if isinstance(source, (io.BufferedIOBase, io.RawIOBase)):
+        source = io.TextIOWrapper(source, encoding="utf-8", newline="")
+
+    reader = csv.DictReader(source)
+    missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV is missing required column(s): {', '.join(missing)}")
+
+    for line_no, raw in enumerate(reader, start=2):
+        try:
+            row = {
+                "Row": line_no,
+                "Event_ID": int(raw["Event_ID"]),
+                "Student_ID": int(raw["Student_ID"]),
+                "Payment_Status": (raw["Payment_Status"] or "").strip(),
+                "Team_Name": (raw.get("Team_Name") or "").strip() or None,
+            }
+        except (TypeError, ValueError):
+            errors[line_no] = "Event_ID and Student_ID must be integers."
+            continue
+        if row["Payment_Status"] not in PAYMENT_STATUSES:
+            errors[line_no] = f"Payment_Status must be one of {', '.join(PAYMENT_STATUSES)}."
+            continue
+        yield row
+
+
+def _team_key(row):
+    return (row["Event_ID"], row["Team_Name"]) if row["Team_Name"] else ("solo", row["Row"])
+
+
+def _row_chunks(rows, size):
+    """Lists of at least `size` rows (the last may be shorter), never splitting a run of one team's rows."""
+    chunk = []
+    for row in rows:
+        if len(chunk) >= size and _team_key(row) != _team_key(chunk[-1]):
+            yield chunk
+            chunk = []
+        chunk.append(row)
+    if chunk:
+        yield chunk
+
+
+def _fetch_events(cursor, event_ids):
+    events = {}
+    for chunk in _chunks(event_ids, LOOKUP_CHUNK):
+        cursor.execute(
+            f"SELECT Event_ID, Event_Name, Date >= CURDATE() FROM Event WHERE Event_ID IN ({', '.join(['%s'] * len(chunk))})",
+            chunk,
+        )
+        for event_id, name, is_future in cursor.fetchall():
+            events[event_id] = (name, bool(is_future))
+    return events
+
+
+def _fetch_students(cursor, student_ids):
+    found = set()
+    for chunk in _chunks(student_ids, LOOKUP_CHUNK):
+        cursor.execute(
+            f"SELECT Student_ID FROM Students WHERE Student_ID IN ({', '.join(['%s'] * len(chunk))})",
+            chunk,
+        )
+        found.update(r[0] for r in cursor.fetchall())
+    return found
+
+
+def _fetch_participation(cursor, event_ids):
+    pairs = set()
+    for chunk in _chunks(event_ids, LOOKUP_CHUNK):
+        cursor.execute(
+            f"""
+            SELECT Event_ID, Student_ID
+            FROM PTeam_Members
+            WHERE Event_ID IN ({', '.join(['%s'] * len(chunk))})
+            """,
+            chunk,
+        )
+        pairs.update(cursor.fetchall())
+    return pairs
+
+
+def validate_registrations(conn, rows, errors):
+    """Check rows against the same rules as the registration triggers, in memory.
+
+    Group valid rows into teams (one per solo row, one per Event_ID + Team_Name) and
+    return them as an ordered list; failures are added to `errors`.
+    """
+    cursor = conn.cursor()
+    try:
+        event_ids = {r["Event_ID"] for r in rows}
+        events = _fetch_events(cursor, event_ids)
+        students = _fetch_students(cursor, {r["Student_ID"] for r in rows})
+        taken = _fetch_participation(cursor, event_ids)
+    finally:
+        cursor.close()
+
+    teams = OrderedDict()
+    for row in rows:
+        event = events.get(row["Event_ID"])
+        key = _team_key(row)
+        pair = (row["Event_ID"], row["Student_ID"])
+
+        # Same messages as T-4 (before_registration_insert) and T-7 (before_pteam_member_insert)
+        if event is None:
+            errors[row["Row"]] = "Cannot register: Event does not exist."
+        elif not event[1]:
+            errors[row["Row"]] = "Cannot register: Event date is in the past."
+        elif row["Student_ID"] not in students:
+            errors[row["Row"]] = "Student ID does not exist."
+        elif pair in taken:
+            errors[row["Row"]] = "Student already participates in another team for this event."
+        else:
+            taken.add(pair)
+            row["Event_Name"] = event[0]
+            teams.setdefault(key, []).append(row)
+            continue
+        # A failed member invalidates the whole team it belongs to
+        if row["Team_Name"]:
+            teams.setdefault(key, []).append(None)
+
+    valid = []
+    for members in teams.values():
+        if any(m is None for m in members):
+            for m in members:
+                if m is not None:
+                    errors[m["Row"]] = "Team rejected: another member of this team failed validation."
+                    taken.discard((m["Event_ID"], m["Student_ID"]))
+        else:
+            valid.append(members)
+    return valid
+
+
+def _insert_teams(cursor, teams):
+    """Write one transaction's teams; returns (registrations written, [(refused team, message)]).
+
+    Events are locked in Event_ID order (lock_event()) and each team is checked against the
+    seats left and the members already taken, as the registration queue does, before its event's
+    teams go through write_teams().
+    """
+    by_event = OrderedDict()
+    for team in sorted(teams, key=lambda team: team[0]["Event_ID"]):
+        by_event.setdefault(team[0]["Event_ID"], []).append(team)
+
+    written, refused = 0, []
+    for event_id, event_teams in by_event.items():
+        event = lock_event(cursor, event_id)
+        seats_left = event[1] if event else 0
+        taken = participating(cursor, event_id, [m["Student_ID"] for team in event_teams for m in team])
+        admitted = []
+        for team in event_teams:
+            student_ids = [m["Student_ID"] for m in team]
+            seats = sum(1 for m in team if m["Payment_Status"] != "Cancelled")
+            reason = refusal(event, seats_left, taken, student_ids, seats)
+            if reason is not None:
+                refused.append((team, reason[1]))
+                continue
+            seats_left -= seats
+            taken.update(student_ids)
+            admitted.append(team)
+        write_teams(cursor, event_id, [
+            (team[0]["Team_Name"], [(m["Student_ID"], m["Event_Name"], m["Payment_Status"]) for m in team])
+            for team in admitted
+        ])
+        written += sum(len(team) for team in admitted)
+    return written, refused
+
+
+def write_registrations(conn, teams, errors, chunk_size=500):
+    """Insert validated teams with multi-row INSERTs, one transaction per chunk of teams.
+
+    A failing chunk is rolled back and retried team by team so the error is attributed
+    to the rows that caused it. Teams refused for a closed or full event are recorded once
+    their transaction commits. Returns the number of registrations written.
+    """
+    written = 0
+    cursor = conn.cursor()
+    try:
+        # write_teams() writes the audit rows and counters itself (V007)
+        cursor.execute("SET @registration_batch = 1")
+        for chunk in _chunks(teams, chunk_size):
+            try:
+                outcome = _insert_teams(cursor, chunk)
+                conn.commit()
+                outcomes = [outcome]
+            except mysql.connector.Error:
+                conn.rollback()
+                outcomes = []
+                for team in chunk:
+                    try:
+                        outcome = _insert_teams(cursor, [team])
+                        conn.commit()
+                    except mysql.connector.Error as e:
+                        conn.rollback()
+                        outcome = (0, [(team, e.msg)])
+                    outcomes.append(outcome)
+            for count, refused in outcomes:
+                written += count
+                for team, msg in refused:
+                    for m in team:
+                        errors[m["Row"]] = msg
+    finally:
+        # The connection goes back to the pool: never leave the flag behind
+        reset_session(conn, "SET @registration_batch = NULL")
+        cursor.close()
+    return written
+
+
+def import_registrations(conn, source, chunk_size=500):
+    """Validate and bulk-insert a CSV of solo and team registrations.
+
+    The CSV is streamed IMPORT_CHUNK_ROWS rows at a time: each chunk is validated and written
+    before the next one is read. A team's rows must therefore come together; rows of a team
+    already imported from an earlier chunk are rejected. Returns (report, summary): a per-row
+    DataFrame with Status/Error and a dict with row counts, elapsed seconds and registrations
+    per second.
+    """
+    started = time.perf_counter()
+    unparsed, errors = {}, {}
+    row_numbers, imported_teams, written = [], set(), 0
+    for rows in _row_chunks(parse_registrations(source, unparsed), IMPORT_CHUNK_ROWS):
+        row_numbers.extend(row["Row"] for row in rows)
+        for row in rows:
+            if row["Team_Name"] and _team_key(row) in imported_teams:
+                errors[row["Row"]] = SPLIT_TEAM
+        rows = [row for row in rows if row["Row"] not in errors]
+        imported_teams.update(_team_key(row) for row in rows if row["Team_Name"])
+
+        with db_metrics.timed("transaction", "bulk_import.validate") as call:
+            teams = validate_registrations(conn, rows, errors)
+            call.rows = len(rows)
+        with db_metrics.timed("transaction", "bulk_import.write") as call:
+            call.rows = write_registrations(conn, teams, errors, chunk_size)
+        written += call.rows
+    elapsed = time.perf_counter() - started
+
+    if written:
+        query_cache.invalidate("Registrations", "Participating_Team", "PTeam_Members")
+
+    errors.update(unparsed)
+    report = pd.DataFrame(
+        [{"Row": row_no, "Status": "Registered", "Error": None} for row_no in row_numbers if row_no not in errors]
+        + [{"Row": row_no, "Status": "Failed", "Error": msg} for row_no, msg in errors.items()],
+        columns=["Row", "Status", "Error"],
+    ).sort_values("Row", ignore_index=True)
+    summary = {
+        "Rows": len(row_numbers) + len(unparsed),
+        "Registered": written,
+        "Failed": len(errors),
+        "Seconds": round(elapsed, 3),
+        "Rows_Per_Second": round(written / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+    return report, summary
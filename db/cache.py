@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class QueryCache:
+    """Process-wide LRU cache of query results with TTL and table-based invalidation.
+
+    Entries are keyed by (kind, name, args) and tagged with the tables they read
+    from, so a write path can evict everything that depends on a table it touched
+    via `invalidate("Event")`.
+    """
+
+    def __init__(self, max_entries=256, ttl=60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, tables, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(kind, name, args=None):
+        return (kind, " ".join(name.split()), tuple(args) if args else ())
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, value, tables=(), ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        tags = frozenset(t.lower() for t in tables)
+        with self._lock:
+            self._entries[key] = (expires_at, tags, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, key, loader, tables=(), ttl=None):
+        """Return the cached value for `key`, calling `loader()` on a miss.
+
+        `loader` may return None to signal a result that must not be cached (e.g. an error).
+        """
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            if value is not None:
+                self.put(key, value, tables, ttl)
+        return value
+
+    def invalidate(self, *tables):
+        """Evict every entry that reads from any of `tables`; with no arguments, clear everything."""
+        tags = {t.lower() for t in tables}
+        with self._lock:
+            if not tags:
+                self._entries.clear()
+                return
+            stale = [key for key, (_, entry_tags, _) in self._entries.items() if entry_tags & tags]
+            for key in stale:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+query_cache = QueryCache(
+    max_entries=int(os.getenv("QUERY_CACHE_SIZE", 256)),
+    ttl=float(os.getenv("QUERY_CACHE_TTL", 60)),
+)
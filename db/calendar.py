@@ -0,0 +1,390 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from db.change_feed import ChangeTracker
+from db.instrumentation import read_sql_query
+from db.statements import call_function
+
+try:
+    import pyarrow  # noqa: F401  (pandas' Parquet engine)
+    SNAPSHOT_FORMAT = "parquet"
+except ImportError:  # snapshots fall back to gzip CSV without pyarrow
+    SNAPSHOT_FORMAT = "csv.gz"
+
+# Where the calendar snapshot (events + manifest) is kept between server restarts
+CALENDAR_DIR = os.getenv("CALENDAR_DIR", "cache/calendar")
+# Days covered around today: the active term as far as lookups are concerned
+CALENDAR_DAYS_BEFORE = int(os.getenv("CALENDAR_DAYS_BEFORE", 30))
+CALENDAR_DAYS_AFTER = int(os.getenv("CALENDAR_DAYS_AFTER", 240))
+
+# GetEventsForDate's (P-10) and CheckVenueAvailability's (F-4) view of the events of a date range.
+# Clubs is a LEFT JOIN: F-4 counts events without a club, P-10 lists only those with one. Events
+# without a start or end time are listed by P-10 but can never clash, so they get no venue slot.
+CALENDAR_QUERY = """
+    SELECT e.Event_ID, e.Event_Name, e.Event_Type, e.Date, e.Start_Time, e.End_Time,
+           e.Venue_ID, v.Venue_Name, c.Club_Name
+    FROM Event e
+    JOIN Venue v ON e.Venue_ID = v.Venue_ID
+    LEFT JOIN Clubs c ON e.Club_ID = c.Club_ID
+    WHERE e.Date BETWEEN %s AND %s AND {scope}
+"""
+
+# Only what the calendar shows (V008); Event_Stats traffic is skipped through idx_change_table
+CALENDAR_TABLES = ("Event", "Venue", "Clubs")
+
+# F-4's predicate in the database, leaving out the event being moved; locks the venue's day (I-2)
+# until the write that follows commits
+VENUE_CLASH_QUERY = """
+    SELECT COUNT(*) FROM Event
+    WHERE Venue_ID = %s AND Date = %s AND Start_Time < %s AND End_Time > %s AND Event_ID <> %s
+    FOR UPDATE
+"""
+
+# P-10's result columns, in its order
+DAY_COLUMNS = ["Event_ID", "Event_Name", "Event_Type", "Start_Time", "End_Time", "Venue_Name", "Club_Name"]
+COMPARED_COLUMNS = ["Event_Name", "Event_Type", "Date", "Start_S", "End_S", "Venue_ID", "Venue_Name", "Club_Name"]
+
+
+def _seconds(value):
+    """TIME / timedelta / time / 'HH:MM[:SS]' as whole seconds since midnight; None for NULL."""
+    if value is None or value is pd.NaT or (isinstance(value, float) and pd.isna(value)):
+        return None
+    if isinstance(value, timedelta):
+        return int(value.total_seconds())
+    if isinstance(value, str):
+        parts = [int(p) for p in value.split(":")] + [0, 0]
+        return parts[0] * 3600 + parts[1] * 60 + parts[2]
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def _frame(df):
+    """Query result as the calendar's event table: one row per Event_ID, times in seconds."""
+    return pd.DataFrame({
+        "Event_ID": df["Event_ID"].astype("int64"),
+        "Event_Name": df["Event_Name"],
+        "Event_Type": df["Event_Type"],
+        "Date": pd.to_datetime(df["Date"]).dt.date,
+        "Start_S": pd.array([_seconds(v) for v in df["Start_Time"]], dtype="Int64"),
+        "End_S": pd.array([_seconds(v) for v in df["End_Time"]], dtype="Int64"),
+        "Venue_ID": df["Venue_ID"].astype("int64"),
+        "Venue_Name": df["Venue_Name"],
+        "Club_Name": df["Club_Name"],
+    }).set_index("Event_ID")
+
+
+class VenueCalendar:
+    """In-memory calendar of the active term: per-day event lists and per-(day, venue) sorted intervals.
+
+    Built from one range query (or the on-disk snapshot left by the last server run), then
+    kept current from Change_Log: sync() costs two indexed lookups when nothing changed, and at
+    most one poll every `min_interval` seconds unless forced. Changed events, including ones
+    committed out of Change_ID order (ChangeTracker), are re-read by id and only their days are
+    re-indexed; the whole window is reloaded every `full_reload_seconds` as a backstop.
+    events_on() and is_available() answer P-10 and F-4 from memory for display; they return
+    None for dates outside the window, and callers fall back to the database. A check right
+    before a write goes to the database (venue_is_free). check() compares the calendar with
+    the database.
+    """
+
+    def __init__(self, directory=CALENDAR_DIR, days_before=CALENDAR_DAYS_BEFORE, days_after=CALENDAR_DAYS_AFTER,
+                 min_interval=2.0, full_reload_seconds=900.0):
+        self.directory = directory
+        self.days_before = days_before
+        self.days_after = days_after
+        self.min_interval = min_interval
+        self.full_reload_seconds = full_reload_seconds
+        self._lock = threading.RLock()
+        self._events = None
+        self._days = {}   # date -> P-10 rows, ordered by start time
+        self._slots = {}  # (date, Venue_ID) -> (starts, ends, event ids), ordered by start
+        self._checked = 0.0
+        self._loaded = 0.0
+        self.log = ChangeTracker(tables=CALENDAR_TABLES)
+        self.window = None
+        self.stats = {"polls": 0, "deltas": 0, "full_loads": 0, "snapshot_loads": 0, "events_reloaded": 0}
+
+    # ---------------------------------------------------------------- lookups
+
+    def events_on(self, conn, day):
+        """P-10 GetEventsForDate for `day`, or None when `day` is outside the calendar."""
+        day = _as_date(day)
+        with self._lock:
+            self.sync(conn)
+            if not self.window[0] <= day <= self.window[1]:
+                return None
+            rows = self._days.get(day)
+            if rows is None:
+                return pd.DataFrame(columns=DAY_COLUMNS)
+            return rows.copy()
+
+    def is_available(self, conn, venue_id, day, start_time, end_time, exclude_event_id=None):
+        """F-4 CheckVenueAvailability from memory, or None when `day` is outside the calendar.
+
+        `exclude_event_id` ignores that event's own booking (an event being moved or rescheduled).
+        """
+        day, start, end = _as_date(day), _seconds(start_time), _seconds(end_time)
+        with self._lock:
+            self.sync(conn)
+            if not self.window[0] <= day <= self.window[1]:
+                return None
+            starts, ends, ids = self._slots.get((day, int(venue_id)), ((), (), ()))
+        # Only bookings starting before `end` can overlap; of those, any ending after `start` does
+        for i in range(bisect_left(starts, end)):
+            if ends[i] > start and ids[i] != exclude_event_id:
+                return False
+        return True
+
+    # ---------------------------------------------------------------- keeping current
+
+    @property
+    def version(self):
+        return self.log.version
+
+    def _target_window(self):
+        today = date.today()
+        return today - timedelta(days=self.days_before), today + timedelta(days=self.days_after)
+
+    def sync(self, conn, force=False):
+        """Bring the calendar up to date with the database (at most every `min_interval` seconds unless forced)."""
+        with self._lock:
+            now = time.monotonic()
+            if self._events is not None and not force and now - self._checked < self.min_interval:
+                return
+            cursor = conn.cursor()
+            try:
+                low, head, db_now, _ = self.log.head(cursor)
+                self.stats["polls"] += 1
+                if self._events is None:
+                    self._load_snapshot()
+                if self._events is None or self._stale(low, head) or now - self._loaded >= self.full_reload_seconds:
+                    self._full_load(conn, cursor, head, db_now)
+                else:
+                    changes = self.log.changes(cursor, head)
+                    changed = {event_id for _, event_id, _ in changes}
+                    if None in changed:
+                        self._full_load(conn, cursor, head, db_now)
+                    elif changes or head != self.version:
+                        self._apply(conn, sorted(changed), changes, head, db_now)
+                    else:
+                        self.log.applied(changes, head, db_now)
+                conn.commit()
+            finally:
+                cursor.close()
+            self._checked = now
+
+    def rebuild(self, conn):
+        """Reload the whole window from the database and rewrite the snapshot."""
+        with self._lock:
+            cursor = conn.cursor()
+            try:
+                _, head, db_now, _ = self.log.head(cursor)
+                self._full_load(conn, cursor, head, db_now)
+            finally:
+                cursor.close()
+            conn.commit()
+            self._checked = time.monotonic()
+
+    def _stale(self, low, head):
+        """The window no longer holds the term ahead, or Change_Log cannot bring our version up to `head`
+        (pruned past it, or a snapshot from ahead of a restored database)."""
+        start, end = self._target_window()
+        drifted = self.window[0] > start or self.window[1] < end - timedelta(days=self.days_after // 2)
+        return drifted or self.version > head or (low is not None and self.version < low - 1)
+
+    def _read(self, conn, scope="TRUE", params=()):
+        df = read_sql_query(CALENDAR_QUERY.format(scope=scope), conn, params=(*self.window, *params))
+        return _frame(df)
+
+    def _full_load(self, conn, cursor, head, db_now):
+        self.window = self._target_window()
+        self._events = self._read(conn)
+        self.log.reset(cursor, head, db_now)
+        self._loaded = time.monotonic()
+        self._index(set(self._events["Date"]), rebuild=True)
+        self.stats["full_loads"] += 1
+        self._save_snapshot()
+
+    def _apply(self, conn, event_ids, changes, head, db_now):
+        """Re-read `event_ids` and re-index the days they left or joined; deleted events drop out."""
+        if event_ids:
+            fresh = self._read(conn, f"e.Event_ID IN ({', '.join(['%s'] * len(event_ids))})", tuple(event_ids))
+            old = self._events.reindex(event_ids).dropna(subset=["Date"])
+            days = set(old["Date"]) | set(fresh["Date"])
+            self._events = self._events.drop(index=event_ids, errors="ignore")
+            if not fresh.empty:
+                self._events = pd.concat([self._events, fresh])
+            self._index(days)
+            self.stats["events_reloaded"] += len(event_ids)
+        self.log.applied(changes, head, db_now)
+        self.stats["deltas"] += 1
+        self._save_snapshot()
+
+    def _index(self, days, rebuild=False):
+        """(Re)build the per-day lists and per-(day, venue) interval lists of `days`."""
+        if rebuild:
+            self._days, self._slots = {}, {}
+        else:
+            for day in days:
+                self._days.pop(day, None)
+            self._slots = {key: slot for key, slot in self._slots.items() if key[0] not in days}
+        # P-10's ORDER BY Start_Time lists events without a start time first
+        events = self._events[self._events["Date"].isin(days)].reset_index().sort_values(
+            ["Date", "Start_S", "Event_ID"], na_position="first"
+        )
+        for day, rows in events.groupby("Date", sort=False):
+            listed = rows[rows["Club_Name"].notna()]
+            if not listed.empty:
+                self._days[day] = pd.DataFrame({
+                    "Event_ID": listed["Event_ID"], "Event_Name": listed["Event_Name"], "Event_Type": listed["Event_Type"],
+                    "Start_Time": pd.to_timedelta(listed["Start_S"], unit="s"),
+                    "End_Time": pd.to_timedelta(listed["End_S"], unit="s"),
+                    "Venue_Name": listed["Venue_Name"], "Club_Name": listed["Club_Name"],
+                }).reset_index(drop=True)
+            timed = rows[rows["Start_S"].notna() & rows["End_S"].notna()]
+            for venue_id, booked in timed.groupby("Venue_ID", sort=False):
+                self._slots[(day, int(venue_id))] = (
+                    booked["Start_S"].astype("int64").tolist(), booked["End_S"].astype("int64").tolist(),
+                    booked["Event_ID"].tolist(),
+                )
+
+    # ---------------------------------------------------------------- snapshot
+
+    def _paths(self):
+        return os.path.join(self.directory, f"calendar.{SNAPSHOT_FORMAT}"), os.path.join(self.directory, "calendar.json")
+
+    def _save_snapshot(self):
+        data_path, manifest_path = self._paths()
+        os.makedirs(self.directory, exist_ok=True)
+        df = self._events.reset_index()
+        tmp = data_path + ".tmp"
+        if SNAPSHOT_FORMAT == "parquet":
+            df.to_parquet(tmp, index=False)
+        else:
+            df.to_csv(tmp, index=False, compression="gzip")
+        os.replace(tmp, data_path)
+        manifest = {"version": self.version, "polled_at": self.log.polled_at.isoformat(),
+                    "window": [d.isoformat() for d in self.window],
+                    "events": len(df), "saved_at": datetime.now().isoformat(timespec="seconds")}
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+    def _load_snapshot(self):
+        data_path, manifest_path = self._paths()
+        if not (os.path.exists(data_path) and os.path.exists(manifest_path)):
+            return
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            polled_at = datetime.fromisoformat(manifest["polled_at"])
+            if SNAPSHOT_FORMAT == "parquet":
+                df = pd.read_parquet(data_path)
+            else:
+                df = pd.read_csv(data_path, compression="gzip")
+        except (OSError, ValueError, KeyError):
+            return  # unreadable snapshot: rebuilt from the database
+        df["Date"] = pd.to_datetime(df["Date"]).dt.date
+        df["Club_Name"] = df["Club_Name"].astype(object).where(df["Club_Name"].notna(), None)
+        df = df.astype({"Start_S": "Int64", "End_S": "Int64"})
+        self._events = df.set_index("Event_ID")
+        self.window = tuple(date.fromisoformat(d) for d in manifest["window"])
+        # Changes logged from the re-read window before the last poll on are read again, so ones
+        # that committed after the snapshot was saved are not lost across the restart
+        self.log.version, self.log.polled_at = manifest["version"], polled_at
+        self._loaded = time.monotonic()
+        self._index(set(self._events["Date"]), rebuild=True)
+        self.stats["snapshot_loads"] += 1
+
+    # ---------------------------------------------------------------- consistency
+
+    def check(self, conn):
+        """Where the calendar and the database disagree (empty = consistent), after a forced sync.
+
+        Every event of the window is compared with the database: Issue "missing" (in the database
+        only), "extra" (in the calendar only) or "differs". Then P-10 GetEventsForDate is called
+        for every day with events on either side, and F-4 CheckVenueAvailability for every booked
+        venue-day (the whole day), against the calendar's answers: "P-10 differs", "F-4 differs".
+        """
+        with self._lock:
+            self.sync(conn, force=True)
+            mine = self._events
+            theirs = self._read(conn)
+            days = {day: self._days[day]["Event_ID"].tolist() if day in self._days else []
+                    for day in set(mine["Date"]) | set(theirs["Date"])}
+            venue_days = {(day, int(venue_id)) for day, venue_id in zip(theirs["Date"], theirs["Venue_ID"])} | set(self._slots)
+            free = {key: key not in self._slots for key in venue_days}
+
+        both = mine.join(theirs, how="outer", lsuffix="_Calendar", rsuffix="_DB")
+        issues = pd.Series(None, index=both.index, dtype=object)
+        differs = pd.Series(False, index=both.index)
+        for column in COMPARED_COLUMNS:
+            a, b = both[f"{column}_Calendar"], both[f"{column}_DB"]
+            differs |= ~((a == b).fillna(False).astype(bool) | (a.isna() & b.isna()))
+        issues[differs] = "differs"
+        issues[both["Date_Calendar"].isna()] = "missing"
+        issues[both["Date_DB"].isna()] = "extra"
+        report = both[issues.notna()].assign(Issue=issues[issues.notna()]).reset_index()
+        report = report[["Issue", "Event_ID"] + [c for c in report.columns if c not in ("Issue", "Event_ID")]]
+
+        procedures = []
+        cursor = conn.cursor()
+        try:
+            for day in sorted(days):
+                cursor.callproc("GetEventsForDate", (day,))
+                listed = sorted(row[0] for result in cursor.stored_results() for row in result.fetchall())
+                if listed != sorted(days[day]):
+                    procedures.append({"Issue": "P-10 differs", "Date": day, "Calendar": sorted(days[day]), "Database": listed})
+        finally:
+            cursor.close()
+        for day, venue_id in sorted(venue_days):
+            db_free = bool(call_function(conn, "CheckVenueAvailability", (venue_id, day, "00:00:00", "23:59:59")))
+            if db_free != free[(day, venue_id)]:
+                procedures.append({"Issue": "F-4 differs", "Date": day, "Venue_ID": venue_id,
+                                   "Calendar": free[(day, venue_id)], "Database": db_free})
+        conn.commit()
+        if procedures:
+            report = pd.concat([report, pd.DataFrame(procedures)], ignore_index=True)
+        return report
+
+    def summary(self):
+        with self._lock:
+            return {
+                "Window": f"{self.window[0]} to {self.window[1]}" if self.window else "not loaded",
+                "Events": 0 if self._events is None else len(self._events),
+                "Days": len(self._days),
+                "Venue_Days": len(self._slots),
+                "Version": self.version,
+                **self.stats,
+            }
+
+
+def venue_is_free(conn, venue_id, day, start_time, end_time, exclude_event_id=None):
+    """F-4 CheckVenueAvailability in the database, ignoring `exclude_event_id`'s own booking.
+
+    For the check right before a write: it reads committed rows and locks the venue's day
+    until the caller commits or rolls back, so two moves cannot both take the same slot.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(VENUE_CLASH_QUERY, (int(venue_id), day, end_time, start_time, int(exclude_event_id or 0)))
+        return cursor.fetchone()[0] == 0
+    finally:
+        cursor.close()
+
+
+# Shared by every session in this server process
+venue_calendar = VenueCalendar()
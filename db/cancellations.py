@@ -0,0 +1,139 @@
+import time
+
+from db.cache import query_cache
+from db.instrumentation import db_metrics
+from db.pool import reset_session
+
+# Ids per IN (...) when collecting an explicit list of registrations
+ID_CHUNK = 1000
+
+# Registrations to cancel in this transaction, with what the audit log and Event_Stats need
+CREATE_CANCEL_SET = """
+    CREATE TEMPORARY TABLE Bulk_Cancel_Set (
+        Registration_ID INT PRIMARY KEY,
+        Student_ID INT,
+        PTeam_ID INT,
+        Event_ID INT,
+        Old_Status VARCHAR(50)
+    )
+"""
+
+# Locks the selected registrations so a concurrent cancellation cannot cancel them twice
+COLLECT_CANCEL_SET = """
+    INSERT IGNORE INTO Bulk_Cancel_Set (Registration_ID, Student_ID, PTeam_ID, Event_ID, Old_Status)
+    SELECT r.Registration_ID, r.Student_ID, r.PTeam_ID, pt.Event_ID, r.Payment_Status
+    FROM Registrations r
+    LEFT JOIN Participating_Team pt ON r.PTeam_ID = pt.PTeam_ID
+    WHERE r.Payment_Status <> 'Cancelled' AND {scope}
+    FOR UPDATE
+"""
+
+# Same rows ProcessCancellation writes, once for the whole set
+INSERT_CANCELLATIONS = """
+    INSERT INTO Cancellations (Reg_ID, Cancelled_Date, Reason)
+    SELECT Registration_ID, CURDATE(), %s FROM Bulk_Cancel_Set
+"""
+
+CANCEL_STATEMENTS = [
+    """
+    UPDATE Registrations r
+    JOIN Bulk_Cancel_Set b ON r.Registration_ID = b.Registration_ID
+    SET r.Payment_Status = 'Cancelled'
+    """,
+    # The audit rows after_cancellation_insert would have written one by one
+    """
+    INSERT INTO Audit_Logs (Action_Type, Student_ID)
+    SELECT CONCAT('Registration cancelled for Event ID ', Event_ID), Student_ID FROM Bulk_Cancel_Set
+    """,
+    # The counter moves after_registration_update would have made one by one
+    """
+    UPDATE Event_Stats s
+    JOIN (
+        SELECT Event_ID, COUNT(*) AS Moved,
+               SUM(Old_Status = 'Paid') AS Paid, SUM(Old_Status = 'Pending') AS Pending
+        FROM Bulk_Cancel_Set
+        WHERE Event_ID IS NOT NULL
+        GROUP BY Event_ID
+    ) d ON s.Event_ID = d.Event_ID
+    SET s.Paid_Count = s.Paid_Count - d.Paid,
+        s.Pending_Count = s.Pending_Count - d.Pending,
+        s.Cancelled_Count = s.Cancelled_Count + d.Moved
+    """,
+]
+
+SUMMARY_QUERY = """
+    SELECT COUNT(*), COUNT(DISTINCT PTeam_ID), COUNT(DISTINCT Event_ID),
+           IFNULL(SUM(Old_Status = 'Paid'), 0), IFNULL(SUM(Old_Status = 'Pending'), 0)
+    FROM Bulk_Cancel_Set
+"""
+
+
+def _scopes(registration_ids, team_id, event_id, statuses):
+    """(WHERE fragment, params) pairs selecting the target registrations."""
+    targets = sum(x is not None for x in (registration_ids, team_id, event_id))
+    if targets != 1:
+        raise ValueError("Give exactly one of registration_ids, team_id or event_id.")
+    if registration_ids is not None:
+        ids = sorted({int(i) for i in registration_ids})
+        return [
+            (f"r.Registration_ID IN ({', '.join(['%s'] * len(chunk))})", tuple(chunk))
+            for chunk in (ids[i:i + ID_CHUNK] for i in range(0, len(ids), ID_CHUNK))
+        ]
+    if team_id is not None:
+        return [("r.PTeam_ID = %s", (int(team_id),))]
+    scope, params = "pt.Event_ID = %s", [int(event_id)]
+    if statuses:
+        scope += f" AND r.Payment_Status IN ({', '.join(['%s'] * len(statuses))})"
+        params.extend(statuses)
+    return [(scope, tuple(params))]
+
+
+def bulk_cancel(conn, reason, registration_ids=None, team_id=None, event_id=None, statuses=None):
+    """Cancel a list of registrations, a whole team, or an event's registrations (optionally only
+    those with a payment status in `statuses`) in one transaction.
+
+    Already cancelled registrations are skipped. Returns a dict with the number of registrations,
+    teams and events affected, the previous Paid/Pending counts and the elapsed time. On failure
+    everything is rolled back and the error re-raised.
+    """
+    scopes = _scopes(registration_ids, team_id, event_id, statuses)
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    with db_metrics.timed("transaction", "bulk_cancel") as call:
+        try:
+            cursor.execute("DROP TEMPORARY TABLE IF EXISTS Bulk_Cancel_Set")
+            cursor.execute(CREATE_CANCEL_SET)
+            # Tells after_cancellation_insert and after_registration_update to step aside (V003)
+            cursor.execute("SET @bulk_cancellation = 1")
+
+            for scope, params in scopes:
+                cursor.execute(COLLECT_CANCEL_SET.format(scope=scope), params)
+            cursor.execute(SUMMARY_QUERY)
+            cancelled, teams, events, paid, pending = cursor.fetchone()
+
+            if cancelled:
+                cursor.execute(INSERT_CANCELLATIONS, (reason,))
+                for statement in CANCEL_STATEMENTS:
+                    cursor.execute(statement)
+            conn.commit()
+            call.rows = cancelled
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            # The connection goes back to the pool: never leave the flag or the set behind
+            reset_session(conn, "SET @bulk_cancellation = NULL", "DROP TEMPORARY TABLE IF EXISTS Bulk_Cancel_Set")
+            cursor.close()
+
+    if cancelled:
+        query_cache.invalidate("Registrations", "Cancellations", "Event_Stats", "Audit_Logs")
+    elapsed = time.perf_counter() - started
+    return {
+        "Cancelled": int(cancelled),
+        "Teams": int(teams),
+        "Events": int(events),
+        "Were_Paid": int(paid),
+        "Were_Pending": int(pending),
+        "Seconds": round(elapsed, 3),
+        "Rows_Per_Second": round(cancelled / elapsed, 1) if elapsed > 0 else 0.0,
+    }
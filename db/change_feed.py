@@ -0,0 +1,176 @@
+import os
+import threading
+import time
+from datetime import timedelta
+
+import pandas as pd
+
+from db.instrumentation import read_sql_query
+from db.metrics import get_event_metrics
+
+# P-11 GetFutureEvents' columns, for every upcoming event or only the ones that changed
+UPCOMING_EVENTS_QUERY = """
+    SELECT e.Event_ID, e.Event_Name, e.Date, v.Venue_Name AS Venue, f.Name AS Faculty_In_Charge
+    FROM Event e
+    JOIN Venue v ON e.Venue_ID = v.Venue_ID
+    JOIN Faculty f ON e.Faculty_ID = f.Faculty_ID
+    WHERE e.Date >= CURDATE() AND {scope}
+    ORDER BY e.Date, e.Event_ID
+"""
+
+# Seconds of Change_Log re-read on every poll for changes that committed after a later Change_ID
+LATE_COMMIT_SECONDS = float(os.getenv("CHANGE_FEED_LATE_COMMIT_SECONDS", 60))
+
+# Where the log stands: oldest and newest change still logged, and the server's time and date
+HEAD_QUERY = "SELECT MIN(Change_ID), MAX(Change_ID), NOW(3), CURDATE() FROM Change_Log"
+
+# Everything after the version, plus everything logged since the re-read cut-off (idx_change_time)
+CHANGES_QUERY = """
+    SELECT Change_ID, Event_ID, Changed_On FROM Change_Log
+    WHERE {scope} AND Change_ID > %s AND Change_ID <= %s
+    UNION
+    SELECT Change_ID, Event_ID, Changed_On FROM Change_Log
+    WHERE {scope} AND Changed_On >= %s AND Change_ID <= %s
+"""
+
+WINDOW_QUERY = "SELECT Change_ID, Changed_On FROM Change_Log WHERE {scope} AND Changed_On >= %s AND Change_ID <= %s"
+
+PRUNE_QUERY = "DELETE FROM Change_Log WHERE Changed_On < NOW() - INTERVAL %s HOUR LIMIT 10000"
+
+
+class ChangeTracker:
+    """Which Change_Log rows (of `tables`, or all) a snapshot has applied.
+
+    Change_IDs are handed out when a change is logged, not when it commits, so a change can
+    commit after a later one has been read and sit below `version` for good. Each poll
+    therefore also re-reads what was logged from `late_commit_seconds` before the previous
+    poll on, and returns the changes among them not applied yet. Only a transaction open for
+    longer than that can still be missed.
+    """
+
+    def __init__(self, tables=None, late_commit_seconds=LATE_COMMIT_SECONDS):
+        self.scope = f"Table_Name IN ({', '.join(repr(t) for t in tables)})" if tables else "TRUE"
+        self.late_commit_seconds = late_commit_seconds
+        self.version = None
+        self.polled_at = None  # database time of the previous poll
+        self._seen = {}        # Change_ID -> Changed_On, for the applied changes still inside the re-read window
+
+    def head(self, cursor):
+        """(oldest Change_ID, newest Change_ID or 0, database time, database date)."""
+        cursor.execute(HEAD_QUERY)
+        low, head, now, today = cursor.fetchone()
+        return low, head or 0, now, today
+
+    def _cutoff(self, now):
+        return now - timedelta(seconds=self.late_commit_seconds)
+
+    def changes(self, cursor, head):
+        """(Change_ID, Event_ID, Changed_On) of the changes up to `head` not applied yet."""
+        cursor.execute(CHANGES_QUERY.format(scope=self.scope), (self.version, head, self._cutoff(self.polled_at), head))
+        return [row for row in cursor.fetchall() if row[0] not in self._seen]
+
+    def applied(self, changes, head, now):
+        """Record `changes` as applied and the snapshot as current up to `head` at database time `now`."""
+        cutoff = self._cutoff(now)
+        self._seen.update((change_id, changed_on) for change_id, _, changed_on in changes)
+        self._seen = {change_id: changed_on for change_id, changed_on in self._seen.items() if changed_on >= cutoff}
+        self.version, self.polled_at = head, now
+
+    def reset(self, cursor, head, now):
+        """After a full load read in the same transaction: everything up to `head` committed so far is applied."""
+        cursor.execute(WINDOW_QUERY.format(scope=self.scope), (self._cutoff(now), head))
+        self._seen = dict(cursor.fetchall())
+        self.version, self.polled_at = head, now
+
+
+class UpcomingEventsFeed:
+    """Process-wide snapshot of upcoming events (P-11) and their metrics, kept current from Change_Log (V005).
+
+    current() costs one indexed MIN/MAX lookup when nothing changed, and at most one every
+    `min_interval` seconds however many sessions ask. When events changed, only those are read
+    again, including changes committed out of Change_ID order (ChangeTracker). A full reload
+    happens on first use, when the date rolls over, when a change may touch many events (a NULL
+    Event_ID, or more than `max_delta_events`), when pruning overtook the snapshot, and every
+    `full_reload_seconds` as a backstop for transactions open longer than the re-read window.
+    """
+
+    def __init__(self, min_interval=2.0, full_reload_seconds=300.0, max_delta_events=500, keep_hours=24):
+        self.min_interval = min_interval
+        self.full_reload_seconds = full_reload_seconds
+        self.max_delta_events = max_delta_events
+        self.keep_hours = keep_hours
+        self._lock = threading.Lock()
+        self._events = None
+        self._metrics = None
+        self._day = None
+        self._checked = 0.0
+        self._loaded = 0.0
+        self.log = ChangeTracker()
+        self.stats = {"polls": 0, "deltas": 0, "full_loads": 0, "events_reloaded": 0}
+
+    def current(self, pool):
+        """(events, metrics indexed by Event_ID, version); a connection is borrowed only when polling."""
+        with self._lock:
+            now = time.monotonic()
+            if self._events is None or now - self._checked >= self.min_interval:
+                with pool.connection() as conn:
+                    self._refresh(conn, now)
+                self._checked = now
+            return self._events.copy(), self._metrics.copy(), self.version
+
+    @property
+    def version(self):
+        return self.log.version
+
+    def _refresh(self, conn, now):
+        cursor = conn.cursor()
+        try:
+            low, head, db_now, today = self.log.head(cursor)
+            self.stats["polls"] += 1
+
+            full = (
+                self._events is None or today != self._day or now - self._loaded >= self.full_reload_seconds
+                or (low is not None and self.version < low - 1)
+            )
+            if not full:
+                changes = self.log.changes(cursor, head)
+                changed = {event_id for _, event_id, _ in changes}
+                full = None in changed or len(changed) > self.max_delta_events
+
+            if full:
+                self._full_load(conn)
+                self.log.reset(cursor, head, db_now)
+                self._day, self._loaded = today, now
+                # Rows only a snapshot older than keep_hours could still need
+                cursor.execute(PRUNE_QUERY, (self.keep_hours,))
+            else:
+                self._apply(conn, sorted(changed))
+                self.log.applied(changes, head, db_now)
+            conn.commit()
+        finally:
+            cursor.close()
+
+    def _full_load(self, conn):
+        self._events = read_sql_query(UPCOMING_EVENTS_QUERY.format(scope="TRUE"), conn)
+        self._metrics = get_event_metrics(conn, upcoming=True, use_cache=False)
+        self.stats["full_loads"] += 1
+
+    def _apply(self, conn, event_ids):
+        """Replace the rows of `event_ids`; events no longer upcoming (or deleted) drop out."""
+        if not event_ids:
+            return
+        scope = f"e.Event_ID IN ({', '.join(['%s'] * len(event_ids))})"
+        events = read_sql_query(UPCOMING_EVENTS_QUERY.format(scope=scope), conn, params=tuple(event_ids))
+        metrics = get_event_metrics(conn, event_ids=events["Event_ID"].tolist(), use_cache=False)
+        kept = self._events[~self._events["Event_ID"].isin(event_ids)]
+        kept_metrics = self._metrics.drop(index=event_ids, errors="ignore")
+        if not events.empty:
+            kept = pd.concat([kept, events], ignore_index=True).sort_values(["Date", "Event_ID"], ignore_index=True)
+            kept_metrics = pd.concat([kept_metrics, metrics]).sort_index()
+        self._events, self._metrics = kept.reset_index(drop=True), kept_metrics
+        self.stats["deltas"] += 1
+        self.stats["events_reloaded"] += len(event_ids)
+
+
+# Shared by every dashboard session in this server process
+upcoming_feed = UpcomingEventsFeed()
@@ -0,0 +1,66 @@
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import mysql.connector
+
+from db.pool import get_pool
+from db.routing import replica_pool_of
+
+# Threads shared by every session for gather(); each task still runs on its own pooled connection
+_executor = ThreadPoolExecutor(max_workers=int(os.getenv("DB_GATHER_THREADS", 8)), thread_name_prefix="db-gather")
+
+
+def _run_on(pool, conn, task):
+    try:
+        return task(conn)
+    finally:
+        pool.checkin(conn)
+
+
+def gather(conn, *tasks, pool=None, return_exceptions=False):
+    """Run independent read tasks concurrently and return their results in order.
+
+    Each task is a callable taking a connection. The first runs on `conn` in the calling
+    thread. Every other task borrows its own connection from the pool, but only one free right
+    now: tasks that find the pool exhausted run on `conn` after the first, so gather never waits
+    for a connection and degrades to sequential calls under load. Page attribution of the
+    instrumentation is carried into the worker threads.
+
+    With return_exceptions=True a failed task's exception takes its place in the results;
+    otherwise the first failure is raised once every task has finished.
+    """
+    if not tasks:
+        return []
+    # Reads fanned out from a replica connection borrow from the same replica
+    pool = pool or replica_pool_of(conn) or get_pool()
+    futures, inline = [None] * len(tasks), []
+    for i, task in enumerate(tasks[1:], start=1):
+        try:
+            borrowed = pool.checkout(timeout=0)
+        except mysql.connector.Error:
+            # Pool exhausted (PoolTimeoutError) or no new connection could be opened
+            inline.append(i)
+            continue
+        context = contextvars.copy_context()
+        futures[i] = _executor.submit(context.run, _run_on, pool, borrowed, task)
+
+    results, errors = [None] * len(tasks), [None] * len(tasks)
+    for i in [0] + inline:
+        try:
+            results[i] = tasks[i](conn)
+        except Exception as e:
+            errors[i] = e
+    for i, future in enumerate(futures):
+        if future is not None:
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                errors[i] = e
+
+    for i, error in enumerate(errors):
+        if error is not None:
+            if not return_exceptions:
+                raise error
+            results[i] = error
+    return results
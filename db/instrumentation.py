@@ -0,0 +1,267 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+import pandas as pd
+
+# Upper bounds in milliseconds of the latency histogram buckets; anything slower lands in +Inf
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Page the current rerun is rendering, set by the router through DBMetrics.page_scope()
+current_page = ContextVar("current_page", default="(none)")
+_current_rerun = ContextVar("current_rerun", default=None)
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_PARAM = re.compile(r"%\(\w+\)s|%s")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(sql):
+    """SQL with literals and placeholders replaced by ? and IN lists collapsed, for grouping calls."""
+    text = _STRING.sub("?", sql)
+    text = _PARAM.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _IN_LIST.sub("(?, ...)", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+class _Series:
+    """Latency histogram plus counters for one (kind, name, page)."""
+
+    __slots__ = ("count", "errors", "total_ms", "max_ms", "rows", "buckets", "last_error")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.last_error = None
+
+    def add(self, ms, rows, error):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.rows += rows or 0
+        if error is not None:
+            self.errors += 1
+            self.last_error = str(error)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (capped at the observed maximum)."""
+        rank, seen = q * self.count, 0
+        for bound, n in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+
+class _Call:
+    """Handed out by DBMetrics.timed(); the caller fills in rows and, if it swallows one, the error."""
+
+    __slots__ = ("rows", "error")
+
+    def __init__(self):
+        self.rows = None
+        self.error = None
+
+
+class DBMetrics:
+    """In-process record of every database call: latency histograms, slow calls and DB time per rerun.
+
+    Calls are grouped by kind ("procedure", "function", "query"), name (routine name or SQL
+    fingerprint) and the page that made them. Shared by all sessions of this server process.
+    """
+
+    def __init__(self, slow_ms=250.0, keep_slow=200, keep_reruns=500):
+        self.slow_ms = slow_ms
+        self.keep_reruns = keep_reruns
+        self._lock = threading.Lock()
+        self._series = {}
+        self._slow = deque(maxlen=keep_slow)
+        self._reruns = {}
+        self._imports = {}
+        self.since = time.time()
+
+    def record(self, kind, name, ms, rows=None, error=None):
+        page = current_page.get()
+        with self._lock:
+            series = self._series.get((kind, name, page))
+            if series is None:
+                series = self._series[(kind, name, page)] = _Series()
+            series.add(ms, rows, error)
+            if ms >= self.slow_ms or error is not None:
+                self._slow.append({
+                    "At": time.strftime("%Y-%m-%d %H:%M:%S"), "Kind": kind, "Name": name, "Page": page,
+                    "Ms": round(ms, 2), "Rows": rows or 0, "Error": str(error) if error is not None else None,
+                })
+            # Under the lock: calls fanned out by db.executor.gather() share their rerun's totals
+            rerun = _current_rerun.get()
+            if rerun is not None:
+                rerun["db_ms"] += ms
+                rerun["calls"] += 1
+
+    def record_import(self, module, page, ms):
+        """First import of a page module in this process; the router imports pages on first navigation."""
+        with self._lock:
+            self._imports[module] = {
+                "Module": module, "Page": page, "Import_ms": round(ms, 2), "At": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+
+    @contextmanager
+    def timed(self, kind, name):
+        """Time the block as one call; exceptions escaping it are recorded as errors and re-raised."""
+        call = _Call()
+        started = time.perf_counter()
+        try:
+            yield call
+        except Exception as e:
+            call.error = call.error or e
+            raise
+        finally:
+            self.record(kind, name, (time.perf_counter() - started) * 1000, call.rows, call.error)
+
+    @contextmanager
+    def page_scope(self, page):
+        """Attribute the calls made inside to `page` and record the rerun's total DB time."""
+        rerun = {"db_ms": 0.0, "calls": 0}
+        page_token = current_page.set(page)
+        rerun_token = _current_rerun.set(rerun)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - started) * 1000
+            _current_rerun.reset(rerun_token)
+            current_page.reset(page_token)
+            with self._lock:
+                reruns = self._reruns.get(page)
+                if reruns is None:
+                    reruns = self._reruns[page] = deque(maxlen=self.keep_reruns)
+                reruns.append((rerun["db_ms"], rerun["calls"], wall_ms))
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._slow.clear()
+            self._reruns.clear()
+            self.since = time.time()
+
+    def calls_frame(self):
+        """One row per (kind, name, page) with counts and latency quantiles, slowest p95 first."""
+        with self._lock:
+            rows = [
+                {
+                    "Kind": kind, "Name": name, "Page": page, "Calls": s.count, "Errors": s.errors,
+                    "Total_ms": round(s.total_ms, 2), "Avg_ms": round(s.total_ms / s.count, 2),
+                    "p50_ms": round(s.quantile(0.5), 2), "p95_ms": round(s.quantile(0.95), 2),
+                    "p99_ms": round(s.quantile(0.99), 2), "Max_ms": round(s.max_ms, 2),
+                    "Rows": s.rows, "Last_Error": s.last_error,
+                }
+                for (kind, name, page), s in self._series.items()
+            ]
+        columns = ["Kind", "Name", "Page", "Calls", "Errors", "Total_ms", "Avg_ms", "p50_ms", "p95_ms",
+                   "p99_ms", "Max_ms", "Rows", "Last_Error"]
+        return pd.DataFrame(rows, columns=columns).sort_values("p95_ms", ascending=False, ignore_index=True)
+
+    def slow_calls_frame(self):
+        """The most recent calls slower than `slow_ms` or failed, newest first."""
+        with self._lock:
+            rows = list(self._slow)[::-1]
+        return pd.DataFrame(rows, columns=["At", "Kind", "Name", "Page", "Ms", "Rows", "Error"])
+
+    def imports_frame(self):
+        """Page modules imported so far, in import order (not reset: a module is imported once per process)."""
+        with self._lock:
+            rows = list(self._imports.values())
+        return pd.DataFrame(rows, columns=["Module", "Page", "Import_ms", "At"])
+
+    def reruns_frame(self):
+        """DB time and call count per rerun, summarised by page."""
+        with self._lock:
+            snapshot = {page: list(reruns) for page, reruns in self._reruns.items()}
+        rows = []
+        for page, reruns in snapshot.items():
+            db_ms = sorted(r[0] for r in reruns)
+            wall_ms = sum(r[2] for r in reruns)
+            rows.append({
+                "Page": page, "Reruns": len(reruns),
+                "Avg_DB_ms": round(sum(db_ms) / len(reruns), 2),
+                "p95_DB_ms": round(db_ms[min(len(db_ms) - 1, int(0.95 * len(db_ms)))], 2),
+                "Max_DB_ms": round(db_ms[-1], 2),
+                "Avg_Calls": round(sum(r[1] for r in reruns) / len(reruns), 2),
+                "Avg_Rerun_ms": round(wall_ms / len(reruns), 2),
+                "DB_Share_%": round(100 * sum(db_ms) / wall_ms, 1) if wall_ms else 0.0,
+            })
+        columns = ["Page", "Reruns", "Avg_DB_ms", "p95_DB_ms", "Max_DB_ms", "Avg_Calls", "Avg_Rerun_ms", "DB_Share_%"]
+        return pd.DataFrame(rows, columns=columns)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format (latencies in seconds)."""
+        def labels(**values):
+            escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values.values())
+            return "{" + ",".join(f'{k}="{v}"' for k, v in zip(values, escaped)) + "}"
+
+        lines = [
+            "# HELP campus_db_call_duration_seconds Latency of database calls.",
+            "# TYPE campus_db_call_duration_seconds histogram",
+        ]
+        with self._lock:
+            series = list(self._series.items())
+            reruns = {page: list(r) for page, r in self._reruns.items()}
+        for (kind, name, page), s in series:
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS_MS, s.buckets):
+                cumulative += n
+                lines.append(f"campus_db_call_duration_seconds_bucket{labels(kind=kind, name=name, page=page, le=bound / 1000)} {cumulative}")
+            lines.append(f"campus_db_call_duration_seconds_bucket{labels(kind=kind, name=name, page=page, le='+Inf')} {s.count}")
+            lines.append(f"campus_db_call_duration_seconds_sum{labels(kind=kind, name=name, page=page)} {s.total_ms / 1000:.6f}")
+            lines.append(f"campus_db_call_duration_seconds_count{labels(kind=kind, name=name, page=page)} {s.count}")
+        lines += ["# HELP campus_db_call_errors_total Failed database calls.", "# TYPE campus_db_call_errors_total counter"]
+        lines += [f"campus_db_call_errors_total{labels(kind=k, name=n, page=p)} {s.errors}" for (k, n, p), s in series]
+        lines += ["# HELP campus_db_rows_total Rows returned by database calls.", "# TYPE campus_db_rows_total counter"]
+        lines += [f"campus_db_rows_total{labels(kind=k, name=n, page=p)} {s.rows}" for (k, n, p), s in series]
+        lines += ["# HELP campus_page_db_seconds Database time per page rerun (recent reruns).",
+                  "# TYPE campus_page_db_seconds summary"]
+        for page, runs in reruns.items():
+            lines.append(f"campus_page_db_seconds_sum{labels(page=page)} {sum(r[0] for r in runs) / 1000:.6f}")
+            lines.append(f"campus_page_db_seconds_count{labels(page=page)} {len(runs)}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self):
+        return json.dumps({
+            "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.since)),
+            "calls": self.calls_frame().to_dict(orient="records"),
+            "reruns": self.reruns_frame().to_dict(orient="records"),
+            "imports": self.imports_frame().to_dict(orient="records"),
+            "slow_calls": self.slow_calls_frame().to_dict(orient="records"),
+        }, indent=2, default=str)
+
+
+# Process-wide recorder; calls at or above DB_SLOW_CALL_MS are also kept individually
+db_metrics = DBMetrics(slow_ms=float(os.getenv("DB_SLOW_CALL_MS", 250)))
+
+
+def read_sql_query(sql, con, params=None, **kwargs):
+    """pd.read_sql_query, recorded under the statement's fingerprint."""
+    with db_metrics.timed("query", fingerprint(sql)) as call:
+        df = pd.read_sql_query(sql, con, params=params, **kwargs)
+        call.rows = len(df)
+    return df
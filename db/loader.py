@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+from mysql.connector import FieldFlag, FieldType
+
+from db.instrumentation import db_metrics, fingerprint
+
+try:
+    import pyarrow as pa
+except ImportError:  # DATE columns fall back to datetime64 without pyarrow
+    pa = None
+
+# Rows per fetchmany(); only one chunk of Python tuples is alive at a time
+LOAD_CHUNK_SIZE = 10_000
+
+# Text columns with at most this share of distinct values are stored as categoricals
+CATEGORY_MAX_RATIO = 0.5
+
+_INT_DTYPES = {
+    FieldType.TINY: "Int8",
+    FieldType.SHORT: "Int16",
+    FieldType.INT24: "Int32",
+    FieldType.LONG: "Int32",
+    FieldType.LONGLONG: "Int64",
+    FieldType.YEAR: "Int16",
+}
+# DECIMAL (money, ratings) is not here: it stays exact, as the connector's Decimal objects
+_FLOAT_DTYPES = {
+    FieldType.FLOAT: "float32",
+    FieldType.DOUBLE: "float64",
+}
+_DATETIME_TYPES = {FieldType.DATETIME, FieldType.TIMESTAMP}
+_DATE_TYPES = {FieldType.DATE, FieldType.NEWDATE}
+_TEXT_TYPES = {FieldType.VARCHAR, FieldType.VAR_STRING, FieldType.STRING, FieldType.ENUM, FieldType.SET}
+
+
+def _kind(field):
+    """How a cursor.description entry is stored: (kind, dtype)."""
+    type_code, flags = field[1], field[7] if len(field) > 7 else 0
+    if type_code in _INT_DTYPES:
+        dtype = _INT_DTYPES[type_code]
+        return "int", ("U" + dtype if flags & FieldFlag.UNSIGNED else dtype)
+    if type_code in _FLOAT_DTYPES:
+        return "float", _FLOAT_DTYPES[type_code]
+    if type_code in _DATETIME_TYPES:
+        return "datetime", "datetime64[ns]"
+    if type_code in _DATE_TYPES:
+        return ("date", pd.ArrowDtype(pa.date32())) if pa is not None else ("datetime", "datetime64[ns]")
+    if type_code == FieldType.TIME:
+        return "time", "timedelta64[ns]"
+    if type_code in _TEXT_TYPES:
+        return ("enum" if flags & FieldFlag.ENUM else "text"), None
+    return "object", None
+
+
+def _convert(kind, dtype, values):
+    """One chunk of one column as a typed array."""
+    if kind == "int":
+        return pd.array(values, dtype=dtype)
+    if kind == "float":
+        return np.array([np.nan if v is None else float(v) for v in values], dtype=dtype)
+    if kind in ("datetime", "date", "time"):
+        return pd.Series(values, dtype=dtype).array
+    return np.array(values, dtype=object)
+
+
+class _Codes:
+    """Text column built up as category codes: each distinct string is kept once however often it repeats."""
+
+    def __init__(self):
+        self.index = {}
+        self.parts = []
+
+    def add(self, values):
+        index = self.index
+        self.parts.append(np.fromiter(
+            (-1 if v is None else index.setdefault(v, len(index)) for v in values), dtype=np.int32, count=len(values)
+        ))
+
+    def column(self):
+        codes = np.concatenate(self.parts) if self.parts else np.array([], dtype=np.int32)
+        return pd.Series(pd.Categorical.from_codes(codes, categories=pd.Index(list(self.index), dtype=object)))
+
+
+def read_frame(cursor, chunk_size=LOAD_CHUNK_SIZE):
+    """DataFrame from an executed cursor, read in chunks straight into typed columns.
+
+    Integers become nullable Int8..Int64 (UInt for UNSIGNED), FLOAT/DOUBLE floats,
+    DATETIME/TIMESTAMP datetime64, DATE date32 (datetime64 without pyarrow) and TIME
+    timedelta64; DECIMAL keeps its exact Decimal values. ENUM columns and text columns with few distinct values (at most
+    CATEGORY_MAX_RATIO of the rows) become categoricals, so repeated strings are stored once.
+    """
+    if not cursor.description:
+        return pd.DataFrame()
+    names = [field[0] for field in cursor.description]
+    kinds = [_kind(field) for field in cursor.description]
+    chunks = [_Codes() if kind in ("text", "enum") else [] for kind, _ in kinds]
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for i, values in enumerate(zip(*rows)):
+            if isinstance(chunks[i], _Codes):
+                chunks[i].add(values)
+            else:
+                chunks[i].append(_convert(*kinds[i], values))
+        del rows
+
+    columns = {}
+    for name, (kind, dtype), parts in zip(names, kinds, chunks):
+        if isinstance(parts, _Codes):
+            column = parts.column()
+            if kind == "text" and len(parts.index) > CATEGORY_MAX_RATIO * len(column):
+                column = column.astype(object)
+            columns[name] = column
+        elif not parts:
+            columns[name] = pd.Series([], dtype=dtype or object)
+        elif isinstance(parts[0], np.ndarray):
+            columns[name] = pd.Series(np.concatenate(parts))
+        else:
+            columns[name] = pd.Series(parts[0]._concat_same_type(parts) if len(parts) > 1 else parts[0])
+    return pd.DataFrame(columns)
+
+
+def load_frame(conn, sql, params=None, chunk_size=LOAD_CHUNK_SIZE):
+    """read_frame() for a query, streamed through an unbuffered cursor and recorded like read_sql_query."""
+    with db_metrics.timed("query", fingerprint(sql)) as call:
+        cursor = conn.cursor(buffered=False)
+        try:
+            cursor.execute(sql, params or ())
+            df = read_frame(cursor, chunk_size)
+        finally:
+            cursor.close()
+        call.rows = len(df)
+    return df
+
+
+def memory_report(df):
+    """Per-column dtype and bytes, next to the same data as plain Python objects (what a default load holds)."""
+    typed = df.memory_usage(deep=True, index=False)
+    plain = df.astype(object).memory_usage(deep=True, index=False)
+    report = pd.DataFrame({"Column": df.columns, "Dtype": df.dtypes.astype(str).values,
+                           "Bytes": typed.values, "Object_Bytes": plain.values})
+    total = pd.DataFrame([{"Column": "(total)", "Dtype": "", "Bytes": typed.sum(), "Object_Bytes": plain.sum()}])
+    report = pd.concat([report, total], ignore_index=True)
+    report["Share_%"] = (100 * report["Bytes"] / report["Object_Bytes"].where(report["Object_Bytes"] > 0)).round(1)
+    return report
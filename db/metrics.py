@@ -0,0 +1,63 @@
+import pandas as pd
+
+from db.cache import query_cache
+from db.instrumentation import read_sql_query
+
+# Tables read by the metrics query; writes to any of them evict cached metrics
+METRICS_TABLES = ("Event", "Venue", "Event_Stats", "Registrations", "Participating_Team", "Feedback", "Grievances")
+
+# Payment statuses broken out as their own columns (F-7)
+PAYMENT_STATUSES = ("Paid", "Pending", "Cancelled")
+
+# F-1, F-2, F-5, F-7, F-10 and the grievance count for many events in one pass over Event_Stats
+# (V002), which the triggers keep current, so cost grows with the number of events asked for only.
+EVENT_METRICS_QUERY = """
+    SELECT
+        e.Event_ID,
+        COALESCE(s.Total_Registrations, 0) AS Total_Registrations,
+        COALESCE(s.Paid_Count, 0) AS Paid_Registrations,
+        COALESCE(s.Pending_Count, 0) AS Pending_Registrations,
+        COALESCE(s.Cancelled_Count, 0) AS Cancelled_Registrations,
+        COALESCE(s.Team_Count, 0) AS Team_Count,
+        CAST(IF(s.Rating_Count > 0, s.Rating_Sum / s.Rating_Count, 0) AS DECIMAL(3, 2)) AS Avg_Rating,
+        COALESCE(s.Rating_Count, 0) AS Feedback_Count,
+        CASE WHEN v.Capacity IS NULL OR v.Capacity = 0 THEN 0.00
+             ELSE ROUND(COALESCE(s.Total_Registrations, 0) / v.Capacity * 100, 2) END AS Capacity_Usage,
+        ROUND(TIME_TO_SEC(TIMEDIFF(e.End_Time, e.Start_Time)) / 3600, 2) AS Duration_Hours,
+        COALESCE(s.Grievance_Count, 0) AS Total_Grievances
+    FROM Event e
+    LEFT JOIN Venue v ON e.Venue_ID = v.Venue_ID
+    LEFT JOIN Event_Stats s ON s.Event_ID = e.Event_ID
+    WHERE {scope}
+    ORDER BY e.Event_ID
+"""
+
+
+def _scope(event_ids, upcoming):
+    if event_ids is not None:
+        ids = tuple(int(i) for i in event_ids)
+        return f"e.Event_ID IN ({', '.join(['%s'] * len(ids))})", ids
+    if upcoming:
+        return "e.Date >= CURDATE()", ()
+    return "TRUE", ()
+
+
+def get_event_metrics(conn, event_ids=None, upcoming=False, use_cache=True):
+    """Per-event metrics for `event_ids`, all upcoming events, or every event, in one query.
+
+    Returns a DataFrame indexed by Event_ID. Events that do not exist are simply absent.
+    """
+    if event_ids is not None and len(event_ids) == 0:
+        return pd.DataFrame(columns=["Event_ID"]).set_index("Event_ID")
+
+    scope, ids = _scope(event_ids, upcoming)
+    query = EVENT_METRICS_QUERY.format(scope=scope)
+    params = ids or None
+
+    def load():
+        return read_sql_query(query, conn, params=params).set_index("Event_ID")
+
+    if not use_cache:
+        return load()
+    key = query_cache.make_key("metrics", query, params)
+    return query_cache.get_or_load(key, load, tables=METRICS_TABLES).copy()
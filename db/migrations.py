@@ -0,0 +1,98 @@
+import os
+import re
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sql", "migrations")
+
+# Migration files are named V<version>__<description>.sql and applied in version order
+_MIGRATION_FILE = re.compile(r"^V(\d+)__(\w+)\.sql$")
+
+SCHEMA_MIGRATIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS Schema_Migrations (
+        Version INT PRIMARY KEY,
+        Description VARCHAR(200),
+        Applied_On TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def split_sql_script(text):
+    """Split a .sql script into statements, honouring mysql-client DELIMITER lines."""
+    statements, buffer, delimiter = [], [], ";"
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.upper().startswith("DELIMITER "):
+            delimiter = stripped.split(None, 1)[1]
+            continue
+        if not buffer and (not stripped or stripped.startswith("--")):
+            continue
+        buffer.append(line)
+        if stripped.endswith(delimiter):
+            statement = "\n".join(buffer).rstrip()[: -len(delimiter)].strip()
+            if statement:
+                statements.append(statement)
+            buffer = []
+    tail = "\n".join(buffer).strip()
+    if tail:
+        statements.append(tail)
+    return statements
+
+
+def run_sql_script(conn, text):
+    """Execute every statement of a script, discarding any result sets."""
+    cursor = conn.cursor()
+    try:
+        for statement in split_sql_script(text):
+            cursor.execute(statement)
+            if cursor.with_rows:
+                cursor.fetchall()
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def list_migrations(directory=MIGRATIONS_DIR):
+    migrations = []
+    for name in os.listdir(directory):
+        match = _MIGRATION_FILE.match(name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2).replace("_", " "), os.path.join(directory, name)))
+    return sorted(migrations)
+
+
+def applied_versions(conn):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(SCHEMA_MIGRATIONS_DDL)
+        cursor.execute("SELECT Version FROM Schema_Migrations")
+        return {row[0] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def apply_migration(conn, version, description, path):
+    with open(path, encoding="utf-8") as f:
+        run_sql_script(conn, f.read())
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "INSERT INTO Schema_Migrations (Version, Description) VALUES (%s, %s)",
+            (version, description),
+        )
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def apply_pending(conn, directory=MIGRATIONS_DIR, upto=None):
+    """Apply every migration newer than the database, up to and including `upto`.
+
+    Returns the list of (version, description) applied.
+    """
+    done = applied_versions(conn)
+    applied = []
+    for version, description, path in list_migrations(directory):
+        if version in done or (upto is not None and version > upto):
+            continue
+        apply_migration(conn, version, description, path)
+        applied.append((version, description))
+    return applied
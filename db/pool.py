@@ -0,0 +1,187 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector.errors import PoolError
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection could be checked out within the timeout."""
+
+
+class ConnectionPool:
+    """Thread-safe pool of MySQL connections with health checks and timed checkout.
+
+    Connections are opened lazily up to `size`. Idle connections that have not
+    been used for `health_check_interval` seconds are pinged before being handed
+    out, and broken ones are replaced transparently.
+    """
+
+    def __init__(self, size=8, timeout=10.0, health_check_interval=30.0, **connect_args):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.connect_args = connect_args
+
+        self._idle = deque()  # (connection, last_used) pairs, most recently used on the right
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._closed = False
+
+    @classmethod
+    def from_env(cls, prefix="DB"):
+        """Build a pool from the DB_* environment variables used by the app."""
+        return cls(
+            size=int(os.getenv(f"{prefix}_POOL_SIZE", 8)),
+            timeout=float(os.getenv(f"{prefix}_POOL_TIMEOUT", 10)),
+            health_check_interval=float(os.getenv(f"{prefix}_POOL_HEALTH_CHECK", 30)),
+            host=os.getenv(f"{prefix}_HOST"),
+            port=int(os.getenv(f"{prefix}_PORT", 3306)),
+            user=os.getenv(f"{prefix}_USER"),
+            password=os.getenv(f"{prefix}_PASSWORD"),
+            database=os.getenv(f"{prefix}_NAME"),
+            # IMPORTANT: autocommit=False for explicit transaction control in execute_procedure
+            autocommit=False,
+        )
+
+    def _open(self):
+        conn = mysql.connector.connect(**self.connect_args)
+        with self._lock:
+            self._opened += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except mysql.connector.Error:
+            pass
+        with self._lock:
+            self._opened -= 1
+
+    def _healthy(self, conn, last_used):
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except mysql.connector.Error:
+            return False
+
+    def checkout(self, timeout=None):
+        """Borrow a connection, waiting up to `timeout` seconds for a free slot."""
+        if self._closed:
+            raise PoolError("Connection pool is closed.")
+        timeout = self.timeout if timeout is None else timeout
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._waits += 1
+            if not self._slots.acquire(timeout=timeout):
+                raise PoolTimeoutError(
+                    f"No database connection available after {timeout:.1f}s (pool size {self.size})."
+                )
+
+        try:
+            while True:
+                with self._lock:
+                    idle = self._idle.pop() if self._idle else None
+                if idle is None:
+                    conn = self._open()
+                    break
+                conn, last_used = idle
+                if self._healthy(conn, last_used):
+                    break
+                self._discard(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._checkouts += 1
+        return conn
+
+    def checkin(self, conn):
+        """Return a connection, rolling back any transaction left open by the caller."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            keep = not self._closed and conn.is_connected()
+        except mysql.connector.Error:
+            keep = False
+
+        if keep:
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+        else:
+            self._discard(conn)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Scoped checkout: `with pool.connection() as conn: ...`"""
+        conn = self.checkout(timeout)
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "opened": self._opened,
+                "idle": len(self._idle),
+                "in_use": self._opened - len(self._idle),
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+            }
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn, _ in idle:
+            self._discard(conn)
+
+
+def reset_session(conn, *statements):
+    """Run session clean-up `statements` (user variables, temporary tables) on a connection about to go back to the pool.
+
+    Never raises, so it cannot hide the error a caller's `finally` is unwinding with. If a
+    statement fails, the connection is closed instead and checkin() discards it, so no later
+    checkout gets a session with the state left behind.
+    """
+    try:
+        cursor = conn.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+    except mysql.connector.Error:
+        try:
+            conn.close()
+        except mysql.connector.Error:
+            pass
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Process-wide pool configured from the environment, created on first use."""
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = ConnectionPool.from_env()
+    return _default_pool
@@ -0,0 +1,177 @@
+import math
+from collections import Counter
+
+from mysql.connector import errors
+
+from db.cache import query_cache
+from db.instrumentation import db_metrics
+from db.pool import reset_session
+
+# MySQL errors: a duplicate key, and SIGNAL SQLSTATE '45000' from the triggers and procedures
+ER_DUP_ENTRY = 1062
+ER_SIGNAL_EXCEPTION = 1644
+
+# Trigger messages, raised unchanged when the check happens outside the trigger (V007)
+ALREADY_PARTICIPATING = "Student already participates in another team for this event."
+EVENT_MISSING = "Cannot register: Event does not exist."
+EVENT_PAST = "Cannot register: Event date is in the past."
+EVENT_FULL = "Cannot register: Event is full."
+
+# The event's counters row is the capacity lock: a writer holds it FOR UPDATE from counting the
+# seats taken until it commits the ones it adds, so two writers can never sell the same seat.
+# Event and Venue are read without locking (OF s), so events sharing a venue never wait on each other.
+LOCK_EVENT_QUERY = """
+    SELECT e.Date >= CURDATE(), v.Capacity, s.Total_Registrations - s.Cancelled_Count
+    FROM Event e
+    JOIN Event_Stats s ON s.Event_ID = e.Event_ID
+    LEFT JOIN Venue v ON v.Venue_ID = e.Venue_ID
+    WHERE e.Event_ID = %s
+    FOR UPDATE OF s
+"""
+
+PARTICIPATION_QUERY = "SELECT Student_ID FROM PTeam_Members WHERE Event_ID = %s AND Student_ID IN ({ids})"
+
+
+def values_rows(row_count, width):
+    """Placeholders of a multi-row VALUES list: `row_count` rows of `width` columns."""
+    row = "(" + ", ".join(["%s"] * width) + ")"
+    return ", ".join([row] * row_count)
+
+
+def signal_error(msg):
+    """The exception a trigger's SIGNAL with `msg` would have raised."""
+    return errors.get_mysql_exception(ER_SIGNAL_EXCEPTION, msg, "45000")
+
+
+def participation_error(error):
+    """A duplicate PTeam_Members row (uq_member_event or the primary key) as Trigger 7's SIGNAL; other errors unchanged."""
+    if isinstance(error, errors.Error) and error.errno == ER_DUP_ENTRY:
+        return signal_error(ALREADY_PARTICIPATING)
+    return error
+
+
+def lock_event(cursor, event_id):
+    """(is open, seats left) of `event_id`, or None when it does not exist.
+
+    Locks the event's Event_Stats row until the transaction ends (LOCK_EVENT_QUERY). A venue
+    without a Capacity leaves unlimited seats.
+    """
+    cursor.execute(LOCK_EVENT_QUERY, (event_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    is_open, capacity, active = row
+    return bool(is_open), math.inf if not capacity else capacity - active
+
+
+def participating(cursor, event_id, student_ids):
+    """The students of `student_ids` already in a team for `event_id`."""
+    students = sorted(set(student_ids))
+    if not students:
+        return set()
+    cursor.execute(PARTICIPATION_QUERY.format(ids=", ".join(["%s"] * len(students))), [event_id] + students)
+    return {row[0] for row in cursor.fetchall()}
+
+
+def refusal(event, seats_left, taken, student_ids, seats):
+    """Why a team of `student_ids` taking `seats` seats cannot register, or None.
+
+    `event` is lock_event()'s answer and `taken` the students already in a team for the event.
+    Returns (status, message): "Rejected" with a trigger's message, or "Full" with EVENT_FULL.
+    The checks fail in the order the per-row triggers did: the first member's participation
+    (Trigger 7 on its PTeam_Members row), the event (Trigger 4 on its Registrations row), the
+    other members' participation, and only then the seats left.
+    """
+    if student_ids and student_ids[0] in taken:
+        return "Rejected", ALREADY_PARTICIPATING
+    if event is None:
+        return "Rejected", EVENT_MISSING
+    if not event[0]:
+        return "Rejected", EVENT_PAST
+    if len(set(student_ids)) < len(student_ids) or taken.intersection(student_ids):
+        return "Rejected", ALREADY_PARTICIPATING
+    if seats > seats_left:
+        return "Full", EVENT_FULL
+    return None
+
+
+def write_teams(cursor, event_id, teams):
+    """Write already checked teams of one event; returns their new PTeam_IDs in order.
+
+    `teams` are (Team_Name, [(Student_ID, Reg_For, Payment_Status), ...]). Each team is one
+    Participating_Team INSERT, its id taken from lastrowid. The members, their registrations and
+    the audit rows then go in with one multi-row INSERT each, and Event_Stats moves once per
+    payment status: what Triggers 7, 4 and 9 did row by row. Run it with @registration_batch set
+    (V007), after lock_event(). A duplicate participation raises Trigger 7's error.
+    """
+    pteam_ids = []
+    for team_name, members in teams:
+        cursor.execute(
+            "INSERT INTO Participating_Team (Event_ID, Team_Name, No_of_Participants) VALUES (%s, %s, %s)",
+            (event_id, team_name, len(members))
+        )
+        pteam_ids.append(cursor.lastrowid)
+
+    rows = [(pteam_id, *member) for pteam_id, (_, members) in zip(pteam_ids, teams) for member in members]
+    if not rows:
+        return pteam_ids
+    try:
+        cursor.execute(
+            "INSERT INTO PTeam_Members (PTeam_ID, Student_ID, Event_ID) VALUES " + values_rows(len(rows), 3),
+            [v for pteam_id, student_id, _, _ in rows for v in (pteam_id, student_id, event_id)]
+        )
+    except errors.Error as e:
+        raise participation_error(e) from e
+    cursor.execute(
+        "INSERT INTO Registrations (Reg_For, Reg_Date, Payment_Status, Student_ID, PTeam_ID) VALUES "
+        + ", ".join(["(%s, CURDATE(), %s, %s, %s)"] * len(rows)),
+        [v for pteam_id, student_id, reg_for, status in rows for v in (reg_for, status, student_id, pteam_id)]
+    )
+    # What Trigger 9 wrote for every registration: its audit row and counter move
+    cursor.execute(
+        "INSERT INTO Audit_Logs (Action_Type, Student_ID) VALUES " + values_rows(len(rows), 2),
+        [v for _, student_id, _, _ in rows for v in (f"Registration done for Event ID {event_id}", student_id)]
+    )
+    for status, count in Counter(status for _, _, _, status in rows).items():
+        cursor.callproc("BumpEventStats", (event_id, count, status, count, 0, 0, 0, 0))
+    return pteam_ids
+
+
+def register_team(conn, event_id, reg_for, student_ids, payment_status, team_name=None):
+    """P-1 write path: one Participating_Team row plus a PTeam_Members and Registrations row per student.
+
+    Runs as a single transaction and returns the new PTeam_ID. The event's counters row is
+    locked, the team is checked once (refusal(), including the seats left, as the
+    registration queue does) and written with write_teams(). Failures raise the error the
+    triggers raised first: mysql.connector.Error with the trigger's message in `.msg`, or
+    EVENT_FULL when the venue has no seats left. On failure the transaction is rolled back
+    and the error is re-raised.
+    """
+    student_ids = [s for s in student_ids if s]
+    with db_metrics.timed("transaction", "register_team") as call:
+        cursor = conn.cursor()
+        try:
+            # Tells Triggers 4 and 9 to step aside for this team's registrations (V007)
+            cursor.execute("SET @registration_batch = 1")
+            if student_ids:
+                event = lock_event(cursor, event_id)
+                taken = participating(cursor, event_id, student_ids) if event is not None else set()
+                seats = 0 if payment_status == "Cancelled" else len(student_ids)
+                refused = refusal(event, event[1] if event else 0, taken, student_ids, seats)
+                if refused is not None:
+                    raise signal_error(refused[1])
+            (pteam_id,) = write_teams(
+                cursor, event_id, [(team_name, [(stud_id, reg_for, payment_status) for stud_id in student_ids])]
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            # The connection goes back to the pool: never leave the flag behind
+            reset_session(conn, "SET @registration_batch = NULL")
+            cursor.close()
+        call.rows = len(student_ids)
+
+    query_cache.invalidate("Registrations", "Participating_Team", "PTeam_Members")
+    return pteam_id
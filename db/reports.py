@@ -0,0 +1,106 @@
+from datetime import date
+
+from db.cache import query_cache
+from db.executor import gather
+from db.instrumentation import read_sql_query
+from db.metrics import EVENT_METRICS_QUERY, METRICS_TABLES
+
+# Writes to any of these evict cached reports
+REPORT_TABLES = METRICS_TABLES + ("Clubs", "Faculty", "Resources")
+
+# P-5 GenerateEventReport's descriptive columns, for every event in scope
+EVENT_DETAILS_QUERY = """
+    SELECT e.Event_ID, e.Event_Name, e.Date, e.Event_Type, c.Club_Name AS Organizing_Club,
+           v.Venue_Name, v.Capacity, f.Name AS Faculty_Incharge, e.Budget
+    FROM Event e
+    LEFT JOIN Venue v ON e.Venue_ID = v.Venue_ID
+    LEFT JOIN Clubs c ON e.Club_ID = c.Club_ID
+    LEFT JOIN Faculty f ON e.Faculty_ID = f.Faculty_ID
+    WHERE {scope}
+"""
+
+# P-5's Resources_Used, grouped once for the whole scope instead of one subquery per event
+RESOURCES_QUERY = """
+    SELECT r.Event_ID, GROUP_CONCAT(r.Resource_Name, ' (Qty: ', r.Quantity, ')' SEPARATOR ' | ') AS Resources_Used
+    FROM Resources r
+    JOIN Event e ON r.Event_ID = e.Event_ID
+    WHERE {scope}
+    GROUP BY r.Event_ID
+"""
+
+REPORT_COLUMNS = [
+    "Event_ID", "Event_Name", "Date", "Event_Type", "Organizing_Club", "Venue_Name", "Capacity", "Faculty_Incharge",
+    "Budget", "Total_Registrations", "Paid_Registrations", "Pending_Registrations", "Cancelled_Registrations",
+    "Team_Count", "Avg_Rating", "Feedback_Count", "Capacity_Usage", "Duration_Hours", "Total_Grievances",
+    "Resources_Used",
+]
+
+# Academic terms as (first month, last month)
+SEMESTERS = {"Spring": (1, 6), "Fall": (7, 12)}
+
+
+def semester_range(year, semester):
+    """(first day, last day) of `semester` ("Spring" or "Fall") in `year`."""
+    first, last = SEMESTERS[semester]
+    end = date(year + 1, 1, 1) if last == 12 else date(year, last + 1, 1)
+    return date(year, first, 1), date.fromordinal(end.toordinal() - 1)
+
+
+def report_scope(club_id=None, start_date=None, end_date=None, event_type=None, event_ids=None):
+    """WHERE clause over Event e (and its parameters) for the given filters; no filter means every event."""
+    where, params = [], []
+    if event_ids is not None:
+        ids = [int(i) for i in event_ids]
+        if not ids:
+            return "FALSE", ()
+        where.append(f"e.Event_ID IN ({', '.join(['%s'] * len(ids))})")
+        params.extend(ids)
+    if club_id is not None:
+        where.append("e.Club_ID = %s")
+        params.append(int(club_id))
+    if event_type:
+        where.append("e.Event_Type = %s")
+        params.append(event_type)
+    if start_date is not None:
+        where.append("e.Date >= %s")
+        params.append(start_date)
+    if end_date is not None:
+        where.append("e.Date <= %s")
+        params.append(end_date)
+    return " AND ".join(where) or "TRUE", tuple(params)
+
+
+def event_report(conn, club_id=None, start_date=None, end_date=None, event_type=None, event_ids=None, use_cache=True):
+    """P-5 GenerateEventReport plus the per-event metrics for every event matching the filters.
+
+    Three set-based queries (details, Event_Stats metrics, resources) whatever the number of
+    events, run concurrently and merged into one tidy DataFrame with a row per event ordered by date.
+    """
+    scope, params = report_scope(club_id, start_date, end_date, event_type, event_ids)
+
+    def load():
+        details, metrics, resources = gather(conn, *(
+            lambda c, query=query: read_sql_query(query.format(scope=scope), c, params=params or None)
+            for query in (EVENT_DETAILS_QUERY, EVENT_METRICS_QUERY, RESOURCES_QUERY)
+        ))
+        report = details.merge(metrics, on="Event_ID", how="left").merge(resources, on="Event_ID", how="left")
+        return report[REPORT_COLUMNS].sort_values(["Date", "Event_ID"], ignore_index=True)
+
+    if not use_cache:
+        return load()
+    key = query_cache.make_key("report", scope, params)
+    return query_cache.get_or_load(key, load, tables=REPORT_TABLES).copy()
+
+
+def report_totals(report):
+    """Headline figures for a report; the rating is weighted by the number of feedback entries."""
+    feedback = report["Feedback_Count"].sum()
+    weighted = (report["Avg_Rating"].astype(float) * report["Feedback_Count"]).sum()
+    return {
+        "Events": len(report),
+        "Registrations": int(report["Total_Registrations"].sum()),
+        "Cancelled": int(report["Cancelled_Registrations"].sum()),
+        "Avg_Rating": round(float(weighted / feedback), 2) if feedback else 0.0,
+        "Grievances": int(report["Total_Grievances"].sum()),
+        "Budget": float(report["Budget"].fillna(0).astype(float).sum()),
+    }
@@ -0,0 +1,275 @@
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import mysql.connector
+
+from db.pool import ConnectionPool, PoolTimeoutError, get_pool
+
+# Stored routines that only read; everything else is treated as a write and runs on the primary
+READ_ONLY_PROCEDURES = frozenset({"GetFutureEvents", "GetEventsForDate", "GetEventsByClubAndType", "GenerateEventReport"})
+READ_ONLY_FUNCTIONS = frozenset({
+    "GetTotalRegistrations", "GetAvgEventRating", "GetStudentEventCount", "CheckVenueAvailability",
+    "GetEventCapacityUsage", "GetEventName", "GetRegistrationCountByPaymentStatus", "GetFacultyPhone",
+    "GetUpcomingEventCount", "GetEventDurationInHours", "GetStudentRegistrations",
+})
+
+# The routing state of the current page rerun (see routing_session); carried into gather() threads
+_session = contextvars.ContextVar("db_routing_session", default=None)
+
+# id(connection) -> ReplicaPool, for every open replica connection
+_replica_connections = {}
+
+
+@contextmanager
+def routing_session(last_write=None, primary_only=False):
+    """Routing state for one page rerun of one user session.
+
+    `last_write` is the time.monotonic() of the session's latest write; reads stay on the
+    primary for the router's sticky_seconds after it, so a user always sees their own writes.
+    `primary_only` keeps every read of the rerun on the primary (pages that write). Yields a
+    dict whose "last_write" is updated when the rerun writes.
+    """
+    state = {"last_write": last_write, "primary_only": primary_only}
+    token = _session.set(state)
+    try:
+        yield state
+    finally:
+        _session.reset(token)
+
+
+class ReplicaPool(ConnectionPool):
+    """Pool of connections to one replica; its connections are recognisable by replica_pool_of()."""
+
+    def _open(self):
+        conn = super()._open()
+        _replica_connections[id(conn)] = self
+        return conn
+
+    def _discard(self, conn):
+        _replica_connections.pop(id(conn), None)
+        super()._discard(conn)
+
+
+def replica_pool_of(conn):
+    """The ReplicaPool `conn` came from, or None for a primary connection."""
+    return _replica_connections.get(id(conn))
+
+
+class ReplicaRouter:
+    """Sends reads to read-replica pools and everything else to the primary.
+
+    A replica is used only while its replication lag (Seconds_Behind_Source, checked at most
+    every `lag_check_interval` seconds) is at most `max_lag` seconds. A replica that cannot be
+    reached is skipped for `retry_after` seconds. Whenever no replica is usable, or the
+    session must see its own writes, reads fall back to the primary.
+    """
+
+    def __init__(self, replicas=(), max_lag=5.0, lag_check_interval=2.0, sticky_seconds=10.0, retry_after=30.0):
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self.sticky_seconds = sticky_seconds
+        self.retry_after = retry_after
+        self._replicas = [
+            {"name": name, "pool": pool, "lag": None, "checked": float("-inf"), "down_until": 0.0, "status": "unchecked"}
+            for name, pool in replicas
+        ]
+        self._lock = threading.Lock()
+        self._checking = set()
+        self.stats = {"replica": 0, "primary": 0, "sticky": 0, "lagging": 0, "unavailable": 0, "busy": 0}
+
+    @classmethod
+    def from_env(cls):
+        """Replicas from DB_REPLICA_HOSTS ("host[:port],..."); credentials and schema default to the DB_* ones."""
+        hosts = [h.strip() for h in os.getenv("DB_REPLICA_HOSTS", "").split(",") if h.strip()]
+        primary = ConnectionPool.from_env()
+        replicas = []
+        for host in hosts:
+            name, _, port = host.partition(":")
+            connect_args = dict(
+                primary.connect_args, host=name, port=int(port or 3306),
+                user=os.getenv("DB_REPLICA_USER") or primary.connect_args["user"],
+                password=os.getenv("DB_REPLICA_PASSWORD") or primary.connect_args["password"],
+            )
+            replicas.append((host, ReplicaPool(
+                size=int(os.getenv("DB_REPLICA_POOL_SIZE", primary.size)),
+                timeout=primary.timeout, health_check_interval=primary.health_check_interval, **connect_args,
+            )))
+        return cls(
+            replicas,
+            max_lag=float(os.getenv("DB_REPLICA_MAX_LAG", 5)),
+            sticky_seconds=float(os.getenv("DB_REPLICA_STICKY_SECONDS", 10)),
+        )
+
+    def replicas(self):
+        """(name, pool) of every configured replica."""
+        return [(r["name"], r["pool"]) for r in self._replicas]
+
+    # ---------------------------------------------------------------- replica health
+
+    @staticmethod
+    def replication_lag(conn):
+        """Seconds the server behind `conn` lags its source, or None when it is not replicating."""
+        cursor = conn.cursor(dictionary=True)
+        try:
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except mysql.connector.ProgrammingError:
+                # Before MySQL 8.0.22
+                cursor.execute("SHOW SLAVE STATUS")
+            row = cursor.fetchone()
+            cursor.fetchall()
+        finally:
+            cursor.close()
+        if row is None:
+            return None
+        lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+        return None if lag is None else int(lag)
+
+    def _check(self, replica):
+        """Refresh the replica's lag; only one thread checks a given replica at a time."""
+        with self._lock:
+            if replica["name"] in self._checking:
+                return
+            self._checking.add(replica["name"])
+        try:
+            with replica["pool"].connection(timeout=0) as conn:
+                lag = self.replication_lag(conn)
+            replica["lag"], replica["status"] = lag, "not replicating" if lag is None else "ok"
+        except PoolTimeoutError:
+            pass  # Every connection is busy serving reads: keep the last known lag
+        except mysql.connector.Error as e:
+            replica["lag"], replica["status"] = None, f"unreachable: {e}"
+            replica["down_until"] = time.monotonic() + self.retry_after
+        finally:
+            replica["checked"] = time.monotonic()
+            with self._lock:
+                self._checking.discard(replica["name"])
+
+    def _pick(self):
+        """The least lagged usable replica and, if there is none, the reason why."""
+        now = time.monotonic()
+        usable, reason = [], "unavailable"
+        for replica in self._replicas:
+            if replica["down_until"] > now:
+                continue
+            if now - replica["checked"] >= self.lag_check_interval:
+                self._check(replica)
+            if replica["lag"] is None:
+                continue
+            if replica["lag"] > self.max_lag:
+                reason = "lagging"
+                continue
+            usable.append(replica)
+        if not usable:
+            return None, reason
+        return min(usable, key=lambda r: (r["lag"], r["pool"].stats()["in_use"])), None
+
+    def _replica_allowed(self):
+        state = _session.get()
+        if state is None:
+            return True, None
+        if state["primary_only"]:
+            return False, "primary"
+        if state["last_write"] is not None and time.monotonic() - state["last_write"] < self.sticky_seconds:
+            return False, "sticky"
+        return True, None
+
+    # ---------------------------------------------------------------- routing
+
+    def _count(self, outcome):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    @contextmanager
+    def read_connection(self, conn=None):
+        """A connection for reads: a replica one when allowed and current, otherwise `conn`.
+
+        A replica connection is used as is. Without `conn`, the fallback is a connection
+        from the primary pool.
+        """
+        if conn is not None and replica_pool_of(conn) is not None:
+            yield conn
+            return
+
+        replica, borrowed = None, None
+        allowed, reason = self._replica_allowed() if self._replicas else (False, "primary")
+        if allowed:
+            replica, reason = self._pick()
+        if replica is not None:
+            try:
+                # Never wait for a busy replica: the primary can serve the read right away
+                borrowed = replica["pool"].checkout(timeout=0)
+            except PoolTimeoutError:
+                reason = "busy"
+            except mysql.connector.Error as e:
+                replica["status"], replica["down_until"] = f"unreachable: {e}", time.monotonic() + self.retry_after
+                reason = "unavailable"
+
+        if borrowed is None:
+            self._count(reason)
+            if conn is not None:
+                yield conn
+            else:
+                with get_pool().connection() as primary:
+                    yield primary
+            return
+
+        self._count("replica")
+        try:
+            yield borrowed
+        finally:
+            replica["pool"].checkin(borrowed)
+
+    @contextmanager
+    def primary_connection(self, conn=None):
+        """`conn` when it is a primary connection, otherwise one from the primary pool."""
+        if conn is not None and replica_pool_of(conn) is None:
+            yield conn
+        else:
+            with get_pool().connection() as primary:
+                yield primary
+
+    @contextmanager
+    def write_connection(self, conn=None):
+        """primary_connection() for a write; the session's reads stay on the primary for a while after."""
+        state = _session.get()
+        with self.primary_connection(conn) as primary:
+            try:
+                yield primary
+            finally:
+                if state is not None:
+                    state["last_write"] = time.monotonic()
+
+    def replica_status(self):
+        """One row per replica: host, lag, status and pool usage."""
+        now = time.monotonic()
+        return [
+            {
+                "Replica": r["name"],
+                "Lag_s": r["lag"],
+                "Status": f"retry in {r['down_until'] - now:.0f}s ({r['status']})" if r["down_until"] > now else r["status"],
+                **{k.capitalize(): v for k, v in r["pool"].stats().items() if k in ("opened", "in_use", "checkouts")},
+            }
+            for r in self._replicas
+        ]
+
+    def close(self):
+        for replica in self._replicas:
+            replica["pool"].close()
+
+
+_default_router = None
+_default_router_lock = threading.Lock()
+
+
+def get_router():
+    """Process-wide router configured from the environment, created on first use."""
+    global _default_router
+    if _default_router is None:
+        with _default_router_lock:
+            if _default_router is None:
+                _default_router = ReplicaRouter.from_env()
+    return _default_router
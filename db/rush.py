@@ -0,0 +1,213 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+import mysql.connector
+
+from db.cache import query_cache
+from db.instrumentation import db_metrics
+from db.pool import get_pool, reset_session
+from db.registrations import (
+    ER_SIGNAL_EXCEPTION, lock_event, participating, participation_error, refusal, write_teams,
+)
+
+# Writer threads; each writes one event's batch at a time, different events in parallel
+RUSH_WORKERS = int(os.getenv("RUSH_WORKERS", 4))
+# Most requests of one event committed in a single transaction
+RUSH_MAX_BATCH = int(os.getenv("RUSH_MAX_BATCH", 50))
+# How long a writer waits for more requests of an event before writing a short batch
+RUSH_LINGER_SECONDS = float(os.getenv("RUSH_LINGER_MS", 5)) / 1000
+
+# MySQL errors worth retrying the whole batch for
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+BATCH_RETRIES = 3
+
+
+class RegistrationTicket:
+    """One queued team registration and, once written, its outcome.
+
+    `status` is "Registered", "Full", "Rejected" (a registration rule failed; `message` carries
+    the trigger's message) or "Failed" (a database error); None while queued.
+    """
+
+    def __init__(self, event_id, reg_for, student_ids, payment_status, team_name=None):
+        self.event_id = int(event_id)
+        self.reg_for = reg_for
+        self.student_ids = [int(s) for s in student_ids if s]
+        self.payment_status = payment_status
+        self.team_name = team_name
+        self.status = None
+        self.message = None
+        self.pteam_id = None
+        self.submitted = time.perf_counter()
+        self.seconds = None
+        self._done = threading.Event()
+
+    @property
+    def seats(self):
+        """Seats taken: cancelled registrations do not hold one."""
+        return 0 if self.payment_status == "Cancelled" else len(self.student_ids)
+
+    def resolve(self, status, message=None, pteam_id=None):
+        self.status, self.message, self.pteam_id = status, message, pteam_id
+        self.seconds = time.perf_counter() - self.submitted
+        self._done.set()
+
+    def wait(self, timeout=None):
+        """True once the outcome is known."""
+        return self._done.wait(timeout)
+
+
+def _admit(cursor, event_id, tickets):
+    """Check the queued tickets against the locked event (lock_event) in order.
+
+    Returns (admitted tickets, (ticket, status, message) for the others). Each ticket gets
+    register_team()'s checks (refusal()) against the seats the tickets before it left.
+    """
+    event = lock_event(cursor, event_id)
+    taken = set()
+    if event is not None:
+        taken = participating(cursor, event_id, [s for ticket in tickets for s in ticket.student_ids])
+
+    seats_left = event[1] if event is not None else 0
+    admitted, refused = [], []
+    for ticket in tickets:
+        reason = refusal(event, seats_left, taken, ticket.student_ids, ticket.seats)
+        if reason is not None:
+            refused.append((ticket, *reason))
+        else:
+            seats_left -= ticket.seats
+            taken.update(ticket.student_ids)
+            admitted.append(ticket)
+    return admitted, refused
+
+
+def write_batch(conn, event_id, tickets):
+    """Admit and write queued registrations of one event in a single transaction, resolving every ticket.
+
+    Outcomes are only reported once the transaction committed. Deadlocks and lock wait timeouts
+    retry the batch. Any other failure rolls the batch back and writes its tickets one by one,
+    so the error is reported to the request that caused it. Returns the number of
+    registrations written.
+    """
+    for attempt in range(BATCH_RETRIES):
+        cursor = conn.cursor()
+        try:
+            # Tells Triggers 4 and 9 to step aside: checks, audit rows and counters are done here (V007)
+            cursor.execute("SET @registration_batch = 1")
+            admitted, refused = _admit(cursor, event_id, tickets)
+            pteam_ids = write_teams(cursor, event_id, [
+                (t.team_name, [(s, t.reg_for, t.payment_status) for s in t.student_ids]) for t in admitted
+            ])
+            conn.commit()
+        except mysql.connector.Error as e:
+            conn.rollback()
+            if e.errno in (ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT) and attempt + 1 < BATCH_RETRIES:
+                continue
+            if len(tickets) > 1:
+                return sum(write_batch(conn, event_id, [ticket]) for ticket in tickets)
+            error = participation_error(e)
+            tickets[0].resolve("Rejected" if error.errno == ER_SIGNAL_EXCEPTION else "Failed", error.msg)
+            return 0
+        finally:
+            # The connection goes back to the pool: never leave the flag behind
+            reset_session(conn, "SET @registration_batch = NULL")
+            cursor.close()
+
+        for ticket, status, message in refused:
+            ticket.resolve(status, message)
+        for ticket, pteam_id in zip(admitted, pteam_ids):
+            ticket.resolve("Registered", pteam_id=pteam_id)
+        return sum(len(ticket.student_ids) for ticket in admitted)
+
+
+class RegistrationQueue:
+    """Process-wide queue of team registrations, written per event in small group transactions.
+
+    submit() returns at once with a ticket; writer threads take the oldest event with requests
+    waiting (linger `linger` seconds for more when the batch is short), and write up to
+    `max_batch` of its requests with write_batch(). One writer per event at a time: requests for
+    the same event never contend for its capacity lock, and busy events do not hold up others.
+    """
+
+    def __init__(self, pool=None, workers=RUSH_WORKERS, max_batch=RUSH_MAX_BATCH, linger=RUSH_LINGER_SECONDS):
+        self.pool = pool
+        self.workers = workers
+        self.max_batch = max_batch
+        self.linger = linger
+        self._cond = threading.Condition()
+        self._pending = OrderedDict()  # event_id -> deque of tickets, oldest event first
+        self._busy = set()
+        self._threads = []
+        self.stats = {"submitted": 0, "batches": 0, "registered": 0, "full": 0, "rejected": 0, "failed": 0}
+
+    def submit(self, event_id, reg_for, student_ids, payment_status, team_name=None):
+        ticket = RegistrationTicket(event_id, reg_for, student_ids, payment_status, team_name)
+        with self._cond:
+            self._pending.setdefault(ticket.event_id, deque()).append(ticket)
+            self.stats["submitted"] += 1
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._run, name=f"rush-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+        return ticket
+
+    def register(self, event_id, reg_for, student_ids, payment_status, team_name=None, timeout=30.0):
+        """submit() and wait for the outcome; a ticket still queued after `timeout` has status None."""
+        ticket = self.submit(event_id, reg_for, student_ids, payment_status, team_name)
+        ticket.wait(timeout)
+        return ticket
+
+    def depth(self):
+        with self._cond:
+            return sum(len(tickets) for tickets in self._pending.values())
+
+    def _take(self):
+        """Claim the oldest idle event with waiting requests and pop its batch."""
+        with self._cond:
+            while True:
+                event_id = next((e for e in self._pending if e not in self._busy), None)
+                if event_id is not None:
+                    break
+                self._cond.wait()
+            self._busy.add(event_id)
+            if len(self._pending[event_id]) < self.max_batch and self.linger > 0:
+                self._cond.wait(self.linger)
+            queue = self._pending[event_id]
+            batch = [queue.popleft() for _ in range(min(self.max_batch, len(queue)))]
+            if not queue:
+                del self._pending[event_id]
+            return event_id, batch
+
+    def _release(self, event_id, batch):
+        with self._cond:
+            self._busy.discard(event_id)
+            self.stats["batches"] += 1
+            for ticket in batch:
+                self.stats[ticket.status.lower()] += 1
+            self._cond.notify_all()
+
+    def _run(self):
+        pool = self.pool or get_pool()
+        while True:
+            event_id, batch = self._take()
+            try:
+                with db_metrics.timed("transaction", "rush.write_batch") as call:
+                    with pool.connection() as conn:
+                        call.rows = write_batch(conn, event_id, batch)
+                if call.rows:
+                    query_cache.invalidate("Registrations", "Participating_Team", "PTeam_Members")
+            except Exception as e:
+                # No connection, or a bug: the waiting requests still get an answer
+                for ticket in batch:
+                    if not ticket.wait(0):
+                        ticket.resolve("Failed", str(e))
+            finally:
+                self._release(event_id, batch)
+
+
+# Shared by every Registration page session in this server process
+registration_queue = RegistrationQueue()
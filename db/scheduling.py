@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+
+from db.instrumentation import read_sql_query
+
+# Columns a proposed schedule must have; Event_ID (an event being moved) and Event_Name are optional
+SCHEDULE_COLUMNS = ("Venue_ID", "Date", "Start_Time", "End_Time")
+
+# Every event of a date range; served by idx_event_date_start (V001)
+SCHEDULE_QUERY = """
+    SELECT Event_ID, Event_Name, Venue_ID, Date, Start_Time, End_Time
+    FROM Event
+    WHERE Date BETWEEN %s AND %s AND Venue_ID IS NOT NULL
+"""
+
+# Every venue, for free slots over all of them; only read when no venue was chosen
+VENUES_QUERY = "SELECT Venue_ID FROM Venue"
+
+# Wider than any TIME of day in seconds, so (group, start) packs into one sortable int64
+_SPAN = 1_000_000
+
+
+def _to_seconds(values):
+    """TIME / timedelta / 'HH:MM[:SS]' values as float seconds since midnight (NaN if unparseable)."""
+    s = pd.Series(values)
+    if not pd.api.types.is_timedelta64_dtype(s):
+        text = s.astype(str).str.strip()
+        text = text.where(text.str.count(":") >= 2, text + ":00")
+        s = pd.to_timedelta(text, errors="coerce")
+    return s.dt.total_seconds().to_numpy()
+
+
+def _to_ids(values):
+    ids = pd.to_numeric(values, errors="coerce")
+    return ids.where(ids % 1 == 0).astype("Int64")
+
+
+def _hhmm(seconds):
+    return [f"{int(v) // 3600:02d}:{int(v) % 3600 // 60:02d}" for v in seconds]
+
+
+def _overlap_pairs(group, start, end):
+    """Positions (i, j) of every pair of intervals in the same group that overlap.
+
+    One sort by (group, start), then for each interval a binary search for the first
+    interval of its group starting at or after its end; everything in between overlaps it.
+    Each pair is reported once. Cost is O(n log n + pairs) with no Python-level loop.
+    """
+    order = np.lexsort((start, group))
+    key = group[order] * _SPAN + start[order]
+    stop = np.searchsorted(key, group[order] * _SPAN + end[order], side="left")
+    first = np.arange(len(order)) + 1
+    counts = np.maximum(stop - first, 0)
+    left = np.repeat(np.arange(len(order)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return order[left], order[left + 1 + offsets]
+
+
+def parse_schedule(source):
+    """Read a proposed schedule CSV (path or file object) into the frame VenueSchedule.check() takes.
+
+    Rows that cannot be parsed keep their CSV line number in Row and a reason in Error.
+    """
+    raw = pd.read_csv(source, dtype=str)
+    missing = [c for c in SCHEDULE_COLUMNS if c not in raw.columns]
+    if missing:
+        raise ValueError(f"CSV is missing required column(s): {', '.join(missing)}")
+
+    df = pd.DataFrame({
+        "Row": raw.index + 2,
+        "Event_ID": _to_ids(raw["Event_ID"]) if "Event_ID" in raw else pd.NA,
+        "Event_Name": raw.get("Event_Name"),
+        "Venue_ID": _to_ids(raw["Venue_ID"]),
+        "Date": pd.to_datetime(raw["Date"], errors="coerce").dt.date,
+        "Start_S": _to_seconds(raw["Start_Time"]),
+        "End_S": _to_seconds(raw["End_Time"]),
+    })
+    df["Error"] = None
+    unparsed = df[["Venue_ID", "Date", "Start_S", "End_S"]].isna().any(axis=1)
+    df.loc[unparsed, "Error"] = "Venue_ID, Date, Start_Time and End_Time must all be valid."
+    df.loc[~unparsed & (df["End_S"] <= df["Start_S"]), "Error"] = "End_Time must be after Start_Time."
+    return df
+
+
+class VenueSchedule:
+    """All events of a date range as integer-second intervals, for set-at-a-time venue checks.
+
+    One query loads the range; conflicts(), free_slots() and check() then work on the whole
+    schedule at once instead of calling F-4 CheckVenueAvailability per (venue, date, window).
+    """
+
+    def __init__(self, events, conn=None):
+        self.events = events
+        self._conn = conn
+        self._venue_ids = None
+
+    @classmethod
+    def load(cls, conn, start_date, end_date):
+        df = read_sql_query(SCHEDULE_QUERY, conn, params=(start_date, end_date))
+        df["Start_S"] = _to_seconds(df.pop("Start_Time"))
+        df["End_S"] = _to_seconds(df.pop("End_Time"))
+        df = df.dropna(subset=["Start_S", "End_S"])
+        return cls(df.astype({"Venue_ID": "int64", "Start_S": "int64", "End_S": "int64"}), conn)
+
+    def venue_ids(self):
+        """Every venue: those booked in the range plus, read once on first use, the idle ones."""
+        if self._venue_ids is None:
+            ids = set(self.events["Venue_ID"].tolist())
+            if self._conn is not None:
+                ids.update(read_sql_query(VENUES_QUERY, self._conn)["Venue_ID"].tolist())
+            self._venue_ids = sorted(ids)
+        return self._venue_ids
+
+    @staticmethod
+    def _pairs(df):
+        group = df.groupby(["Venue_ID", "Date"], sort=False).ngroup().to_numpy()
+        i, j = _overlap_pairs(group, df["Start_S"].to_numpy(), df["End_S"].to_numpy())
+        a, b = df.iloc[i].reset_index(drop=True), df.iloc[j].reset_index(drop=True)
+        overlap = np.minimum(a["End_S"], b["End_S"]) - np.maximum(a["Start_S"], b["Start_S"])
+        return a, b, (overlap // 60).astype("int64")
+
+    def conflicts(self):
+        """Every pair of events booked into the same venue at overlapping times."""
+        a, b, minutes = self._pairs(self.events)
+        return pd.DataFrame({
+            "Venue_ID": a["Venue_ID"], "Date": a["Date"],
+            "Event_ID_A": a["Event_ID"], "Event_Name_A": a["Event_Name"],
+            "Time_A": [f"{s}-{e}" for s, e in zip(_hhmm(a["Start_S"]), _hhmm(a["End_S"]))],
+            "Event_ID_B": b["Event_ID"], "Event_Name_B": b["Event_Name"],
+            "Time_B": [f"{s}-{e}" for s, e in zip(_hhmm(b["Start_S"]), _hhmm(b["End_S"]))],
+            "Overlap_Minutes": minutes,
+        }).sort_values(["Date", "Venue_ID"], ignore_index=True)
+
+    def free_slots(self, venue_ids, dates, day_start="08:00", day_end="22:00", min_minutes=60):
+        """Gaps of at least `min_minutes` between `day_start` and `day_end` per venue and date.
+
+        `venue_ids` None (or empty) means every venue (venue_ids()).
+        """
+        venue_ids = venue_ids or self.venue_ids()
+        lo, hi = (int(v) for v in _to_seconds([day_start, day_end]))
+        grid = pd.MultiIndex.from_product([list(venue_ids), list(dates)], names=["Venue_ID", "Date"]).to_frame(index=False)
+        booked = self.events.merge(grid, on=["Venue_ID", "Date"]).sort_values(["Venue_ID", "Date", "Start_S"])
+        keys = ["Venue_ID", "Date"]
+
+        # Running latest end within each (venue, date); a gap opens wherever a start lies beyond it
+        booked["Busy_Until"] = booked.groupby(keys)["End_S"].cummax()
+        prev_end = booked.groupby(keys)["Busy_Until"].shift().fillna(lo).clip(lower=lo)
+        gaps = pd.DataFrame({"Venue_ID": booked["Venue_ID"], "Date": booked["Date"],
+                             "From": prev_end, "To": booked["Start_S"].clip(upper=hi)})
+        last = booked.groupby(keys, as_index=False)["Busy_Until"].max()
+        tails = pd.DataFrame({"Venue_ID": last["Venue_ID"], "Date": last["Date"],
+                              "From": last["Busy_Until"].clip(lower=lo), "To": hi})
+        idle = grid.merge(last[keys], on=keys, how="left", indicator=True)
+        idle = idle[idle["_merge"] == "left_only"][keys].assign(From=lo, To=hi)
+
+        slots = pd.concat([gaps, tails, idle], ignore_index=True)
+        slots["Minutes"] = ((slots["To"] - slots["From"]) // 60).astype("int64")
+        slots = slots[slots["Minutes"] >= min_minutes].sort_values(["Date", "Venue_ID", "From"], ignore_index=True)
+        return pd.DataFrame({
+            "Venue_ID": slots["Venue_ID"], "Date": slots["Date"],
+            "Free_From": _hhmm(slots["From"]), "Free_To": _hhmm(slots["To"]), "Minutes": slots["Minutes"],
+        })
+
+    def check(self, proposed):
+        """Conflicts for a batch of proposed events (see parse_schedule) against this schedule and each other.
+
+        A proposed row carrying the Event_ID of a loaded event replaces it, so a rescheduled
+        event never conflicts with its own old slot. Returns (report, pairs): one row per
+        proposal with Status OK / Conflict / Invalid, and one row per clashing pair.
+        """
+        valid = proposed[proposed["Error"].isna()].astype({"Venue_ID": "int64", "Start_S": "int64", "End_S": "int64"})
+        moved = set(valid["Event_ID"].dropna().astype(int))
+        existing = self.events[~self.events["Event_ID"].isin(moved)]
+
+        combined = pd.concat([
+            existing.assign(Row=pd.NA, Label="Event " + existing["Event_ID"].astype(str)),
+            valid.assign(Label="Row " + valid["Row"].astype(str)),
+        ], ignore_index=True)
+        a, b, minutes = self._pairs(combined)
+        pairs = pd.DataFrame({
+            "Venue_ID": a["Venue_ID"], "Date": a["Date"], "Row_A": a["Row"], "A": a["Label"],
+            "Row_B": b["Row"], "B": b["Label"], "Overlap_Minutes": minutes,
+        })
+        pairs = pairs[pairs["Row_A"].notna() | pairs["Row_B"].notna()].reset_index(drop=True)
+
+        # Each pair counts against every proposed row taking part in it
+        hits = pd.concat([
+            pairs.loc[pairs["Row_A"].notna(), ["Row_A", "B"]].set_axis(["Row", "With"], axis=1),
+            pairs.loc[pairs["Row_B"].notna(), ["Row_B", "A"]].set_axis(["Row", "With"], axis=1),
+        ])
+        clashes = hits.groupby("Row")["With"].agg("; ".join)
+
+        report = proposed[["Row", "Event_ID", "Event_Name", "Venue_ID", "Date"]].copy()
+        report["Start_Time"] = [None if pd.isna(v) else t for v, t in zip(proposed["Start_S"], _hhmm(proposed["Start_S"].fillna(0)))]
+        report["End_Time"] = [None if pd.isna(v) else t for v, t in zip(proposed["End_S"], _hhmm(proposed["End_S"].fillna(0)))]
+        report["Conflicts_With"] = report["Row"].map(clashes)
+        report["Status"] = np.where(proposed["Error"].notna(), "Invalid",
+                                    np.where(report["Conflicts_With"].notna(), "Conflict", "OK"))
+        report["Error"] = proposed["Error"]
+        return report, pairs
@@ -0,0 +1,145 @@
+import re
+
+import pandas as pd
+
+from db.loader import load_frame
+
+# Searchable text per source: its table, key, text, date and (Feedback only) rating columns.
+# The text columns carry the FULLTEXT indexes of V009.
+SEARCH_SOURCES = {
+    "Grievances": {"table": "Grievances", "key": "Grievance_ID", "text": "Grievance_Text",
+                   "date": "Submitted_On", "rating": None},
+    "Feedback": {"table": "Feedback", "key": "Feedback_ID", "text": "Comments",
+                 "date": "Submitted_Date", "rating": "Rating"},
+}
+
+# How the search text is matched:
+#   all     - every word, each as a prefix ("broke" finds "broken"); boolean mode
+#   any     - any of the words, ranked by relevance; natural language mode
+#   boolean - the text as a MySQL boolean query (+required -excluded "a phrase" prefix*)
+MATCH_MODES = {"all": "IN BOOLEAN MODE", "any": "IN NATURAL LANGUAGE MODE", "boolean": "IN BOOLEAN MODE"}
+SEARCH_ORDERS = ("relevance", "newest")
+
+# InnoDB's default innodb_ft_min_token_size: shorter words are not in the index
+MIN_WORD_LENGTH = 3
+
+# The event and student names come by primary key for the rows of one page only
+SEARCH_QUERY = """
+    SELECT x.{key}, x.Event_ID, e.Event_Name, x.Student_ID, s.Name AS Student_Name, x.{date}{rating}, x.{text},
+           ROUND(MATCH (x.{text}) AGAINST (%s {mode}), 6) AS Score
+    FROM {table} x
+    LEFT JOIN Event e ON x.Event_ID = e.Event_ID
+    LEFT JOIN Students s ON x.Student_ID = s.Student_ID
+    WHERE MATCH (x.{text}) AGAINST (%s {mode}) {filters}
+    {having}
+    ORDER BY {order}
+    LIMIT {limit}
+"""
+
+
+def search_words(text):
+    """The indexable words of `text`."""
+    return [word for word in re.findall(r"\w+", text) if len(word) >= MIN_WORD_LENGTH]
+
+
+def match_text(text, mode="all"):
+    """The AGAINST (...) string for `text` in `mode`."""
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Unknown match mode '{mode}'; expected one of {', '.join(MATCH_MODES)}.")
+    if mode == "all":
+        words = search_words(text)
+        if not words:
+            raise ValueError(f"Search for at least one word of {MIN_WORD_LENGTH} or more letters.")
+        return " ".join(f"+{word}*" for word in words)
+    if not text.strip():
+        raise ValueError("Enter something to search for.")
+    return text.strip()
+
+
+def search_filters(source, event_id=None, start=None, end=None, min_rating=None, max_rating=None):
+    """AND clauses over x (and their parameters) for the given filters; dates are inclusive."""
+    columns = SEARCH_SOURCES[source]
+    where, params = [], []
+    if event_id is not None:
+        where.append("x.Event_ID = %s")
+        params.append(int(event_id))
+    if start is not None:
+        where.append(f"x.{columns['date']} >= %s")
+        params.append(start)
+    if end is not None:
+        where.append(f"x.{columns['date']} <= %s")
+        params.append(end)
+    if min_rating is not None or max_rating is not None:
+        if columns["rating"] is None:
+            raise ValueError(f"{source} have no rating to filter on.")
+        if min_rating is not None:
+            where.append(f"x.{columns['rating']} >= %s")
+            params.append(int(min_rating))
+        if max_rating is not None:
+            where.append(f"x.{columns['rating']} <= %s")
+            params.append(int(max_rating))
+    return "".join(f" AND {clause}" for clause in where), params
+
+
+def _plain(value):
+    """A DataFrame cell as a value the connector can bind."""
+    if pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.date()
+    return value.item() if hasattr(value, "item") else value
+
+
+def search_text(conn, source, text, mode="all", order="relevance", after=None, page_size=50, **filters):
+    """One keyset page of `source` rows whose text matches `text`; returns (df, next_cursor).
+
+    `order` is "relevance" (best Score first) or "newest" (latest date first), ties broken by
+    the key, and `after` is the cursor returned with the previous page. Filters are event_id,
+    start, end and, for Feedback, min_rating and max_rating. The FULLTEXT index (V009) finds
+    the matches, so the cost follows the number of matching rows, not the table size.
+    """
+    if source not in SEARCH_SOURCES:
+        raise ValueError(f"Unknown search source '{source}'; expected one of {', '.join(SEARCH_SOURCES)}.")
+    if order not in SEARCH_ORDERS:
+        raise ValueError(f"Unknown order '{order}'; expected one of {', '.join(SEARCH_ORDERS)}.")
+    columns = SEARCH_SOURCES[source]
+    against = match_text(text, mode)
+    where, filter_params = search_filters(source, **filters)
+
+    having, after_params = "", []
+    if order == "relevance":
+        cursor_columns = ("Score", columns["key"])
+        order_by = f"Score DESC, {columns['key']} DESC"
+        if after is not None:
+            # Score is rounded in the query, so the value handed back compares equal to itself
+            having = f"HAVING Score < %s OR (Score = %s AND {columns['key']} < %s)"
+            after_params = [after[0], after[0], after[1]]
+    else:
+        cursor_columns = (columns["date"], columns["key"])
+        # Undated rows come last (MySQL sorts NULL last in DESC); a row comparison with a NULL
+        # date is never true, so the keyset spells out both sides of the NULL boundary
+        date, key = f"x.{columns['date']}", f"x.{columns['key']}"
+        order_by = f"{date} DESC, {key} DESC"
+        if after is not None and after[0] is None:
+            where += f" AND {date} IS NULL AND {key} < %s"
+            after_params = [after[1]]
+        elif after is not None:
+            where += f" AND ({date} IS NULL OR {date} < %s OR ({date} = %s AND {key} < %s))"
+            after_params = [after[0], after[0], after[1]]
+
+    query = SEARCH_QUERY.format(
+        table=columns["table"], key=columns["key"], text=columns["text"], date=columns["date"],
+        rating=f", x.{columns['rating']}" if columns["rating"] else "", mode=MATCH_MODES[mode],
+        filters=where, having=having, order=order_by, limit=int(page_size),
+    )
+    df = load_frame(conn, query, [against, against] + filter_params + after_params)
+    next_cursor = tuple(_plain(v) for v in df.iloc[-1][list(cursor_columns)]) if len(df) == page_size else None
+    return df, next_cursor
+
+
+def search_grievances(conn, text, **kwargs):
+    return search_text(conn, "Grievances", text, **kwargs)
+
+
+def search_feedback(conn, text, **kwargs):
+    return search_text(conn, "Feedback", text, **kwargs)
@@ -0,0 +1,57 @@
+import re
+import threading
+import weakref
+
+import mysql.connector
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# connection -> {sql: prepared cursor}; entries vanish with the connection they were prepared on
+_statements = weakref.WeakKeyDictionary()
+_statements_lock = threading.Lock()
+
+
+def function_call_sql(func_name, arg_count):
+    """SELECT statement calling stored function `func_name` with `arg_count` placeholders."""
+    if not _IDENTIFIER.match(func_name):
+        raise ValueError(f"Invalid function name: {func_name!r}")
+    placeholders = ", ".join(["%s"] * arg_count)
+    return f"SELECT {func_name}({placeholders}) AS result"
+
+
+def prepared_cursor(conn, sql):
+    """Server-side prepared cursor for `sql`, prepared once per connection and reused after."""
+    with _statements_lock:
+        cursors = _statements.setdefault(conn, {})
+        cursor = cursors.get(sql)
+        if cursor is None:
+            cursor = conn.cursor(prepared=True)
+            cursors[sql] = cursor
+    return cursor
+
+
+def forget_statements(conn):
+    """Close and drop every statement prepared on `conn` (e.g. after a reconnect)."""
+    with _statements_lock:
+        cursors = _statements.pop(conn, {})
+    for cursor in cursors.values():
+        try:
+            cursor.close()
+        except mysql.connector.Error:
+            pass
+
+
+def call_function(conn, func_name, args=()):
+    """Call a stored function with bound, typed arguments and return its scalar result."""
+    args = tuple(args)
+    sql = function_call_sql(func_name, len(args))
+    try:
+        cursor = prepared_cursor(conn, sql)
+        cursor.execute(sql, args)
+    except (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError):
+        # The statement handle is gone (server restart, reconnect); prepare it again once
+        forget_statements(conn)
+        cursor = prepared_cursor(conn, sql)
+        cursor.execute(sql, args)
+    rows = cursor.fetchall()
+    return rows[0][0] if rows else None
@@ -0,0 +1,34 @@
+from db.loader import load_frame
+
+# One student's registrations with their event and team. Registrations is read from
+# idx_reg_student_status (V006) alone; the team name and event come by primary key, and the
+# team's members from the PTeam_Members primary key.
+STUDENT_REGISTRATIONS_QUERY = """
+    SELECT r.Registration_ID, pt.Event_ID, e.Event_Name, e.Date AS Event_Date,
+           r.PTeam_ID, pt.Team_Name,
+           (SELECT COUNT(*) FROM PTeam_Members m WHERE m.PTeam_ID = r.PTeam_ID) AS Team_Size,
+           (SELECT GROUP_CONCAT(m.Student_ID ORDER BY m.Student_ID SEPARATOR ', ')
+            FROM PTeam_Members m WHERE m.PTeam_ID = r.PTeam_ID) AS Team_Members,
+           r.Reg_Date, r.Payment_Status
+    FROM Registrations r
+    LEFT JOIN Participating_Team pt ON r.PTeam_ID = pt.PTeam_ID
+    LEFT JOIN Event e ON pt.Event_ID = e.Event_ID
+    WHERE r.Student_ID = %s {status_filter}
+    ORDER BY e.Date, r.Registration_ID
+"""
+
+ACTIVE_FILTER = "AND (r.Payment_Status IS NULL OR r.Payment_Status <> 'Cancelled')"
+
+
+def student_registrations(conn, student_id, include_cancelled=False):
+    """A student's registrations (only the active ones unless `include_cancelled`), soonest event first.
+
+    One indexed query whatever the size of Registrations: cost follows the number of
+    registrations the student has, not the table.
+    """
+    query = STUDENT_REGISTRATIONS_QUERY.format(status_filter="" if include_cancelled else ACTIVE_FILTER)
+    return load_frame(conn, query, (int(student_id),))
+
+
+def active_registrations(conn, student_id):
+    return student_registrations(conn, student_id)
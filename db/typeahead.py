@@ -0,0 +1,77 @@
+import os
+
+import pandas as pd
+
+from db.instrumentation import read_sql_query
+
+# Matches returned per lookup
+TYPEAHEAD_LIMIT = int(os.getenv("TYPEAHEAD_LIMIT", 20))
+
+# Name lookups per source: table, key, name column (indexed by V010) and a detail column that
+# tells apart rows with the same name
+TYPEAHEAD_SOURCES = {
+    "event": {"table": "Event", "key": "Event_ID", "name": "Event_Name", "detail": "Date"},
+    "club": {"table": "Clubs", "key": "Club_ID", "name": "Club_Name", "detail": None},
+    "venue": {"table": "Venue", "key": "Venue_ID", "name": "Venue_Name", "detail": "Building"},
+    "faculty": {"table": "Faculty", "key": "Faculty_ID", "name": "Name", "detail": "Department"},
+    "student": {"table": "Students", "key": "Student_ID", "name": "Name", "detail": "Department"},
+}
+
+TYPEAHEAD_QUERY = """
+    SELECT {key} AS ID, {name} AS Name, {detail} AS Detail
+    FROM {table}
+    WHERE {where}
+    ORDER BY {order}
+    LIMIT {limit}
+"""
+
+
+def _like_prefix(text):
+    """LIKE pattern for names starting with `text`, its wildcards taken literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _label(row):
+    detail = f" — {row.Detail}" if pd.notna(row.Detail) else ""
+    return f"{row.Name}{detail} (ID {row.ID})"
+
+
+def suggest(conn, source, text="", limit=TYPEAHEAD_LIMIT, upcoming=False):
+    """Up to `limit` rows of `source` whose name starts with `text` (case-insensitive), with their IDs.
+
+    Returns a DataFrame of ID, Name, Detail and a display Label. Digits also match the row with
+    that ID, listed first. `upcoming` keeps only events dated today or later; with no text those
+    come soonest first (I-1), otherwise matches come in name order straight from the V010 index.
+    """
+    if source not in TYPEAHEAD_SOURCES:
+        raise ValueError(f"Unknown typeahead source '{source}'; expected one of {', '.join(TYPEAHEAD_SOURCES)}.")
+    columns = TYPEAHEAD_SOURCES[source]
+    if upcoming and source != "event":
+        raise ValueError("Only events can be limited to upcoming ones.")
+    text = text.strip()
+
+    where, params = [], []
+    if text:
+        where.append(f"{columns['name']} LIKE %s")
+        params.append(_like_prefix(text))
+        order = [columns["name"]] + (["Date"] if source == "event" else []) + [columns["key"]]
+    else:
+        order = ["Date", "Start_Time", "Event_ID"] if upcoming else [columns["name"], columns["key"]]
+    if upcoming:
+        where.append("Date >= CURDATE()")
+
+    def fetch(where, params, limit):
+        query = TYPEAHEAD_QUERY.format(
+            key=columns["key"], name=columns["name"], detail=columns["detail"] or "NULL", table=columns["table"],
+            where=" AND ".join(where) or "TRUE", order=", ".join(order), limit=int(limit),
+        )
+        return read_sql_query(query, conn, params=tuple(params) or None)
+
+    matches = fetch(where, params, limit)
+    if text.isdigit():
+        by_id = fetch([f"{columns['key']} = %s"] + where[1:], [int(text)] + params[1:], 1)
+        if not by_id.empty:
+            rest = matches[matches["ID"] != int(text)]
+            matches = pd.concat([by_id, rest], ignore_index=True).head(limit)
+    matches["Label"] = [_label(row) for row in matches.itertuples(index=False)]
+    return matches
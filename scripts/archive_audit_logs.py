@@ -0,0 +1,50 @@
+"""Keep Audit_Logs partitions ready ahead of time and archive the cold months.
+
+Adds monthly partitions until --ahead months past the current one exist. Then every month
+older than the last --keep-months is moved to a compressed file under --dir and recorded in
+Audit_Archive (see db/audit.py). Meant to run from cron, e.g. nightly.
+
+Usage: python -m scripts.archive_audit_logs [--keep-months N] [--ahead N] [--format parquet|csv.gz] [--dir PATH] [--verify]
+"""
+import argparse
+import os
+
+from dotenv import load_dotenv
+
+from db.audit import (
+    ARCHIVE_FORMATS, AUDIT_ARCHIVE_DIR, DEFAULT_ARCHIVE_FORMAT,
+    archive_partitions, ensure_partitions, verify_archive,
+)
+from db.pool import ConnectionPool
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keep-months", type=int, default=12, help="months kept in the live table")
+    parser.add_argument("--ahead", type=int, default=3, help="months of empty partitions kept ready")
+    parser.add_argument("--format", choices=ARCHIVE_FORMATS, default=DEFAULT_ARCHIVE_FORMAT)
+    parser.add_argument("--dir", help="archive directory (default: AUDIT_ARCHIVE_DIR)")
+    parser.add_argument("--verify", action="store_true", help="check every archived file against its checksum afterwards")
+    args = parser.parse_args()
+
+    load_dotenv()
+    directory = args.dir or os.getenv("AUDIT_ARCHIVE_DIR", AUDIT_ARCHIVE_DIR)
+    pool = ConnectionPool.from_env()
+    with pool.connection() as conn:
+        added = ensure_partitions(conn, args.ahead)
+        print(f"Added partitions: {', '.join(added)}" if added else "Partitions ahead are in place.")
+
+        for archived in archive_partitions(conn, args.keep_months, directory, args.format):
+            print(f"Archived {archived['Partition']}: {archived['Rows']:,} rows -> {archived['Path']}")
+
+        if args.verify:
+            manifest = verify_archive(conn)
+            for row in manifest.itertuples(index=False):
+                if row.Status != "OK":
+                    print(f"{row.Partition_Name}: {row.Status} ({row.Path})")
+            print(f"{(manifest['Status'] == 'OK').sum()} of {len(manifest)} archived month(s) verified.")
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
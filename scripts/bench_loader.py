@@ -0,0 +1,67 @@
+"""Memory and time of pd.read_sql_query against db.loader.load_frame on large result sets.
+
+Loads the same queries both ways from the synthetic bench schema and reports the peak Python
+memory while loading (tracemalloc), the resulting frame's deep size and the wall time. The
+typed loader should hold a fraction of the memory of the default load.
+
+Usage: python -m scripts.bench_loader [--registrations N] [--rows N] [--reuse]
+"""
+import argparse
+import time
+import tracemalloc
+
+import pandas as pd
+from dotenv import load_dotenv
+
+from db.loader import load_frame, memory_report
+from scripts.bench_schema import open_bench
+
+QUERIES = [
+    ("Registrations", "SELECT Registration_ID, Student_ID, PTeam_ID, Reg_Date, Payment_Status FROM Registrations LIMIT %s"),
+    ("Registrations + Event", """
+        SELECT r.Registration_ID, r.Payment_Status, r.Reg_Date, e.Event_Name, e.Event_Type, e.Date, s.Department
+        FROM Registrations r
+        JOIN Participating_Team pt ON r.PTeam_ID = pt.PTeam_ID
+        JOIN Event e ON pt.Event_ID = e.Event_ID
+        JOIN Students s ON r.Student_ID = s.Student_ID
+        LIMIT %s
+    """),
+    ("Feedback", "SELECT Feedback_ID, Event_ID, Student_ID, Rating FROM Feedback LIMIT %s"),
+]
+
+
+def measure(load):
+    """(frame, peak MB while loading, seconds)."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    df = load()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, peak / 1e6, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--registrations", type=int, default=1_000_000)
+    parser.add_argument("--rows", type=int, default=500_000, help="rows loaded per query")
+    parser.add_argument("--reuse", action="store_true", help="reuse an already seeded bench schema")
+    args = parser.parse_args()
+
+    load_dotenv()
+    pool = open_bench({"registrations": args.registrations}, reuse=args.reuse)
+    print(f"\n{'Query':24} {'rows':>9} {'peak MB':>9} {'frame MB':>9} {'s':>6}   typed: {'peak MB':>9} {'frame MB':>9} {'s':>6}")
+    with pool.connection() as conn:
+        for name, sql in QUERIES:
+            plain, plain_peak, plain_s = measure(lambda: pd.read_sql_query(sql, conn, params=(args.rows,)))
+            typed, typed_peak, typed_s = measure(lambda: load_frame(conn, sql, (args.rows,)))
+            plain_mb = plain.memory_usage(deep=True).sum() / 1e6
+            typed_mb = memory_report(typed)["Bytes"].iloc[-1] / 1e6
+            print(f"{name:24} {len(plain):9,} {plain_peak:9.1f} {plain_mb:9.1f} {plain_s:6.2f}   "
+                  f"       {typed_peak:9.1f} {typed_mb:9.1f} {typed_s:6.2f}")
+            del plain, typed
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Registration write path throughput before and after V007, with identical error semantics.
+
+Builds the synthetic bench schema, installs the production triggers and migrations up to V006,
+and registers --teams new teams through the former per-row write path (a PTeam_Members and a
+Registrations INSERT per member, each running Triggers 4, 7 and 9). It then applies V007 and
+registers the same number of teams through db.registrations.register_team(). Before each run
+the same failing registrations (already participating, duplicate member, past event, past event
+with a duplicate member, missing event) are attempted; the script fails if any of them raises a
+different error or message.
+
+Usage: python -m scripts.bench_registration [--registrations N] [--teams N] [--team-size N] [--seed N]
+"""
+import argparse
+import random
+import sys
+import time
+
+import mysql.connector
+from dotenv import load_dotenv
+
+from db.migrations import apply_pending, run_sql_script
+from db.registrations import ER_SIGNAL_EXCEPTION, register_team
+from scripts.bench_schema import analyze, bench_schema_name, open_bench, read_sql
+
+# The seed assigns students to teams arithmetically, so a few already share an event; production
+# data cannot (Trigger 7), and the unique key of V007 would refuse to build on top of them.
+DROP_SEED_CONFLICTS = """
+    DELETE m FROM PTeam_Members m
+    JOIN Participating_Team pt ON m.PTeam_ID = pt.PTeam_ID
+    JOIN (
+        SELECT pt2.Event_ID, m2.Student_ID, MIN(m2.PTeam_ID) AS Kept
+        FROM PTeam_Members m2
+        JOIN Participating_Team pt2 ON m2.PTeam_ID = pt2.PTeam_ID
+        GROUP BY pt2.Event_ID, m2.Student_ID
+        HAVING COUNT(*) > 1
+    ) d ON d.Event_ID = pt.Event_ID AND d.Student_ID = m.Student_ID
+    WHERE m.PTeam_ID <> d.Kept
+"""
+
+
+def legacy_register_team(conn, event_id, reg_for, student_ids, payment_status, team_name=None):
+    """register_team() as it was before V007: every member row runs the per-row triggers."""
+    cursor = conn.cursor(prepared=True)
+    try:
+        cursor.execute(
+            "INSERT INTO Participating_Team (Event_ID, Team_Name, No_of_Participants) VALUES (%s, %s, %s)",
+            (event_id, team_name, len(student_ids))
+        )
+        pteam_id = cursor.lastrowid
+        for stud_id in student_ids:
+            cursor.execute("INSERT INTO PTeam_Members (PTeam_ID, Student_ID) VALUES (%s, %s)", (pteam_id, stud_id))
+            cursor.execute(
+                """
+                INSERT INTO Registrations (Reg_For, Reg_Date, Payment_Status, Student_ID, PTeam_ID)
+                VALUES (%s, CURDATE(), %s, %s, %s)
+                """,
+                (reg_for, payment_status, stud_id, pteam_id)
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return pteam_id
+
+
+def prepare(conn):
+    """Production triggers and routines on the bench schema, as of V006."""
+    cursor = conn.cursor()
+    cursor.execute(DROP_SEED_CONFLICTS)
+    conn.commit()
+    cursor.close()
+    run_sql_script(conn, read_sql("Triggers.sql", bench_schema_name()))
+    apply_pending(conn, upto=6)
+    analyze(conn)
+
+
+def fixtures(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT Event_ID, Event_Name FROM Event WHERE Date >= CURDATE()")
+    upcoming = cursor.fetchall()
+    cursor.execute("SELECT Event_ID FROM Event WHERE Date < CURDATE() LIMIT 1")
+    past = cursor.fetchone()[0]
+    cursor.execute("SELECT MAX(Event_ID) FROM Event")
+    missing = cursor.fetchone()[0] + 1000
+    cursor.execute("SELECT MAX(Student_ID) FROM Students")
+    students = cursor.fetchone()[0]
+    cursor.execute("""
+        SELECT pt.Event_ID, m.Student_ID FROM PTeam_Members m
+        JOIN Participating_Team pt ON m.PTeam_ID = pt.PTeam_ID
+        WHERE pt.Event_ID IN (SELECT Event_ID FROM Event WHERE Date >= CURDATE())
+        LIMIT 1
+    """)
+    member = cursor.fetchone()
+    cursor.close()
+    if not upcoming or member is None:
+        sys.exit("The bench schema has no upcoming event with participants; re-run with more --registrations.")
+    return upcoming, past, missing, students, member
+
+
+def probe_errors(conn, register, past, missing, students, member):
+    """(case, error class, errno, message) for registrations that must fail; none of them is written."""
+    event_id, student_id = member
+    other = student_id % students + 1
+    cases = [
+        ("already participating", event_id, [other, student_id]),
+        ("duplicate member", event_id, [other, other]),
+        ("past event", past, [other]),
+        # Trigger 4 ran on the first member's Registrations row, before the second member's Trigger 7
+        ("duplicate member, past event", past, [other, other]),
+        ("missing event", missing, [other]),
+    ]
+    outcomes = []
+    for case, event, team in cases:
+        try:
+            register(conn, event, "Bench", team, "Paid", team_name="Probe")
+            outcomes.append((case, "no error", None, None))
+        except mysql.connector.Error as e:
+            outcomes.append((case, type(e).__name__, e.errno, e.msg))
+    return outcomes
+
+
+def run(conn, register, upcoming, students, teams, team_size, rng):
+    """(registrations written, teams rejected by a trigger, seconds)."""
+    written = rejected = 0
+    started = time.perf_counter()
+    for i in range(teams):
+        event_id, event_name = rng.choice(upcoming)
+        members = rng.sample(range(1, students + 1), team_size)
+        try:
+            register(conn, event_id, event_name, members, rng.choice(("Paid", "Pending")), team_name=f"Bench {i}")
+            written += team_size
+        except mysql.connector.Error as e:
+            if e.errno != ER_SIGNAL_EXCEPTION:
+                raise
+            rejected += 1
+    return written, rejected, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--registrations", type=int, default=500_000)
+    parser.add_argument("--teams", type=int, default=2000, help="teams registered per write path")
+    parser.add_argument("--team-size", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=17)
+    args = parser.parse_args()
+
+    load_dotenv()
+    pool = open_bench({"registrations": args.registrations})
+    with pool.connection() as conn:
+        prepare(conn)
+        upcoming, past, missing, students, member = fixtures(conn)
+
+        errors_before = probe_errors(conn, legacy_register_team, past, missing, students, member)
+        before = run(conn, legacy_register_team, upcoming, students, args.teams, args.team_size, random.Random(args.seed))
+        apply_pending(conn, upto=7)
+        errors_after = probe_errors(conn, register_team, past, missing, students, member)
+        after = run(conn, register_team, upcoming, students, args.teams, args.team_size, random.Random(args.seed + 1))
+    pool.close()
+
+    print(f"\n{'Write path':12} {'registrations':>14} {'rejected teams':>15} {'s':>7} {'regs/s':>9}")
+    for name, (written, rejected, seconds) in (("before V007", before), ("V007", after)):
+        print(f"{name:12} {written:14,} {rejected:15,} {seconds:7.2f} {written / seconds:9.1f}")
+    print(f"Speedup: {(after[0] / after[2]) / (before[0] / before[2]):.2f}x\n")
+
+    mismatched = False
+    print(f"{'Failing registration':22} error (before V007 | V007)")
+    for (case, *old), (_, *new) in zip(errors_before, errors_after):
+        mismatched = mismatched or old != new
+        print(f"{case:22} {'same' if old == new else 'DIFFERENT'}: {old[0]} {old[1]} {old[2]!r}"
+              + ("" if old == new else f" | {new[0]} {new[1]} {new[2]!r}"))
+    if mismatched:
+        print("\nFAIL: the write path raises different errors after V007.")
+        sys.exit(1)
+    print("\nOK: every failing registration raises the same error and message.")
+
+
+if __name__ == "__main__":
+    main()
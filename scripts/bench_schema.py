@@ -0,0 +1,207 @@
+"""Scratch benchmark schema: the production DDL plus a synthetic, set-based seed.
+
+The bench schema is created from sql/DDL.sql only (no triggers, functions or procedures),
+so millions of rows can be generated with INSERT ... SELECT in seconds. Use
+scripts/generate_data.py to load realistic data through the real triggers instead.
+"""
+import os
+
+from db.pool import ConnectionPool
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sql")
+BASE_SCHEMA = "campus_event_management"
+
+DEFAULT_VOLUMES = {
+    "faculty": 200,
+    "venues": 60,
+    "clubs": 100,
+    "students": 50_000,
+    "events": 5_000,
+    "registrations": 1_000_000,
+    "feedback": 200_000,
+    "grievances": 50_000,
+    "audit_logs": 0,
+}
+
+
+def bench_schema_name():
+    return os.getenv("DB_BENCH_NAME") or f"{os.getenv('DB_NAME', BASE_SCHEMA)}_bench"
+
+
+def server_pool(size=1, database=None):
+    """Pool on the configured server, on `database` or with no database selected."""
+    env = ConnectionPool.from_env()
+    return ConnectionPool(size=size, timeout=env.timeout, **dict(env.connect_args, database=database))
+
+
+def read_sql(name, schema):
+    with open(os.path.join(SQL_DIR, name), encoding="utf-8") as f:
+        return f.read().replace(BASE_SCHEMA, schema)
+
+
+def create_bench_schema(conn, schema):
+    """Drop and recreate `schema` from DDL.sql; leaves `conn` using it."""
+    from db.migrations import run_sql_script
+
+    cursor = conn.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {schema}")
+    cursor.close()
+    run_sql_script(conn, read_sql("DDL.sql", schema))
+    conn.database = schema
+
+
+def fill_sequence(conn, upto):
+    """Bench_Seq(N) holding 0..upto-1, grown by doubling."""
+    cursor = conn.cursor()
+    cursor.execute("CREATE TABLE IF NOT EXISTS Bench_Seq (N INT PRIMARY KEY)")
+    cursor.execute("SELECT COUNT(*) FROM Bench_Seq")
+    count = cursor.fetchone()[0]
+    if count == 0:
+        cursor.execute("INSERT INTO Bench_Seq (N) VALUES (0)")
+        count = 1
+    while count < upto:
+        cursor.execute("INSERT INTO Bench_Seq (N) SELECT N + %s FROM Bench_Seq WHERE N + %s < %s", (count, count, upto))
+        count = min(count * 2, upto)
+    conn.commit()
+    cursor.close()
+
+
+SEED_STATEMENTS = [
+    ("faculty", """
+        INSERT INTO Faculty (Faculty_ID, Name, Email, Department)
+        SELECT N + 1, CONCAT('Faculty ', N), CONCAT('faculty', N, '@campus.edu'),
+               ELT(1 + N % 5, 'Computer Science', 'Electronics', 'Mechanical', 'Civil', 'Biotechnology')
+        FROM Bench_Seq WHERE N < %(faculty)s
+    """),
+    ("venues", """
+        INSERT INTO Venue (Venue_ID, Venue_Name, Capacity, Room_No, Building, Floor)
+        SELECT N + 1, CONCAT('Venue ', N), 50 + (N % 10) * 50, CONCAT('R', N), CONCAT('Block ', CHAR(65 + N % 8)), N % 4
+        FROM Bench_Seq WHERE N < %(venues)s
+    """),
+    ("clubs", """
+        INSERT INTO Clubs (Club_ID, Club_Name, Description, Founded_Date, Faculty_ID)
+        SELECT N + 1, CONCAT('Club ', N), 'Synthetic club', DATE_SUB(CURDATE(), INTERVAL N DAY), 1 + N % %(faculty)s
+        FROM Bench_Seq WHERE N < %(clubs)s
+    """),
+    # Roughly nine in ten events lie in the past, as in a database that has run for several terms
+    ("events", """
+        INSERT INTO Event (Event_ID, Event_Name, Event_Type, Date, Start_Time, End_Time, Catering, Budget, Club_ID, Venue_ID, Faculty_ID)
+        SELECT N + 1, CONCAT('Event ', N), ELT(1 + N % 5, 'Workshop', 'Competition', 'Seminar', 'Exhibition', 'Talk'),
+               DATE_ADD(CURDATE(), INTERVAL (N % 2000) - 1820 DAY),
+               SEC_TO_TIME((8 + N % 10) * 3600), SEC_TO_TIME((10 + N % 10) * 3600),
+               ELT(1 + N % 2, 'Yes', 'No'), 1000 * (1 + N % 50),
+               1 + N % %(clubs)s, 1 + (N * 31) % %(venues)s, 1 + N % %(faculty)s
+        FROM Bench_Seq WHERE N < %(events)s
+    """),
+    ("students", """
+        INSERT INTO Students (Student_ID, Name, Email, Phone_No, Year_Of_Study, Department)
+        SELECT N + 1, CONCAT('Student ', N), CONCAT('student', N, '@campus.edu'), LPAD(N, 10, '9'), 1 + N % 4,
+               ELT(1 + N % 5, 'Computer Science', 'Electronics', 'Mechanical', 'Civil', 'Biotechnology')
+        FROM Bench_Seq WHERE N < %(students)s
+    """),
+    # Two registrations per team
+    ("teams", """
+        INSERT INTO Participating_Team (PTeam_ID, Team_Name, No_of_Participants, Event_ID)
+        SELECT N + 1, CONCAT('Team ', N), 2, 1 + (N * 7919) % %(events)s
+        FROM Bench_Seq WHERE N < CEIL(%(registrations)s / 2)
+    """),
+    ("members", """
+        INSERT IGNORE INTO PTeam_Members (PTeam_ID, Student_ID)
+        SELECT 1 + N DIV 2, 1 + (N * 104729) % %(students)s
+        FROM Bench_Seq WHERE N < %(registrations)s
+    """),
+    ("registrations", """
+        INSERT INTO Registrations (Registration_ID, Reg_For, Reg_Date, Payment_Status, Student_ID, PTeam_ID)
+        SELECT N + 1, CONCAT('Event ', N % %(events)s), DATE_SUB(CURDATE(), INTERVAL N % 30 DAY),
+               CASE N % 10 WHEN 0 THEN 'Cancelled' WHEN 1 THEN 'Pending' WHEN 2 THEN 'Pending' ELSE 'Paid' END,
+               1 + (N * 104729) % %(students)s, 1 + N DIV 2
+        FROM Bench_Seq WHERE N < %(registrations)s
+    """),
+    # Feedback and grievance text from a small phrase vocabulary, plus a long-tail "tagNNNN" word
+    # (about one row in 20,000 each) standing in for the rare words of real comments
+    ("feedback", """
+        INSERT INTO Feedback (Feedback_ID, Comments, Rating, Submitted_Date, Student_ID, Event_ID)
+        SELECT N + 1,
+               CONCAT_WS(' ', ELT(1 + N % 5, 'Terrible', 'Poor', 'Okay', 'Good', 'Excellent'),
+                         ELT(1 + (N DIV 5) % 10, 'speakers', 'organisation', 'venue', 'food', 'timing',
+                             'workshop content', 'hands-on session', 'judges', 'prizes', 'networking'),
+                         ELT(1 + (N DIV 50) % 6, 'would attend again', 'needs better planning', 'too crowded',
+                             'well worth it', 'started late', 'great for beginners'),
+                         CONCAT('tag', (N * 7919) % 20000)),
+               1 + N % 5, DATE_SUB(CURDATE(), INTERVAL N % 1500 DAY),
+               1 + (N * 17) % %(students)s, 1 + (N * 13) % %(events)s
+        FROM Bench_Seq WHERE N < %(feedback)s
+    """),
+    ("grievances", """
+        INSERT INTO Grievances (Grievance_ID, Grievance_Text, Submitted_On, Event_ID, Student_ID)
+        SELECT N + 1,
+               CONCAT_WS(' ', ELT(1 + N % 12, 'The projector', 'The microphone', 'The sound system', 'Wi-Fi',
+                                  'The air conditioning', 'Seating', 'Registration desk', 'Catering', 'The venue',
+                                  'Lighting', 'The schedule', 'Parking'),
+                         ELT(1 + (N DIV 12) % 10, 'broke down', 'was not working', 'kept failing', 'was too loud',
+                             'was delayed', 'was overcrowded', 'was missing', 'stopped halfway', 'was very poor',
+                             'was confusing'),
+                         ELT(1 + (N DIV 120) % 8, 'during the opening session', 'in the afternoon',
+                             'before the final round', 'for the whole event', 'after lunch', 'in hall B',
+                             'near the entrance', 'at the start'),
+                         CONCAT('tag', (N * 7919) % 20000)),
+               DATE_SUB(CURDATE(), INTERVAL N % 1500 DAY),
+               1 + (N * 13) % %(events)s, 1 + (N * 17) % %(students)s
+        FROM Bench_Seq WHERE N < %(grievances)s
+    """),
+    ("audit_logs", """
+        INSERT INTO Audit_Logs (Log_ID, Action_Type, Performed_On, Student_ID)
+        SELECT N + 1, CONCAT('Registration done for Event ID ', 1 + N % %(events)s),
+               TIMESTAMP(DATE_SUB(CURDATE(), INTERVAL N % 1500 DAY)) + INTERVAL N % 86400 SECOND,
+               1 + (N * 7) % %(students)s
+        FROM Bench_Seq WHERE N < %(audit_logs)s
+    """),
+]
+
+
+def seed(conn, volumes=None, verbose=True):
+    """Populate the bench schema with synthetic rows at `volumes` (see DEFAULT_VOLUMES)."""
+    volumes = dict(DEFAULT_VOLUMES, **(volumes or {}))
+    fill_sequence(conn, max(volumes.values()))
+    cursor = conn.cursor()
+    cursor.execute("SET SESSION foreign_key_checks = 0")
+    try:
+        for name, statement in SEED_STATEMENTS:
+            cursor.execute(statement, volumes)
+            conn.commit()
+            if verbose:
+                print(f"  seeded {name:14} {cursor.rowcount:>10,} rows")
+    finally:
+        cursor.execute("SET SESSION foreign_key_checks = 1")
+        cursor.close()
+
+
+def analyze(conn, tables=("Event", "Registrations", "Participating_Team", "PTeam_Members", "Feedback", "Grievances", "Audit_Logs")):
+    cursor = conn.cursor()
+    for table in tables:
+        cursor.execute(f"ANALYZE TABLE {table}")
+        cursor.fetchall()
+    cursor.close()
+
+
+def open_bench(volumes=None, reuse=False):
+    """Pool on the bench schema, creating and seeding it unless `reuse` is set."""
+    schema = bench_schema_name()
+    admin = server_pool()
+    with admin.connection() as conn:
+        if not reuse:
+            print(f"Creating bench schema {schema} ...")
+            create_bench_schema(conn, schema)
+            seed(conn, volumes)
+            analyze(conn)
+    admin.close()
+    return server_pool(size=8, database=schema)
+
+
+def explain_rows(conn, sql, params=()):
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("EXPLAIN " + sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
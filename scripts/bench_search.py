@@ -0,0 +1,152 @@
+"""Grievance and feedback text search on millions of rows: LIKE scans against the V009 FULLTEXT indexes.
+
+Builds the bench schema with --rows grievances and as many feedback rows (phrase text with a
+long tail of rare words, see scripts/bench_schema.py), times each sample search as the LIKE
+'%word%' scan it takes without an index, applies sql/migrations/V009__fulltext_search.sql and
+times the same searches through db.search.search_text(): the first page and the keyset page
+after it. Fails if any full-text page has a p95 above --budget-ms.
+
+Usage: python -m scripts.bench_search [--rows N] [--samples N] [--page-size N] [--budget-ms MS] [--reuse]
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from db.migrations import list_migrations, run_sql_script
+from db.search import MATCH_MODES, SEARCH_SOURCES, match_text, search_filters, search_text, search_words
+from scripts.bench_schema import analyze, open_bench
+
+SEARCH_VERSION = 9
+
+# (label, source, text, mode, order, filters); "tag" words occur in about one row in 20,000
+SAMPLE_SEARCHES = [
+    ("rare word", "Grievances", "tag4242", "all", "relevance", {}),
+    ("two words", "Grievances", "projector broke", "all", "relevance", {}),
+    ("two words, newest", "Grievances", "microphone loud", "all", "newest", {}),
+    ("word + event", "Grievances", "projector", "all", "relevance", {"event_id": 42}),
+    ("word + last 90 days", "Grievances", "catering delayed", "all", "newest", {"days": 90}),
+    ("words + low rating", "Feedback", "food crowded", "all", "relevance", {"max_rating": 2}),
+    ("any word, ranked", "Feedback", "judges prizes tag777", "any", "relevance", {}),
+    ("phrase", "Feedback", '"hands-on session" +beginners', "boolean", "relevance", {}),
+]
+
+# Without a FULLTEXT index: every word as a LIKE pattern, newest first (LIKE cannot rank)
+LIKE_QUERY = """
+    SELECT x.{key}, x.Event_ID, e.Event_Name, x.Student_ID, s.Name AS Student_Name, x.{date}, x.{text}
+    FROM {table} x
+    LEFT JOIN Event e ON x.Event_ID = e.Event_ID
+    LEFT JOIN Students s ON x.Student_ID = s.Student_ID
+    WHERE ({likes}) {filters}
+    ORDER BY x.{date} DESC, x.{key} DESC
+    LIMIT {limit}
+"""
+
+COUNT_QUERY = "SELECT COUNT(*) FROM {table} x WHERE MATCH (x.{text}) AGAINST (%s {mode}) {filters}"
+
+
+def resolve_filters(conn, filters):
+    filters = dict(filters)
+    if "days" in filters:
+        cursor = conn.cursor()
+        cursor.execute("SELECT DATE_SUB(CURDATE(), INTERVAL %s DAY)", (filters.pop("days"),))
+        filters["start"] = cursor.fetchone()[0]
+        cursor.close()
+    return filters
+
+
+def like_search(conn, source, text, mode, page_size, filters):
+    columns = SEARCH_SOURCES[source]
+    words = search_words(text.replace("+", " ").replace('"', " "))
+    where, params = search_filters(source, **filters)
+    query = LIKE_QUERY.format(
+        table=columns["table"], key=columns["key"], date=columns["date"], text=columns["text"],
+        likes=(" OR " if mode == "any" else " AND ").join([f"x.{columns['text']} LIKE %s"] * len(words)),
+        filters=where, limit=int(page_size),
+    )
+    cursor = conn.cursor()
+    cursor.execute(query, [f"%{word}%" for word in words] + params)
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def count_matches(conn, source, text, mode, filters):
+    columns = SEARCH_SOURCES[source]
+    where, params = search_filters(source, **filters)
+    cursor = conn.cursor()
+    cursor.execute(COUNT_QUERY.format(table=columns["table"], text=columns["text"], mode=MATCH_MODES[mode], filters=where),
+                   [match_text(text, mode)] + params)
+    count = cursor.fetchone()[0]
+    cursor.close()
+    return count
+
+
+def timed(fn, samples):
+    """(median ms, p95 ms, last result)."""
+    times, result = [], None
+    for _ in range(samples):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    times.sort()
+    return statistics.median(times), times[int(0.95 * (len(times) - 1))], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000, help="grievances, and feedback rows, in the bench schema")
+    parser.add_argument("--samples", type=int, default=20, help="timed runs per search")
+    parser.add_argument("--like-samples", type=int, default=3, help="timed runs per LIKE scan")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="p95 a full-text page must stay under")
+    parser.add_argument("--reuse", action="store_true", help="reuse an already seeded bench schema without V009")
+    args = parser.parse_args()
+
+    load_dotenv()
+    path = next(path for version, _, path in list_migrations() if version == SEARCH_VERSION)
+    with open(path, encoding="utf-8") as f:
+        index_script = f.read()
+    pool = open_bench({"grievances": args.rows, "feedback": args.rows, "registrations": 10_000}, reuse=args.reuse)
+    results = []
+    with pool.connection() as conn:
+        searches = [(label, source, text, mode, order, resolve_filters(conn, filters))
+                    for label, source, text, mode, order, filters in SAMPLE_SEARCHES]
+        like = [timed(lambda: like_search(conn, source, text, mode, args.page_size, filters), args.like_samples)
+                for _, source, text, mode, _, filters in searches]
+
+        print("Adding the FULLTEXT indexes (V009) ...")
+        started = time.perf_counter()
+        run_sql_script(conn, index_script)
+        analyze(conn, tables=("Grievances", "Feedback"))
+        print(f"  built in {time.perf_counter() - started:.1f}s")
+
+        for (label, source, text, mode, order, filters), like_timing in zip(searches, like):
+            def page(after=None):
+                return search_text(conn, source, text, mode=mode, order=order, after=after,
+                                   page_size=args.page_size, **filters)
+            first = timed(page, args.samples)
+            next_cursor = first[2][1]
+            second = timed(lambda: page(next_cursor), args.samples) if next_cursor is not None else None
+            results.append((label, source, count_matches(conn, source, text, mode, filters), like_timing, first, second))
+    pool.close()
+
+    over = 0
+    print(f"\n{'Search':24} {'source':11} {'matches':>9} {'LIKE p50 ms':>12} {'page 1 p50/p95 ms':>18} {'page 2 p50/p95 ms':>18}")
+    for label, source, matches, like_timing, first, second in results:
+        worst = max(first[1], second[1] if second else 0)
+        over += worst > args.budget_ms
+        page_two = f"{second[0]:8.1f} /{second[1]:7.1f}" if second else f"{'-':>17}"
+        print(f"{label:24} {source:11} {matches:9,} {like_timing[0]:12.1f} {first[0]:8.1f} /{first[1]:7.1f}  {page_two}"
+              + ("  OVER BUDGET" if worst > args.budget_ms else ""))
+
+    if over:
+        print(f"\nFAIL: {over} search(es) above {args.budget_ms:.0f} ms at p95.")
+        sys.exit(1)
+    print(f"\nOK: every full-text page under {args.budget_ms:.0f} ms at p95.")
+
+
+if __name__ == "__main__":
+    main()
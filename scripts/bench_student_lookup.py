@@ -0,0 +1,90 @@
+"""Latency of a student's registration lookup as Registrations grows, before and after V006.
+
+For each size the bench schema is rebuilt with the same number of registrations per student,
+so a student's result stays the same size while the table grows. Three ways are timed over
+the same sampled students: the cancel tab's former query with the Cancelled rows dropped in
+pandas, and db.students.active_registrations() without and with idx_reg_student_status
+(sql/migrations/V006__student_registrations_index.sql). With the index the latency should
+stay flat from size to size.
+
+Usage: python -m scripts.bench_student_lookup [--sizes 250000,1000000,2000000] [--per-student N] [--samples N]
+"""
+import argparse
+import statistics
+import time
+
+from dotenv import load_dotenv
+
+from db.instrumentation import read_sql_query
+from db.migrations import list_migrations, run_sql_script
+from db.students import active_registrations
+from scripts.bench_schema import analyze, open_bench
+
+INDEX_VERSION = 6
+
+# The cancel tab before V006: every registration of the student, filtered afterwards
+FORMER_QUERY = """
+    SELECT r.Registration_ID, e.Event_Name, pt.Team_Name, r.Reg_Date, r.Payment_Status
+    FROM Registrations r
+    LEFT JOIN Participating_Team pt ON r.PTeam_ID = pt.PTeam_ID
+    LEFT JOIN Event e ON pt.Event_ID = e.Event_ID
+    WHERE r.Student_ID = %s
+"""
+
+
+def former_lookup(conn, student_id):
+    df = read_sql_query(FORMER_QUERY, conn, params=(student_id,))
+    return df[df["Payment_Status"] != "Cancelled"]
+
+
+def sample_students(conn, samples):
+    cursor = conn.cursor()
+    cursor.execute("SELECT DISTINCT Student_ID FROM Registrations ORDER BY RAND(42) LIMIT %s", (samples,))
+    students = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    return students
+
+
+def time_lookup(conn, lookup, students):
+    """(median ms, p95 ms, rows per lookup)."""
+    samples, rows = [], 0
+    for student_id in students:
+        started = time.perf_counter()
+        rows += len(lookup(conn, student_id))
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(0.95 * (len(samples) - 1))], rows / len(students)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="250000,1000000,2000000", help="comma-separated Registrations row counts")
+    parser.add_argument("--per-student", type=int, default=20, help="registrations per student at every size")
+    parser.add_argument("--samples", type=int, default=200, help="students looked up per measurement")
+    args = parser.parse_args()
+
+    load_dotenv()
+    path = next(path for version, _, path in list_migrations() if version == INDEX_VERSION)
+    with open(path, encoding="utf-8") as f:
+        index_script = f.read()
+    results = []
+    for size in [int(s) for s in args.sizes.split(",")]:
+        pool = open_bench({"registrations": size, "students": max(size // args.per_student, 1)})
+        with pool.connection() as conn:
+            students = sample_students(conn, args.samples)
+            former = time_lookup(conn, former_lookup, students)
+            unindexed = time_lookup(conn, active_registrations, students)
+            run_sql_script(conn, index_script)
+            analyze(conn, tables=("Registrations",))
+            indexed = time_lookup(conn, active_registrations, students)
+        pool.close()
+        results.append((size, former, unindexed, indexed))
+
+    print(f"\n{'Registrations':>14} {'rows':>6}   {'former p50/p95 ms':>18}   {'no index p50/p95 ms':>20}   {'V006 p50/p95 ms':>16}")
+    for size, former, unindexed, indexed in results:
+        print(f"{size:14,} {indexed[2]:6.1f}   {former[0]:8.2f} /{former[1]:8.2f}   "
+              f"{unindexed[0]:9.2f} /{unindexed[1]:9.2f}   {indexed[0]:7.2f} /{indexed[1]:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
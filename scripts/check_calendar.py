@@ -0,0 +1,98 @@
+"""Build the venue calendar, verify it against the database and time its lookups against P-10 / F-4.
+
+Loads (or rebuilds with --rebuild) the calendar snapshot of the configured database, lists
+every event, P-10 day listing and F-4 venue-day where the calendar and the database disagree,
+then answers the same sampled date listings and availability checks both ways and prints the
+median latency of each. Exits with status 1 if the calendar is inconsistent. Run it after
+deploys or from cron to keep the snapshot warm for the next server start.
+
+Usage: python -m scripts.check_calendar [--rebuild] [--samples N] [--seed N]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import time as clock, timedelta
+
+from dotenv import load_dotenv
+
+from db.calendar import venue_calendar
+from db.pool import ConnectionPool
+from db.statements import call_function
+
+
+def timed(fn, calls):
+    """(median microseconds per call, results)."""
+    samples, results = [], []
+    for args in calls:
+        started = time.perf_counter()
+        results.append(fn(*args))
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples), results
+
+
+def get_events_for_date(conn, day):
+    cursor = conn.cursor()
+    cursor.callproc("GetEventsForDate", (day,))
+    rows = [row for result in cursor.stored_results() for row in result.fetchall()]
+    cursor.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true", help="reload the calendar from the database first")
+    parser.add_argument("--samples", type=int, default=500, help="lookups timed per method")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    load_dotenv()
+    pool = ConnectionPool.from_env()
+    with pool.connection() as conn:
+        started = time.perf_counter()
+        if args.rebuild:
+            venue_calendar.rebuild(conn)
+        else:
+            venue_calendar.sync(conn, force=True)
+        print(f"Calendar ready in {time.perf_counter() - started:.2f}s: {venue_calendar.summary()}")
+
+        diff = venue_calendar.check(conn)
+        if diff.empty:
+            print("Consistent: the calendar matches the database.")
+        else:
+            print(f"INCONSISTENT: {len(diff)} event(s) differ")
+            print(diff.head(20).to_string(index=False))
+
+        rng = random.Random(args.seed)
+        cursor = conn.cursor()
+        cursor.execute("SELECT Venue_ID FROM Venue")
+        venues = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        first, last = venue_calendar.window
+        days = [first + timedelta(days=rng.randint(0, (last - first).days)) for _ in range(args.samples)]
+        windows = []
+        for day in days:
+            hour = rng.randint(8, 19)
+            windows.append((rng.choice(venues), day, clock(hour), clock(min(hour + rng.randint(1, 3), 23))))
+
+        # The calendar is already current: time the lookups themselves, not its poll of Change_Log
+        venue_calendar.min_interval = float("inf")
+        db_day_us, db_days = timed(lambda d: get_events_for_date(conn, d), [(d,) for d in days])
+        cal_day_us, cal_days = timed(lambda d: venue_calendar.events_on(conn, d), [(d,) for d in days])
+        db_free_us, db_free = timed(lambda *w: bool(call_function(conn, "CheckVenueAvailability", w)), windows)
+        cal_free_us, cal_free = timed(lambda *w: venue_calendar.is_available(conn, *w), windows)
+        conn.commit()
+    pool.close()
+
+    day_mismatch = sum(len(a) != len(b) for a, b in zip(db_days, cal_days))
+    free_mismatch = sum(a != b for a, b in zip(db_free, cal_free))
+    print(f"\n{'Lookup':32} {'database us':>12} {'calendar us':>12} {'mismatches':>11}")
+    print(f"{'GetEventsForDate (P-10)':32} {db_day_us:12.1f} {cal_day_us:12.1f} {day_mismatch:11}")
+    print(f"{'CheckVenueAvailability (F-4)':32} {db_free_us:12.1f} {cal_free_us:12.1f} {free_mismatch:11}")
+    if not diff.empty or day_mismatch or free_mismatch:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
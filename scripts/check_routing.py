@@ -0,0 +1,128 @@
+"""Check read/write routing against the configured primary and its read replicas.
+
+Connects to the primary (DB_*) and every replica in DB_REPLICA_HOSTS, checks that each replica
+is a different server that is replicating, reports its lag and read_only setting, then asks
+db.routing where each kind of call goes and verifies the answer from @@server_id: reads on a
+replica, writes on the primary, reads right after a write (and on write pages) on the primary,
+and reads on the primary once every replica lags more than allowed. Finally times P-11
+GetFutureEvents on the primary and through the router. Exits with status 1 if any check fails.
+Two local MySQL instances (one replicating from the other) are enough to run it.
+
+Usage: python -m scripts.check_routing [--samples N]
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from db.pool import get_pool
+from db.routing import ReplicaRouter, routing_session
+
+
+def server_info(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT @@server_id, @@hostname, @@port, @@read_only")
+    row = cursor.fetchone()
+    cursor.close()
+    conn.commit()
+    return row
+
+
+def server_id(conn):
+    return server_info(conn)[0]
+
+
+def call_procedure(conn, name):
+    cursor = conn.cursor()
+    cursor.callproc(name)
+    for result in cursor.stored_results():
+        result.fetchall()
+    cursor.close()
+    conn.commit()
+
+
+def timed(fn, samples):
+    times = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=50)
+    args = parser.parse_args()
+
+    load_dotenv()
+    router = ReplicaRouter.from_env()
+    if not router.replicas():
+        sys.exit("No replicas configured: set DB_REPLICA_HOSTS=host[:port],... (see README).")
+
+    failures = []
+
+    def check(name, ok, detail=""):
+        print(f"  {'OK  ' if ok else 'FAIL'} {name}" + (f" ({detail})" if detail else ""))
+        if not ok:
+            failures.append(name)
+
+    primary_pool = get_pool()
+    with primary_pool.connection() as conn:
+        primary_id, host, port, _ = server_info(conn)
+    print(f"Primary: server_id {primary_id} on {host}:{port}")
+
+    replica_ids = set()
+    for name, pool in router.replicas():
+        print(f"Replica {name}:")
+        try:
+            with pool.connection() as conn:
+                replica_id, host, port, read_only = server_info(conn)
+                lag = router.replication_lag(conn)
+        except Exception as e:
+            check("reachable", False, str(e))
+            continue
+        replica_ids.add(replica_id)
+        check("separate server", replica_id != primary_id, f"server_id {replica_id} on {host}:{port}")
+        check("replicating", lag is not None, "no replica status" if lag is None else f"{lag}s behind")
+        if not read_only:
+            print("  WARN read_only is OFF: a stray write would succeed here and diverge from the primary")
+
+    print("Routing:")
+    with primary_pool.connection() as conn:
+        with routing_session():
+            with router.read_connection(conn) as target:
+                check("read goes to a replica", server_id(target) in replica_ids)
+                with router.write_connection(target) as primary:
+                    check("write from a replica connection goes to the primary", server_id(primary) == primary_id)
+            with router.read_connection(conn) as target:
+                check("read right after a write stays on the primary", server_id(target) == primary_id)
+        with routing_session(primary_only=True):
+            with router.read_connection(conn) as target:
+                check("read on a write page stays on the primary", server_id(target) == primary_id)
+        max_lag, router.max_lag = router.max_lag, -1
+        with router.read_connection(conn) as target:
+            check("read falls back to the primary when every replica lags", server_id(target) == primary_id)
+        router.max_lag = max_lag
+
+        primary_ms = timed(lambda: call_procedure(conn, "GetFutureEvents"), args.samples)
+
+    def routed_call():
+        with router.read_connection() as target:
+            call_procedure(target, "GetFutureEvents")
+    routed_ms = timed(routed_call, args.samples)
+    print(f"\nGetFutureEvents: primary {primary_ms:.2f} ms, routed {routed_ms:.2f} ms (median of {args.samples})")
+    print(f"Routing counters: {router.stats}")
+    router.close()
+    primary_pool.close()
+
+    if failures:
+        print(f"\nFAIL: {len(failures)} check(s) failed.")
+        sys.exit(1)
+    print("\nOK: reads reach the replicas, writes and read-your-own-write reads stay on the primary.")
+
+
+if __name__ == "__main__":
+    main()
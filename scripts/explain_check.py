@@ -0,0 +1,133 @@
+"""EXPLAIN-based index check for the hot query paths, with before/after timings.
+
+Builds the synthetic bench schema (about 1M registrations by default), times every hot
+query, applies sql/migrations/V001__hot_path_indexes.sql, times them again and fails if
+any query still needs a full scan of a large table.
+
+Usage: python -m scripts.explain_check [--registrations N] [--repeat N] [--reuse]
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from db.migrations import apply_pending
+from scripts.bench_schema import analyze, explain_rows, open_bench
+
+# Tables that grow with usage; a full scan of any of these fails the check
+LARGE_TABLES = {"event", "registrations", "participating_team", "pteam_members", "feedback", "grievances"}
+
+# (name, alias -> table, SQL) mirroring the bodies of the stored routines they come from
+HOT_QUERIES = [
+    ("GetFutureEvents (P-11)", {"e": "event", "v": "venue", "f": "faculty"}, """
+        SELECT e.Event_ID, e.Event_Name, e.Date, v.Venue_Name AS Venue, f.Name AS Faculty_In_Charge
+        FROM Event e JOIN Venue v ON e.Venue_ID = v.Venue_ID JOIN Faculty f ON e.Faculty_ID = f.Faculty_ID
+        WHERE e.Date >= CURDATE() ORDER BY e.Date ASC
+    """),
+    ("GetUpcomingEventCount (F-9)", {"event": "event"}, """
+        SELECT COUNT(*) FROM Event WHERE Date >= CURDATE()
+    """),
+    ("GetEventsForDate (P-10)", {"e": "event", "v": "venue", "c": "clubs"}, """
+        SELECT e.Event_ID, e.Event_Name, e.Event_Type, e.Start_Time, e.End_Time, v.Venue_Name, c.Club_Name
+        FROM Event e JOIN Venue v ON e.Venue_ID = v.Venue_ID JOIN Clubs c ON e.Club_ID = c.Club_ID
+        WHERE e.Date = %(date)s ORDER BY e.Start_Time
+    """),
+    ("CheckVenueAvailability (F-4)", {"event": "event"}, """
+        SELECT COUNT(*) FROM Event
+        WHERE Venue_ID = %(venue_id)s AND Date = %(date)s AND Start_Time < '18:00:00' AND End_Time > '09:00:00'
+    """),
+    ("GetEventsByClubAndType (P-7)", {"e": "event", "v": "venue", "f": "faculty"}, """
+        SELECT e.Event_ID, e.Event_Name, e.Date, e.Start_Time, v.Venue_Name, f.Name AS Faculty_Incharge
+        FROM Event e JOIN Venue v ON e.Venue_ID = v.Venue_ID JOIN Faculty f ON e.Faculty_ID = f.Faculty_ID
+        WHERE e.Club_ID = %(club_id)s AND e.Event_Type = %(event_type)s ORDER BY e.Date, e.Start_Time
+    """),
+    ("GetRegistrationCountByPaymentStatus (F-7)", {"r": "registrations", "pt": "participating_team"}, """
+        SELECT COUNT(r.Registration_ID) FROM Registrations r JOIN Participating_Team pt ON r.PTeam_ID = pt.PTeam_ID
+        WHERE pt.Event_ID = %(event_id)s AND r.Payment_Status = 'Paid'
+    """),
+    ("GetTotalRegistrations (F-1)", {"r": "registrations", "pt": "participating_team"}, """
+        SELECT COUNT(r.Registration_ID) FROM Registrations r JOIN Participating_Team pt ON r.PTeam_ID = pt.PTeam_ID
+        WHERE pt.Event_ID = %(event_id)s
+    """),
+    ("GetAvgEventRating (F-2)", {"feedback": "feedback"}, """
+        SELECT AVG(Rating) FROM Feedback WHERE Event_ID = %(event_id)s
+    """),
+    ("Latest grievances (reports)", {"g": "grievances", "e": "event", "s": "students"}, """
+        SELECT g.Grievance_ID, e.Event_Name, s.Name AS Student_Name, g.Submitted_On, g.Grievance_Text
+        FROM Grievances g JOIN Event e ON g.Event_ID = e.Event_ID JOIN Students s ON g.Student_ID = s.Student_ID
+        ORDER BY g.Submitted_On DESC, g.Grievance_ID DESC LIMIT 10
+    """),
+]
+
+
+def sample_params(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT Event_ID, Venue_ID, Club_ID, Event_Type, Date FROM Event WHERE Date >= CURDATE() ORDER BY Event_ID LIMIT 1")
+    event_id, venue_id, club_id, event_type, date = cursor.fetchone()
+    cursor.close()
+    return {"event_id": event_id, "venue_id": venue_id, "club_id": club_id, "event_type": event_type, "date": date}
+
+
+def time_query(conn, sql, params, repeat):
+    cursor = conn.cursor()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    cursor.close()
+    return statistics.median(samples)
+
+
+def full_scans(conn, aliases, sql, params):
+    """Large tables the plan reads with access type ALL."""
+    scans = []
+    for row in explain_rows(conn, sql, params):
+        table = aliases.get(row["table"], str(row["table"]).lower())
+        if row["type"] == "ALL" and table in LARGE_TABLES:
+            scans.append(table)
+    return scans
+
+
+def measure(conn, params, repeat):
+    return {
+        name: (time_query(conn, sql, params, repeat), full_scans(conn, aliases, sql, params))
+        for name, aliases, sql in HOT_QUERIES
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--registrations", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query (median is reported)")
+    parser.add_argument("--reuse", action="store_true", help="reuse an already seeded bench schema without V001")
+    args = parser.parse_args()
+
+    load_dotenv()
+    pool = open_bench({"registrations": args.registrations}, reuse=args.reuse)
+    with pool.connection() as conn:
+        params = sample_params(conn)
+        before = measure(conn, params, args.repeat)
+        apply_pending(conn, upto=1)
+        analyze(conn)
+        after = measure(conn, params, args.repeat)
+
+    failed = False
+    print(f"\n{'Query':45} {'before ms':>10} {'after ms':>10} {'speedup':>8}  full scans after")
+    for name, _, _ in HOT_QUERIES:
+        before_ms, _ = before[name]
+        after_ms, scans = after[name]
+        failed = failed or bool(scans)
+        print(f"{name:45} {before_ms:10.2f} {after_ms:10.2f} {before_ms / max(after_ms, 1e-3):7.1f}x  {', '.join(scans) or '-'}")
+
+    if failed:
+        print("\nFAIL: some hot queries still scan a large table.")
+        sys.exit(1)
+    print("\nOK: no hot query performs a full scan of a large table.")
+
+
+if __name__ == "__main__":
+    main()
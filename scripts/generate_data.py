@@ -0,0 +1,342 @@
+"""Seeded, reproducible synthetic data for every table in sql/DDL.sql, loaded through the real triggers.
+
+Rows go into the configured database (DB_NAME) with multi-row INSERTs while triggers and
+foreign keys stay enabled, so every trigger rule holds: registrations only for events dated
+today or later, one team per student per event, feedback only from registered students with
+ratings 1-5, grievances only from participants. Because of the first rule all generated events
+fall within the next --horizon-days days. Ids continue after the current maximum of each
+table, so the generator can run on top of sql/DML.sql, but it expects no concurrent writers.
+The same --seed on the same starting database produces the same rows.
+
+Usage: python -m scripts.generate_data [--seed N] [--students N] [--events N] [--registrations N] ...
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from dotenv import load_dotenv
+
+from db.pool import ConnectionPool
+
+DEFAULT_VOLUMES = {
+    "faculty": 300,
+    "venues": 80,
+    "clubs": 120,
+    "students": 50_000,
+    "events": 5_000,
+    "resources": 15_000,
+    "registrations": 2_000_000,
+    "cancellations": 40_000,
+    "feedback": 300_000,
+    "grievances": 50_000,
+    # Target size of Audit_Logs; rows written by the triggers count towards it
+    "audit_logs": 500_000,
+}
+
+DEPARTMENTS = ("Computer Science", "Electronics", "Mechanical", "Civil", "Biotechnology", "Mathematics")
+EVENT_TYPES = ("Workshop", "Competition", "Seminar", "Exhibition", "Talk", "Hackathon")
+RESOURCES = (("Projector", "Equipment"), ("Microphone", "Equipment"), ("Laptops", "Equipment"),
+             ("Chairs", "Furniture"), ("Tables", "Furniture"), ("Snacks", "Catering"))
+VENUE_CAPACITIES = (40, 60, 100, 150, 250, 500)
+TEAM_SIZES = (1, 2, 3, 4)
+TEAM_SIZE_WEIGHTS = (50, 20, 20, 10)
+RATING_WEIGHTS = (5, 10, 20, 35, 30)
+# Registrations start Paid or Pending; Cancelled only comes from a Cancellations row
+PAYMENT_STATUSES = ("Paid", "Pending")
+PAYMENT_WEIGHTS = (80, 20)
+
+# Tables whose ids the generator assigns itself (it needs them for the foreign keys)
+ID_COLUMNS = {
+    "Faculty": "Faculty_ID",
+    "Venue": "Venue_ID",
+    "Clubs": "Club_ID",
+    "Students": "Student_ID",
+    "Event": "Event_ID",
+    "Organising_Team": "OTeam_ID",
+    "Event_Admin": "Admin_ID",
+    "Participating_Team": "PTeam_ID",
+    "Registrations": "Registration_ID",
+}
+
+ROWS_PER_INSERT = 1000
+
+
+def chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def values_sql(row_count, width):
+    row = "(" + ", ".join(["%s"] * width) + ")"
+    return ", ".join([row] * row_count)
+
+
+class DataGenerator:
+    """Writes one synthetic data set; `run()` returns ({table: rows written}, seconds)."""
+
+    def __init__(self, conn, volumes=None, seed=42, horizon_days=365, batch=20_000, verbose=True):
+        self.conn = conn
+        self.volumes = dict(DEFAULT_VOLUMES, **(volumes or {}))
+        self.rng = random.Random(seed)
+        self.horizon_days = horizon_days
+        self.batch = batch
+        self.verbose = verbose
+        self.today = date.today()
+        self.counts = {}
+        self.cursor = None
+
+    def log(self, message):
+        if self.verbose:
+            print(message, flush=True)
+
+    def insert(self, table, columns, rows):
+        for part in chunks(rows, ROWS_PER_INSERT):
+            self.cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + values_sql(len(part), len(columns)),
+                [value for row in part for value in row]
+            )
+        self.counts[table] = self.counts.get(table, 0) + len(rows)
+
+    def first_ids(self):
+        ids = {}
+        for table, column in ID_COLUMNS.items():
+            self.cursor.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 FROM {table}")
+            ids[table] = self.cursor.fetchone()[0]
+        return ids
+
+    def run(self):
+        started = time.perf_counter()
+        self.cursor = self.conn.cursor()
+        try:
+            self.ids = self.first_ids()
+            for step in (self.faculty, self.students, self.venues, self.clubs, self.events,
+                         self.organisers, self.resources, self.participation, self.audit_logs):
+                step()
+                self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.cursor.close()
+        return self.counts, time.perf_counter() - started
+
+    def id_range(self, table, count):
+        first = self.ids[table]
+        self.ids[table] = first + count
+        return range(first, first + count)
+
+    def faculty(self):
+        self.faculty_ids = self.id_range("Faculty", self.volumes["faculty"])
+        rows, phones = [], []
+        for i in self.faculty_ids:
+            rows.append((i, f"Faculty {i}", f"faculty{i}@synthetic.campus.edu", self.rng.choice(DEPARTMENTS)))
+            for k in range(self.rng.randint(1, 2)):
+                phones.append((i, f"9{i:08d}{k}"))
+        self.insert("Faculty", ("Faculty_ID", "Name", "Email", "Department"), rows)
+        self.insert("Faculty_Phone_No_Table", ("Faculty_ID", "Phone_No"), phones)
+        self.log(f"  faculty        {len(rows):>10,}")
+
+    def students(self):
+        self.student_ids = self.id_range("Students", self.volumes["students"])
+        rows = [
+            (i, f"Student {i}", f"student{i}@synthetic.campus.edu", f"8{i:09d}",
+             self.rng.randint(1, 4), self.rng.choice(DEPARTMENTS))
+            for i in self.student_ids
+        ]
+        self.insert("Students", ("Student_ID", "Name", "Email", "Phone_No", "Year_Of_Study", "Department"), rows)
+        self.log(f"  students       {len(rows):>10,}")
+
+    def venues(self):
+        self.venue_ids = self.id_range("Venue", self.volumes["venues"])
+        rows = [
+            (i, f"Venue {i}", self.rng.choice(VENUE_CAPACITIES), f"R{i}",
+             f"Block {chr(65 + i % 8)}", self.rng.randint(0, 4))
+            for i in self.venue_ids
+        ]
+        self.insert("Venue", ("Venue_ID", "Venue_Name", "Capacity", "Room_No", "Building", "Floor"), rows)
+        self.log(f"  venues         {len(rows):>10,}")
+
+    def clubs(self):
+        self.club_ids = self.id_range("Clubs", self.volumes["clubs"])
+        rows = [
+            (i, f"Club {i}", "Synthetic club", self.today - timedelta(days=self.rng.randint(100, 5000)),
+             self.rng.choice(self.faculty_ids))
+            for i in self.club_ids
+        ]
+        self.insert("Clubs", ("Club_ID", "Club_Name", "Description", "Founded_Date", "Faculty_ID"), rows)
+        self.log(f"  clubs          {len(rows):>10,}")
+
+    def events(self):
+        """Events over the coming horizon; a few tries per event to avoid double-booking a venue."""
+        event_ids = self.id_range("Event", self.volumes["events"])
+        booked = {}
+        rows = []
+        for i in event_ids:
+            for _ in range(10):
+                venue_id = self.rng.choice(self.venue_ids)
+                day = self.today + timedelta(days=self.rng.randint(0, self.horizon_days))
+                start = self.rng.randint(8, 18)
+                end = min(start + self.rng.randint(1, 4), 22)
+                slots = booked.setdefault((venue_id, day), [])
+                if all(end <= s or start >= e for s, e in slots):
+                    break
+            slots.append((start, end))
+            event_type = self.rng.choice(EVENT_TYPES)
+            rows.append((
+                i, f"{event_type} {i}", event_type, day, timedelta(hours=start), timedelta(hours=end),
+                self.rng.choice(("Yes", "No")), 1000 * self.rng.randint(1, 50),
+                self.rng.choice(self.club_ids), venue_id, self.rng.choice(self.faculty_ids),
+            ))
+        self.insert("Event", ("Event_ID", "Event_Name", "Event_Type", "Date", "Start_Time", "End_Time",
+                              "Catering", "Budget", "Club_ID", "Venue_ID", "Faculty_ID"), rows)
+        # (Event_ID, Event_Name, Date) drives registrations, feedback and grievances
+        self.event_rows = [(row[0], row[1], row[3]) for row in rows]
+        self.log(f"  events         {len(rows):>10,}")
+
+    def organisers(self):
+        """One organising team of 3-6 students per event, led by an Event_Admin."""
+        oteam_ids = self.id_range("Organising_Team", len(self.event_rows))
+        self.admin_ids = self.id_range("Event_Admin", len(self.event_rows))
+        teams, members, admins = [], [], []
+        for oteam_id, admin_id, (event_id, event_name, _) in zip(oteam_ids, self.admin_ids, self.event_rows):
+            teams.append((oteam_id, event_name, event_id))
+            crew = self.rng.sample(self.student_ids, min(self.rng.randint(3, 6), len(self.student_ids)))
+            members.extend((oteam_id, student_id) for student_id in crew)
+            admins.append((admin_id, crew[0], oteam_id, f"admin{admin_id}@synthetic.campus.edu"))
+        self.insert("Organising_Team", ("OTeam_ID", "Formed_For", "Event_ID"), teams)
+        self.insert("OTeam_Members", ("OTeam_ID", "Student_ID"), members)
+        self.insert("Event_Admin", ("Admin_ID", "Student_ID", "OTeam_ID", "Email"), admins)
+        self.log(f"  organisers     {len(members):>10,}")
+
+    def resources(self):
+        rows = []
+        for _ in range(self.volumes["resources"]):
+            name, kind = self.rng.choice(RESOURCES)
+            rows.append((name, kind, self.rng.randint(1, 100), self.rng.choice(self.event_rows)[0]))
+        self.insert("Resources", ("Resource_Name", "Resource_Type", "Quantity", "Event_ID"), rows)
+        self.log(f"  resources      {len(rows):>10,}")
+
+    def registrations_per_event(self):
+        """Skewed split of the registration volume: a few popular events, a long tail."""
+        total = self.volumes["registrations"]
+        weights = [self.rng.random() ** 3 + 0.02 for _ in self.event_rows]
+        scale = total / sum(weights)
+        counts = [min(int(w * scale), len(self.student_ids)) for w in weights]
+        shortfall = total - sum(counts)
+        for i in range(len(counts)):
+            if shortfall <= 0:
+                break
+            extra = min(shortfall, len(self.student_ids) - counts[i])
+            counts[i] += extra
+            shortfall -= extra
+        return counts
+
+    def participation(self):
+        """Teams, members, registrations, cancellations, feedback and grievances, event by event."""
+        total = max(self.volumes["registrations"], 1)
+        p_cancel = self.volumes["cancellations"] / total
+        p_feedback = self.volumes["feedback"] / total
+        p_grievance = self.volumes["grievances"] / total
+        pending = {name: [] for name in ("teams", "members", "registrations", "cancellations", "feedback", "grievances")}
+
+        for (event_id, event_name, event_date), count in zip(self.event_rows, self.registrations_per_event()):
+            participants = self.rng.sample(self.student_ids, count)
+            pos = 0
+            while pos < count:
+                size = min(self.rng.choices(TEAM_SIZES, TEAM_SIZE_WEIGHTS)[0], count - pos)
+                team = participants[pos:pos + size]
+                pos += size
+                pteam_id = self.id_range("Participating_Team", 1)[0]
+                pending["teams"].append((pteam_id, f"Team {pteam_id}" if size > 1 else None, size, event_id))
+                status = self.rng.choices(PAYMENT_STATUSES, PAYMENT_WEIGHTS)[0]
+                for student_id in team:
+                    reg_id = self.id_range("Registrations", 1)[0]
+                    reg_date = self.today - timedelta(days=self.rng.randint(0, 30))
+                    pending["members"].append((pteam_id, student_id))
+                    pending["registrations"].append((reg_id, event_name, reg_date, status, student_id, pteam_id))
+                    if self.rng.random() < p_cancel:
+                        pending["cancellations"].append((reg_id, self.today, "Synthetic cancellation"))
+                    elif self.rng.random() < p_feedback:
+                        rating = self.rng.choices((1, 2, 3, 4, 5), RATING_WEIGHTS)[0]
+                        pending["feedback"].append((f"Feedback from {student_id}", rating, event_date, student_id, event_id))
+                    if self.rng.random() < p_grievance:
+                        pending["grievances"].append((f"Grievance from {student_id}", event_date, event_id, student_id))
+
+            if len(pending["registrations"]) >= self.batch:
+                self.flush_participation(pending)
+        self.flush_participation(pending)
+
+    def flush_participation(self, pending):
+        """Write one batch parent-first, so every trigger sees the rows it looks up, and commit."""
+        self.insert("Participating_Team", ("PTeam_ID", "Team_Name", "No_of_Participants", "Event_ID"), pending["teams"])
+        self.insert("PTeam_Members", ("PTeam_ID", "Student_ID"), pending["members"])
+        self.insert("Registrations", ("Registration_ID", "Reg_For", "Reg_Date", "Payment_Status", "Student_ID", "PTeam_ID"),
+                    pending["registrations"])
+        # Same two steps as ProcessCancellation: the Cancellations row, then the status change
+        self.insert("Cancellations", ("Reg_ID", "Cancelled_Date", "Reason"), pending["cancellations"])
+        for part in chunks([row[0] for row in pending["cancellations"]], ROWS_PER_INSERT):
+            self.cursor.execute(
+                f"UPDATE Registrations SET Payment_Status = 'Cancelled' WHERE Registration_ID IN ({', '.join(['%s'] * len(part))})",
+                part
+            )
+        self.insert("Feedback", ("Comments", "Rating", "Submitted_Date", "Student_ID", "Event_ID"), pending["feedback"])
+        self.insert("Grievances", ("Grievance_Text", "Submitted_On", "Event_ID", "Student_ID"), pending["grievances"])
+        self.conn.commit()
+        self.log(f"  registrations  {self.counts.get('Registrations', 0):>10,}")
+        for rows in pending.values():
+            rows.clear()
+
+    def audit_logs(self):
+        """Top Audit_Logs up to the target with back-dated entries from students, faculty and admins."""
+        self.cursor.execute("SELECT COUNT(*) FROM Audit_Logs")
+        missing = self.volumes["audit_logs"] - self.cursor.fetchone()[0]
+        now = datetime.now().replace(microsecond=0)
+        actions = ("Login", "Profile updated", "Viewed event report", "Registration done for Event ID {}",
+                   "Feedback submitted for Event ID {}")
+        written = 0
+        while written < missing:
+            rows = []
+            for _ in range(min(self.batch, missing - written)):
+                action = self.rng.choice(actions).format(self.rng.choice(self.event_rows)[0])
+                performed_on = now - timedelta(seconds=self.rng.randint(0, 730 * 86400))
+                actor = self.rng.random()
+                # Exactly one of Student_ID / Faculty_ID / Admin_ID (CHECK constraint)
+                if actor < 0.85:
+                    rows.append((action, performed_on, self.rng.choice(self.student_ids), None, None))
+                elif actor < 0.95:
+                    rows.append((action, performed_on, None, self.rng.choice(self.faculty_ids), None))
+                else:
+                    rows.append((action, performed_on, None, None, self.rng.choice(self.admin_ids)))
+            self.insert("Audit_Logs", ("Action_Type", "Performed_On", "Student_ID", "Faculty_ID", "Admin_ID"), rows)
+            self.conn.commit()
+            written += len(rows)
+        self.log(f"  audit logs     {max(missing, 0):>10,} (plus those written by triggers)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--horizon-days", type=int, default=365, help="events are spread over this many days from today")
+    parser.add_argument("--batch", type=int, default=20_000, help="registrations written per transaction")
+    for name, default in DEFAULT_VOLUMES.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default, dest=name)
+    args = parser.parse_args()
+
+    load_dotenv()
+    volumes = {name: getattr(args, name) for name in DEFAULT_VOLUMES}
+    env = ConnectionPool.from_env()
+    pool = ConnectionPool(size=1, timeout=env.timeout, **env.connect_args)
+    print(f"Generating synthetic data into {env.connect_args['database']} (seed {args.seed}) ...")
+    with pool.connection() as conn:
+        counts, seconds = DataGenerator(conn, volumes, args.seed, args.horizon_days, args.batch).run()
+    pool.close()
+
+    rows = sum(counts.values())
+    print(f"\nWrote {rows:,} rows in {seconds:.1f}s ({rows / max(seconds, 1e-9):,.0f} rows/s)")
+    for table, count in counts.items():
+        print(f"  {table:24} {count:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Concurrent load test replaying the app's dashboard reads, registrations and cancellations.
+
+Every worker thread holds its own pooled connection and loops over operations drawn from
+--mix until --duration seconds have passed. Each operation issues the same statements as the
+page it stands for. Afterwards the per-operation p50/p95/p99 latency, throughput and error
+counts are printed. Trigger rejections (e.g. a student already in a team for that event) are
+counted separately from errors. Load data with scripts/generate_data.py first.
+
+Usage: python -m scripts.load_test [--workers N] [--duration S] [--mix dashboard=70,register=20,cancel=10] [--seed N]
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+
+import mysql.connector
+from dotenv import load_dotenv
+
+from db.metrics import get_event_metrics
+from db.pool import ConnectionPool
+from db.registrations import register_team
+from db.students import ACTIVE_FILTER, STUDENT_REGISTRATIONS_QUERY
+
+DEFAULT_MIX = "dashboard=70,register=20,cancel=10"
+
+# MySQL error raised by SIGNAL SQLSTATE '45000' in the triggers and procedures
+ER_SIGNAL_EXCEPTION = 1644
+
+# What the Registration page cancel tab reads (db/students.py)
+ACTIVE_REGISTRATIONS_QUERY = STUDENT_REGISTRATIONS_QUERY.format(status_filter=ACTIVE_FILTER)
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}'; choose from {', '.join(OPERATIONS)}.")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def call_procedure(conn, name, args=()):
+    cursor = conn.cursor()
+    try:
+        cursor.callproc(name, args)
+        rows = [row for result in cursor.stored_results() for row in result.fetchall()]
+        conn.commit()
+        return rows
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def load_catalogue(conn):
+    """Upcoming events and the student id range the workers draw from."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT Event_ID, Event_Name FROM Event WHERE Date >= CURDATE()")
+    events = cursor.fetchall()
+    cursor.execute("SELECT MIN(Student_ID), MAX(Student_ID) FROM Students")
+    students = cursor.fetchone()
+    cursor.close()
+    conn.commit()
+    if not events or students[0] is None:
+        raise SystemExit("No upcoming events or students; run scripts.generate_data first.")
+    return events, students
+
+
+def dashboard(conn, rng, catalogue):
+    """Dashboard rerun without the query cache: P-11 plus the per-event metrics."""
+    call_procedure(conn, "GetFutureEvents")
+    get_event_metrics(conn, upcoming=True, use_cache=False)
+    conn.commit()
+
+
+def register(conn, rng, catalogue):
+    """P-1 for a solo entrant or a team of up to four random students."""
+    events, (low, high) = catalogue
+    event_id, event_name = rng.choice(events)
+    size = rng.choice((1, 1, 2, 3, 4))
+    students = rng.sample(range(low, high + 1), size)
+    team_name = f"Load {rng.getrandbits(32):08x}" if size > 1 else None
+    register_team(conn, event_id, event_name, students, rng.choice(("Paid", "Pending")), team_name=team_name)
+
+
+def cancel(conn, rng, catalogue):
+    """Cancel tab: look up a random student's registrations, then P-2 for an active one."""
+    _, (low, high) = catalogue
+    cursor = conn.cursor()
+    cursor.execute(ACTIVE_REGISTRATIONS_QUERY, (rng.randint(low, high),))
+    active = cursor.fetchall()
+    cursor.close()
+    conn.commit()
+    if active:
+        reg_id = rng.choice(active)[0]
+        call_procedure(conn, "ProcessCancellation", (reg_id, "Load test", False))
+
+
+OPERATIONS = {"dashboard": dashboard, "register": register, "cancel": cancel}
+
+
+class Results:
+    """Latencies and outcome counts per operation, shared by all workers."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {name: [] for name in OPERATIONS}
+        self.rejected = {name: 0 for name in OPERATIONS}
+        self.errors = {name: 0 for name in OPERATIONS}
+        self.last_error = {}
+
+    def record(self, name, seconds, error=None):
+        with self.lock:
+            if error is None:
+                self.latencies[name].append(seconds * 1000)
+            elif isinstance(error, mysql.connector.Error) and error.errno == ER_SIGNAL_EXCEPTION:
+                self.rejected[name] += 1
+            else:
+                self.errors[name] += 1
+                self.last_error[name] = str(error)
+
+
+def worker(pool, mix, catalogue, results, deadline, seed):
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    with pool.connection() as conn:
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                OPERATIONS[name](conn, rng, catalogue)
+            except Exception as e:
+                results.record(name, time.perf_counter() - started, e)
+            else:
+                results.record(name, time.perf_counter() - started)
+
+
+def percentiles(samples):
+    if len(samples) < 2:
+        return (samples[0],) * 3 if samples else (float("nan"),) * 3
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weighted operations, e.g. " + DEFAULT_MIX)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    load_dotenv()
+    env = ConnectionPool.from_env()
+    pool = ConnectionPool(size=args.workers, timeout=env.timeout, **env.connect_args)
+    with pool.connection() as conn:
+        catalogue = load_catalogue(conn)
+
+    results = Results()
+    print(f"Running {args.workers} workers for {args.duration:.0f}s with mix {args.mix} ...")
+    started = time.perf_counter()
+    deadline = started + args.duration
+    threads = [
+        threading.Thread(target=worker, args=(pool, mix, catalogue, results, deadline, args.seed + i))
+        for i in range(args.workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    pool.close()
+
+    print(f"\n{'Operation':10} {'ok':>8} {'rejected':>9} {'errors':>7} {'ops/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name in mix:
+        samples = results.latencies[name]
+        p50, p95, p99 = percentiles(samples)
+        print(f"{name:10} {len(samples):8,} {results.rejected[name]:9,} {results.errors[name]:7,} "
+              f"{len(samples) / elapsed:8.1f} {p50:8.1f} {p95:8.1f} {p99:8.1f}")
+    total = sum(len(s) for s in results.latencies.values())
+    print(f"\nTotal throughput: {total / elapsed:.1f} successful ops/s over {elapsed:.1f}s")
+    for name, message in results.last_error.items():
+        print(f"Last {name} error: {message}")
+
+
+if __name__ == "__main__":
+    main()
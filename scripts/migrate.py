@@ -0,0 +1,35 @@
+"""Apply pending sql/migrations/V*.sql files to the database configured in .env.
+
+Usage: python -m scripts.migrate [--upto VERSION] [--list]
+"""
+import argparse
+
+from dotenv import load_dotenv
+
+from db.migrations import apply_pending, applied_versions, list_migrations
+from db.pool import ConnectionPool
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--upto", type=int, help="apply migrations up to and including this version")
+    parser.add_argument("--list", action="store_true", help="show migration status without applying anything")
+    args = parser.parse_args()
+
+    load_dotenv()
+    pool = ConnectionPool.from_env()
+    with pool.connection() as conn:
+        if args.list:
+            done = applied_versions(conn)
+            for version, description, _ in list_migrations():
+                print(f"V{version:03d}  {'applied' if version in done else 'pending':8}  {description}")
+            return
+        applied = apply_pending(conn, upto=args.upto)
+    for version, description in applied:
+        print(f"Applied V{version:03d} {description}")
+    if not applied:
+        print("Database is up to date.")
+
+
+if __name__ == "__main__":
+    main()
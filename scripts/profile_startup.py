@@ -0,0 +1,133 @@
+"""Cold-start and rerun timing report for the Streamlit app.
+
+Imports: each scenario is timed in a fresh interpreter (median of --repeat runs). "router"
+is what UI.py imports before any page. "eager" adds every page module, which is what UI.py
+used to import up front. Each page row is the extra cost of that page's first navigation.
+
+Reruns: with --reruns N the app is driven headlessly through streamlit.testing (as an admin,
+against the database in .env). Each page gets one cold rerun and N warm reruns. --app profiles
+another copy of the router, e.g. an older revision saved with
+`git show <rev>:UI.py > UI_before.py`. --save/--baseline store and compare runs.
+
+Usage: python -m scripts.profile_startup [--repeat N] [--reruns N] [--app PATH] [--save FILE] [--baseline FILE]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from dotenv import load_dotenv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What UI.py imports before routing to a page
+ROUTER_MODULES = [
+    "mysql.connector", "dotenv", "pandas", "streamlit",
+    "db.pool", "db.cache", "db.statements", "db.instrumentation",
+]
+
+PAGE_MODULES = {
+    "Dashboard": "components.dashboard",
+    "Registration": "components.reg",
+    "Reports": "components.reports",
+    "Search": "components.search",
+    "Table Viewer": "components.view_table",
+    "Admin": "components.admin",
+    "Performance": "components.performance",
+}
+
+_TIMER = """
+import importlib, json, sys, time
+started = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+print(json.dumps((time.perf_counter() - started) * 1000))
+"""
+
+
+def import_ms(modules, repeat):
+    """Median wall time (ms) to import `modules` in a fresh interpreter."""
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _TIMER, *modules], cwd=ROOT, check=True,
+                             capture_output=True, text=True)
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def profile_imports(repeat):
+    router = import_ms(ROUTER_MODULES, repeat)
+    rows = {"router": router, "eager (all pages)": import_ms(ROUTER_MODULES + list(PAGE_MODULES.values()), repeat)}
+    for page, module in PAGE_MODULES.items():
+        rows[f"+ {page}"] = import_ms(ROUTER_MODULES + [module], repeat) - router
+    return rows
+
+
+def profile_reruns(app, reruns):
+    """(cold ms, median warm ms) per page, running the app headlessly as an admin."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app, default_timeout=120)
+    at.session_state["logged_in"] = True
+    at.session_state["user_role"] = "Admin"
+    started = time.perf_counter()
+    at.run()
+    rows = {"(first run)": ((time.perf_counter() - started) * 1000, None)}
+    for page in PAGE_MODULES:
+        started = time.perf_counter()
+        at.sidebar.radio[0].set_value(page).run()
+        cold = (time.perf_counter() - started) * 1000
+        warm = []
+        for _ in range(reruns):
+            started = time.perf_counter()
+            at.run()
+            warm.append((time.perf_counter() - started) * 1000)
+        if at.exception:
+            print(f"  {page}: {at.exception[0].message}")
+        rows[page] = (cold, statistics.median(warm) if warm else None)
+    return rows
+
+
+def _fmt(value):
+    return f"{value:10.1f}" if value is not None else f"{'-':>10}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per import scenario")
+    parser.add_argument("--reruns", type=int, default=0, help="warm reruns per page (0 skips the rerun report)")
+    parser.add_argument("--app", default=os.path.join(ROOT, "UI.py"), help="router script to drive for reruns")
+    parser.add_argument("--save", help="write this run's timings to a JSON file")
+    parser.add_argument("--baseline", help="JSON file from an earlier --save to compare against")
+    args = parser.parse_args()
+
+    load_dotenv()
+    report = {"imports": profile_imports(args.repeat)}
+    if args.reruns:
+        report["reruns"] = profile_reruns(args.app, args.reruns)
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"\n{'Imports':24} {'ms':>10} {'baseline':>10}")
+    for name, ms in report["imports"].items():
+        print(f"{name:24} {_fmt(ms)} {_fmt(baseline.get('imports', {}).get(name))}")
+
+    if "reruns" in report:
+        print(f"\n{'Rerun':24} {'cold ms':>10} {'warm ms':>10} {'base cold':>10} {'base warm':>10}")
+        for page, (cold, warm) in report["reruns"].items():
+            base_cold, base_warm = baseline.get("reruns", {}).get(page, (None, None))
+            print(f"{page:24} {_fmt(cold)} {_fmt(warm)} {_fmt(base_cold)} {_fmt(base_warm)}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Registration rush: hundreds of concurrent registrations for a few events, with an oversell check.
+
+--clients threads start together and each sends --requests team registrations for the chosen
+upcoming events (--event, or the --events upcoming events with the fewest seats left), either
+through db.rush's queue (the Registration page's path) or straight through register_team()
+on one pooled connection per client (--mode direct, the path before the queue). Afterwards the
+outcome counts, registrations/sec and request latency percentiles are printed, and every event
+is recounted from Registrations against its venue capacity. In queue mode the run fails if any
+event is oversold or any lock wait timed out. Registrations are written to the configured
+database: use a disposable one.
+
+Usage: python -m scripts.rush_test [--clients N] [--requests N] [--events N | --event ID] [--mode queue|direct] [--workers N]
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+import mysql.connector
+from dotenv import load_dotenv
+
+from db.pool import ConnectionPool
+from db.registrations import ER_SIGNAL_EXCEPTION, register_team
+from db.rush import RUSH_MAX_BATCH, RegistrationQueue
+from scripts.load_test import percentiles
+
+# Upcoming events with a capacity, fewest seats left first
+EVENTS_QUERY = """
+    SELECT e.Event_ID, e.Event_Name, v.Capacity, s.Total_Registrations - s.Cancelled_Count AS Active
+    FROM Event e
+    JOIN Venue v ON e.Venue_ID = v.Venue_ID
+    JOIN Event_Stats s ON s.Event_ID = e.Event_ID
+    WHERE e.Date >= CURDATE() AND v.Capacity > 0 {scope}
+    ORDER BY v.Capacity - (s.Total_Registrations - s.Cancelled_Count), e.Event_ID
+    LIMIT %s
+"""
+
+# Seats taken per event recounted from the base tables, not from Event_Stats
+RECOUNT_QUERY = """
+    SELECT pt.Event_ID, COUNT(*)
+    FROM Registrations r
+    JOIN Participating_Team pt ON r.PTeam_ID = pt.PTeam_ID
+    WHERE r.Payment_Status <> 'Cancelled' AND pt.Event_ID IN ({ids})
+    GROUP BY pt.Event_ID
+"""
+
+
+class Outcomes:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.latencies = []
+        self.registered = 0
+        self.lock_waits = 0
+        self.last_error = None
+
+    def record(self, status, seconds, members=0, error=None):
+        with self.lock:
+            self.counts[status] += 1
+            self.latencies.append(seconds * 1000)
+            if status == "Registered":
+                self.registered += members
+            if error is not None:
+                self.last_error = str(error)
+                self.lock_waits += "Lock wait timeout" in str(error)
+
+
+def requests_for(rng, events, students, count):
+    """(event_id, event_name, members, team_name) tuples: mostly solo, some teams of 2-4."""
+    for _ in range(count):
+        event_id, event_name, _, _ = rng.choice(events)
+        size = rng.choice((1, 1, 2, 3, 4))
+        members = rng.sample(range(students[0], students[1] + 1), size)
+        yield event_id, event_name, members, f"Rush {rng.getrandbits(32):08x}" if size > 1 else None
+
+
+def queue_client(queue, requests, outcomes, start):
+    start.wait()
+    for event_id, event_name, members, team_name in requests:
+        ticket = queue.register(event_id, event_name, members, "Paid", team_name=team_name, timeout=120)
+        outcomes.record(ticket.status or "Timed out", ticket.seconds or 120, len(members),
+                        ticket.message if ticket.status == "Failed" else None)
+
+
+def direct_client(pool, requests, outcomes, start):
+    with pool.connection() as conn:
+        start.wait()
+        for event_id, event_name, members, team_name in requests:
+            started = time.perf_counter()
+            try:
+                register_team(conn, event_id, event_name, members, "Paid", team_name=team_name)
+                outcomes.record("Registered", time.perf_counter() - started, len(members))
+            except mysql.connector.Error as e:
+                status = "Rejected" if e.errno == ER_SIGNAL_EXCEPTION else "Failed"
+                outcomes.record(status, time.perf_counter() - started, error=e if status == "Failed" else None)
+
+
+def load_events(conn, args):
+    cursor = conn.cursor()
+    scope, params = ("AND e.Event_ID = %s", (args.event, 1)) if args.event else ("", (args.events,))
+    cursor.execute(EVENTS_QUERY.format(scope=scope), params)
+    events = cursor.fetchall()
+    cursor.execute("SELECT MIN(Student_ID), MAX(Student_ID) FROM Students")
+    students = cursor.fetchone()
+    cursor.close()
+    conn.commit()
+    return events, students
+
+
+def recount(conn, events):
+    cursor = conn.cursor()
+    cursor.execute(RECOUNT_QUERY.format(ids=", ".join(["%s"] * len(events))), [e[0] for e in events])
+    taken = dict(cursor.fetchall())
+    cursor.close()
+    conn.commit()
+    return taken
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200, help="concurrent students pressing Register")
+    parser.add_argument("--requests", type=int, default=5, help="registrations sent by each client")
+    parser.add_argument("--events", type=int, default=3, help="upcoming events the rush targets")
+    parser.add_argument("--event", type=int, help="rush a single event instead")
+    parser.add_argument("--mode", choices=("queue", "direct"), default="queue")
+    parser.add_argument("--workers", type=int, default=4, help="queue writer threads (queue mode)")
+    parser.add_argument("--max-batch", type=int, default=RUSH_MAX_BATCH)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    load_dotenv()
+    env = ConnectionPool.from_env()
+    size = args.workers if args.mode == "queue" else args.clients
+    pool = ConnectionPool(size=size + 1, timeout=env.timeout, **env.connect_args)
+    with pool.connection() as conn:
+        events, students = load_events(conn, args)
+    if not events:
+        sys.exit("No upcoming event with a venue capacity; load data with scripts/generate_data.py first.")
+
+    rng = random.Random(args.seed)
+    plans = [list(requests_for(rng, events, students, args.requests)) for _ in range(args.clients)]
+    outcomes, start = Outcomes(), threading.Event()
+    if args.mode == "queue":
+        queue = RegistrationQueue(pool=pool, workers=args.workers, max_batch=args.max_batch)
+        threads = [threading.Thread(target=queue_client, args=(queue, plan, outcomes, start)) for plan in plans]
+    else:
+        threads = [threading.Thread(target=direct_client, args=(pool, plan, outcomes, start)) for plan in plans]
+    for thread in threads:
+        thread.start()
+    print(f"{args.clients} clients x {args.requests} registrations ({args.mode}) on {len(events)} event(s) ...")
+    started = time.perf_counter()
+    start.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    with pool.connection() as conn:
+        taken = recount(conn, events)
+    pool.close()
+
+    p50, p95, p99 = percentiles(outcomes.latencies)
+    print(f"\nOutcomes: {', '.join(f'{k} {v:,}' for k, v in sorted(outcomes.counts.items()))}")
+    if args.mode == "queue":
+        print(f"Batches: {queue.stats['batches']:,} ({sum(outcomes.counts.values()) / max(queue.stats['batches'], 1):.1f} requests each)")
+    print(f"Throughput: {outcomes.registered / elapsed:.1f} registrations/s, "
+          f"{sum(outcomes.counts.values()) / elapsed:.1f} requests/s over {elapsed:.1f}s")
+    print(f"Request latency ms: p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f}")
+    print(f"Lock wait timeouts: {outcomes.lock_waits}")
+    if outcomes.last_error:
+        print(f"Last error: {outcomes.last_error}")
+
+    print(f"\n{'Event':>8} {'capacity':>9} {'before':>7} {'after':>7}")
+    oversold = 0
+    for event_id, _, capacity, active in events:
+        after = taken.get(event_id, 0)
+        oversold += after > capacity
+        print(f"{event_id:8} {capacity:9,} {active:7,} {after:7,}" + ("  OVERSOLD" if after > capacity else ""))
+
+    if args.mode == "queue" and (oversold or outcomes.lock_waits):
+        print("\nFAIL: the queue oversold an event or hit lock wait timeouts.")
+        sys.exit(1)
+    if not oversold:
+        print("\nOK: no event went past its venue capacity.")
+
+
+if __name__ == "__main__":
+    main()
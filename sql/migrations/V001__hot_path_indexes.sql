@@ -0,0 +1,20 @@
+-- V001: Composite and covering indexes for the hot query paths
+-- Applied by `python -m scripts.migrate`; verified by `python -m scripts.explain_check`.
+
+-- I-1: GetFutureEvents, GetUpcomingEventCount (Date >= CURDATE()) and GetEventsForDate (Date = ? ORDER BY Start_Time)
+CREATE INDEX idx_event_date_start ON Event (Date, Start_Time);
+
+-- I-2: CheckVenueAvailability — covers the whole Venue_ID/Date/time-window predicate
+CREATE INDEX idx_event_venue_schedule ON Event (Venue_ID, Date, Start_Time, End_Time);
+
+-- I-3: GetEventsByClubAndType — equality on both columns, rows returned in Date/Start_Time order
+CREATE INDEX idx_event_club_type ON Event (Club_ID, Event_Type, Date, Start_Time);
+
+-- I-4: GetTotalRegistrations, GetRegistrationCountByPaymentStatus, GetEventCapacityUsage (join on PTeam_ID, filter on status)
+CREATE INDEX idx_reg_pteam_status ON Registrations (PTeam_ID, Payment_Status);
+
+-- I-5: GetAvgEventRating — AVG(Rating) answered from the index alone
+CREATE INDEX idx_feedback_event_rating ON Feedback (Event_ID, Rating);
+
+-- I-6: Latest grievances (ORDER BY Submitted_On DESC, Grievance_ID DESC LIMIT n)
+CREATE INDEX idx_grievance_submitted ON Grievances (Submitted_On, Grievance_ID);
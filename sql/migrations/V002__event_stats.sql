@@ -0,0 +1,288 @@
+-- V002: Event_Stats — per-event registration, team, rating and grievance counters
+-- Kept current by the registration, feedback and grievance triggers so F-1, F-2, F-5, F-7
+-- and P-5 read one row instead of re-aggregating Registrations/Feedback on every call.
+
+CREATE TABLE Event_Stats (
+    Event_ID INT PRIMARY KEY,
+    Total_Registrations INT NOT NULL DEFAULT 0,
+    Paid_Count INT NOT NULL DEFAULT 0,
+    Pending_Count INT NOT NULL DEFAULT 0,
+    Cancelled_Count INT NOT NULL DEFAULT 0,
+    Team_Count INT NOT NULL DEFAULT 0,
+    Rating_Sum INT NOT NULL DEFAULT 0,
+    Rating_Count INT NOT NULL DEFAULT 0,
+    Grievance_Count INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (Event_ID) REFERENCES Event(Event_ID)
+);
+
+-- What Event_Stats should contain, recomputed from the base tables (used to rebuild and verify)
+CREATE OR REPLACE VIEW Event_Stats_Actual AS
+SELECT
+    e.Event_ID,
+    COALESCE(r.Total, 0) AS Total_Registrations,
+    COALESCE(r.Paid, 0) AS Paid_Count,
+    COALESCE(r.Pending, 0) AS Pending_Count,
+    COALESCE(r.Cancelled, 0) AS Cancelled_Count,
+    COALESCE(t.Teams, 0) AS Team_Count,
+    COALESCE(f.Rating_Sum, 0) AS Rating_Sum,
+    COALESCE(f.Rating_Count, 0) AS Rating_Count,
+    COALESCE(g.Grievances, 0) AS Grievance_Count
+FROM Event e
+LEFT JOIN (
+    SELECT pt.Event_ID, COUNT(*) AS Total,
+           SUM(r.Payment_Status = 'Paid') AS Paid,
+           SUM(r.Payment_Status = 'Pending') AS Pending,
+           SUM(r.Payment_Status = 'Cancelled') AS Cancelled
+    FROM Registrations r
+    JOIN Participating_Team pt ON r.PTeam_ID = pt.PTeam_ID
+    GROUP BY pt.Event_ID
+) r ON r.Event_ID = e.Event_ID
+LEFT JOIN (SELECT Event_ID, COUNT(*) AS Teams FROM Participating_Team GROUP BY Event_ID) t ON t.Event_ID = e.Event_ID
+LEFT JOIN (SELECT Event_ID, SUM(Rating) AS Rating_Sum, COUNT(Rating) AS Rating_Count FROM Feedback GROUP BY Event_ID) f ON f.Event_ID = e.Event_ID
+LEFT JOIN (SELECT Event_ID, COUNT(*) AS Grievances FROM Grievances GROUP BY Event_ID) g ON g.Event_ID = e.Event_ID;
+
+-- S-1: Apply deltas to one event's counters (creates the row on first use)
+DELIMITER $$
+CREATE PROCEDURE BumpEventStats(
+    IN event_id_in INT,
+    IN d_total INT,
+    IN status_in VARCHAR(50),
+    IN d_status INT,
+    IN d_teams INT,
+    IN d_rating_sum INT,
+    IN d_rating_count INT,
+    IN d_grievances INT
+)
+BEGIN
+    IF event_id_in IS NOT NULL THEN
+        INSERT INTO Event_Stats (Event_ID) VALUES (event_id_in)
+        ON DUPLICATE KEY UPDATE Event_ID = Event_ID;
+
+        UPDATE Event_Stats
+        SET Total_Registrations = Total_Registrations + d_total,
+            Paid_Count = Paid_Count + IF(status_in = 'Paid', d_status, 0),
+            Pending_Count = Pending_Count + IF(status_in = 'Pending', d_status, 0),
+            Cancelled_Count = Cancelled_Count + IF(status_in = 'Cancelled', d_status, 0),
+            Team_Count = Team_Count + d_teams,
+            Rating_Sum = Rating_Sum + d_rating_sum,
+            Rating_Count = Rating_Count + d_rating_count,
+            Grievance_Count = Grievance_Count + d_grievances
+        WHERE Event_ID = event_id_in;
+    END IF;
+END$$
+DELIMITER ;
+
+-- S-2: Rebuild every counter from the base tables (repairs drift)
+DELIMITER $$
+CREATE PROCEDURE RebuildEventStats()
+BEGIN
+    START TRANSACTION;
+    DELETE FROM Event_Stats;
+    INSERT INTO Event_Stats (Event_ID, Total_Registrations, Paid_Count, Pending_Count, Cancelled_Count,
+                             Team_Count, Rating_Sum, Rating_Count, Grievance_Count)
+    SELECT Event_ID, Total_Registrations, Paid_Count, Pending_Count, Cancelled_Count,
+           Team_Count, Rating_Sum, Rating_Count, Grievance_Count
+    FROM Event_Stats_Actual;
+    COMMIT;
+    SELECT CONCAT('Event_Stats rebuilt for ', COUNT(*), ' events') AS Status FROM Event_Stats;
+END$$
+DELIMITER ;
+
+-- S-3: List events whose stored counters differ from the base tables (empty result = consistent)
+DELIMITER $$
+CREATE PROCEDURE VerifyEventStats()
+BEGIN
+    SELECT a.Event_ID,
+           s.Total_Registrations AS Stored_Total, a.Total_Registrations AS Actual_Total,
+           s.Paid_Count AS Stored_Paid, a.Paid_Count AS Actual_Paid,
+           s.Pending_Count AS Stored_Pending, a.Pending_Count AS Actual_Pending,
+           s.Cancelled_Count AS Stored_Cancelled, a.Cancelled_Count AS Actual_Cancelled,
+           s.Team_Count AS Stored_Teams, a.Team_Count AS Actual_Teams,
+           s.Rating_Sum AS Stored_Rating_Sum, a.Rating_Sum AS Actual_Rating_Sum,
+           s.Rating_Count AS Stored_Rating_Count, a.Rating_Count AS Actual_Rating_Count,
+           s.Grievance_Count AS Stored_Grievances, a.Grievance_Count AS Actual_Grievances
+    FROM Event_Stats_Actual a
+    LEFT JOIN Event_Stats s ON s.Event_ID = a.Event_ID
+    WHERE s.Event_ID IS NULL
+       OR (s.Total_Registrations, s.Paid_Count, s.Pending_Count, s.Cancelled_Count, s.Team_Count,
+           s.Rating_Sum, s.Rating_Count, s.Grievance_Count)
+       <> (a.Total_Registrations, a.Paid_Count, a.Pending_Count, a.Cancelled_Count, a.Team_Count,
+           a.Rating_Sum, a.Rating_Count, a.Grievance_Count);
+END$$
+DELIMITER ;
+
+-- Trigger 12: Event — create its counters row
+DROP TRIGGER IF EXISTS after_event_insert;
+DELIMITER $$
+CREATE TRIGGER after_event_insert
+AFTER INSERT ON event
+FOR EACH ROW
+BEGIN
+    INSERT INTO Event_Stats (Event_ID) VALUES (NEW.Event_ID)
+    ON DUPLICATE KEY UPDATE Event_ID = Event_ID;
+END$$
+DELIMITER ;
+
+-- Trigger 13: Participating Team — count teams per event
+DROP TRIGGER IF EXISTS after_pteam_insert;
+DELIMITER $$
+CREATE TRIGGER after_pteam_insert
+AFTER INSERT ON participating_team
+FOR EACH ROW
+BEGIN
+    CALL BumpEventStats(NEW.Event_ID, 0, NULL, 0, 1, 0, 0, 0);
+END$$
+DELIMITER ;
+
+-- Trigger 9: Registrations — after insert, add entry to audit log and count it
+DROP TRIGGER IF EXISTS after_registration_insert;
+DELIMITER $$
+CREATE TRIGGER after_registration_insert
+AFTER INSERT ON registrations
+FOR EACH ROW
+BEGIN
+    DECLARE evt_id INT;
+    SELECT Event_ID INTO evt_id FROM participating_team WHERE PTeam_ID = NEW.PTeam_ID;
+
+    INSERT INTO audit_logs (Action_Type, Student_ID)
+    VALUES (CONCAT('Registration done for Event ID ', evt_id), NEW.Student_ID);
+
+    CALL BumpEventStats(evt_id, 1, NEW.Payment_Status, 1, 0, 0, 0, 0);
+END$$
+DELIMITER ;
+
+-- Trigger 14: Registrations — move counters when payment status or team changes
+-- (ProcessCancellation inserts into Cancellations first and then sets Payment_Status = 'Cancelled';
+-- the status move is counted here, where it actually happens.)
+DROP TRIGGER IF EXISTS after_registration_update;
+DELIMITER $$
+CREATE TRIGGER after_registration_update
+AFTER UPDATE ON registrations
+FOR EACH ROW
+BEGIN
+    DECLARE old_evt INT;
+    DECLARE new_evt INT;
+
+    IF NOT (OLD.Payment_Status <=> NEW.Payment_Status) OR NOT (OLD.PTeam_ID <=> NEW.PTeam_ID) THEN
+        SELECT Event_ID INTO old_evt FROM participating_team WHERE PTeam_ID = OLD.PTeam_ID;
+        SELECT Event_ID INTO new_evt FROM participating_team WHERE PTeam_ID = NEW.PTeam_ID;
+        CALL BumpEventStats(old_evt, -1, OLD.Payment_Status, -1, 0, 0, 0, 0);
+        CALL BumpEventStats(new_evt, 1, NEW.Payment_Status, 1, 0, 0, 0, 0);
+    END IF;
+END$$
+DELIMITER ;
+
+-- Trigger 8: Feedback — after insert, add entry to audit log and accumulate the rating
+DROP TRIGGER IF EXISTS after_feedback_insert;
+DELIMITER $$
+CREATE TRIGGER after_feedback_insert
+AFTER INSERT ON feedback
+FOR EACH ROW
+BEGIN
+    INSERT INTO audit_logs (Action_Type, Student_ID)
+    VALUES (CONCAT('Feedback submitted for Event ID ', NEW.Event_ID), NEW.Student_ID);
+
+    CALL BumpEventStats(NEW.Event_ID, 0, NULL, 0, 0, IFNULL(NEW.Rating, 0), NEW.Rating IS NOT NULL, 0);
+END$$
+DELIMITER ;
+
+-- Trigger 11: Grievances — after insert, log grievance and count it
+DROP TRIGGER IF EXISTS after_grievance_insert;
+DELIMITER $$
+CREATE TRIGGER after_grievance_insert
+AFTER INSERT ON grievances
+FOR EACH ROW
+BEGIN
+    INSERT INTO audit_logs (Action_Type, Student_ID)
+    VALUES (CONCAT('Grievance submitted for Event ID ', NEW.Event_ID), NEW.Student_ID);
+
+    CALL BumpEventStats(NEW.Event_ID, 0, NULL, 0, 0, 0, 0, 1);
+END$$
+DELIMITER ;
+
+-- F-1: Get Total Registrations (O(1) from Event_Stats)
+DROP FUNCTION IF EXISTS GetTotalRegistrations;
+DELIMITER $$
+CREATE FUNCTION GetTotalRegistrations(event_id_in INT)
+RETURNS INT
+READS SQL DATA
+BEGIN
+    DECLARE reg_count INT;
+    SELECT Total_Registrations INTO reg_count
+    FROM Event_Stats
+    WHERE Event_ID = event_id_in;
+    RETURN IFNULL(reg_count, 0);
+END$$
+DELIMITER ;
+
+-- F-2: Get Average Event Rating (O(1) from Event_Stats)
+DROP FUNCTION IF EXISTS GetAvgEventRating;
+DELIMITER $$
+CREATE FUNCTION GetAvgEventRating(event_id_in INT)
+RETURNS DECIMAL(3, 2)
+READS SQL DATA
+BEGIN
+    DECLARE avg_rating DECIMAL(3, 2);
+    SELECT IF(Rating_Count > 0, Rating_Sum / Rating_Count, NULL) INTO avg_rating
+    FROM Event_Stats
+    WHERE Event_ID = event_id_in;
+    RETURN IFNULL(avg_rating, 0.00);
+END$$
+DELIMITER ;
+
+-- F-7: Get Registration Count by Payment Status (O(1) for the tracked statuses)
+DROP FUNCTION IF EXISTS GetRegistrationCountByPaymentStatus;
+DELIMITER $$
+CREATE FUNCTION GetRegistrationCountByPaymentStatus(
+    event_id_in INT,
+    status_in VARCHAR(50)
+)
+RETURNS INT
+READS SQL DATA
+BEGIN
+    DECLARE status_count INT;
+    IF status_in IN ('Paid', 'Pending', 'Cancelled') THEN
+        SELECT CASE status_in
+                   WHEN 'Paid' THEN Paid_Count
+                   WHEN 'Pending' THEN Pending_Count
+                   ELSE Cancelled_Count
+               END INTO status_count
+        FROM Event_Stats
+        WHERE Event_ID = event_id_in;
+    ELSE
+        SELECT COUNT(r.Registration_ID) INTO status_count
+        FROM Registrations r
+        JOIN Participating_Team pt ON r.PTeam_ID = pt.PTeam_ID
+        WHERE pt.Event_ID = event_id_in
+          AND r.Payment_Status = status_in;
+    END IF;
+    RETURN IFNULL(status_count, 0);
+END$$
+DELIMITER ;
+
+-- P-5: Generate Event Report (counters from Event_Stats instead of per-row function calls)
+DROP PROCEDURE IF EXISTS GenerateEventReport;
+DELIMITER $$
+CREATE PROCEDURE GenerateEventReport(IN event_id_in INT)
+BEGIN
+    SELECT e.Event_ID, e.Event_Name, e.Date, e.Event_Type, e.Budget, v.Venue_Name, v.Capacity, c.Club_Name AS Organizing_Club, f.Name AS Faculty_Incharge,
+        IFNULL(s.Total_Registrations, 0) AS Total_Registrations,
+        CAST(IF(s.Rating_Count > 0, s.Rating_Sum / s.Rating_Count, 0) AS DECIMAL(3, 2)) AS Avg_Rating,
+        IFNULL(s.Grievance_Count, 0) AS Total_Grievances,
+        (SELECT GROUP_CONCAT(r.Resource_Name, ' (Qty: ', r.Quantity, ')' SEPARATOR ' | ')
+         FROM Resources r WHERE r.Event_ID = e.Event_ID) AS Resources_Used
+    FROM Event e
+    JOIN Venue v ON e.Venue_ID = v.Venue_ID
+    JOIN Clubs c ON e.Club_ID = c.Club_ID
+    JOIN Faculty f ON e.Faculty_ID = f.Faculty_ID
+    LEFT JOIN Event_Stats s ON e.Event_ID = s.Event_ID
+    WHERE e.Event_ID = event_id_in;
+END$$
+DELIMITER ;
+
+-- Backfill counters for data loaded before this migration (same as S-2)
+INSERT INTO Event_Stats (Event_ID, Total_Registrations, Paid_Count, Pending_Count, Cancelled_Count,
+                         Team_Count, Rating_Sum, Rating_Count, Grievance_Count)
+SELECT Event_ID, Total_Registrations, Paid_Count, Pending_Count, Cancelled_Count,
+       Team_Count, Rating_Sum, Rating_Count, Grievance_Count
+FROM Event_Stats_Actual;
@@ -0,0 +1,48 @@
+-- V003: Bulk cancellation support
+-- db/cancellations.py cancels a whole set of registrations with a few set-based statements.
+-- While it runs it sets the session variable @bulk_cancellation = 1, and the per-row triggers
+-- below step aside: the audit rows and Event_Stats deltas are written once for the whole set.
+-- Every other session (and ProcessCancellation) leaves the variable NULL and behaves as before.
+
+-- Trigger 10: Cancellations — after insert, log cancellation (skipped for bulk cancellations)
+DROP TRIGGER IF EXISTS after_cancellation_insert;
+DELIMITER $$
+CREATE TRIGGER after_cancellation_insert
+AFTER INSERT ON cancellations
+FOR EACH ROW
+BEGIN
+    DECLARE stud_id INT;
+    DECLARE evt_id INT;
+
+    IF IFNULL(@bulk_cancellation, 0) = 0 THEN
+        SELECT Student_ID, pt.Event_ID
+        INTO stud_id, evt_id
+        FROM registrations r
+        JOIN participating_team pt ON r.PTeam_ID = pt.PTeam_ID
+        WHERE r.Registration_ID = NEW.Reg_ID;
+
+        INSERT INTO audit_logs (Action_Type, Student_ID)
+        VALUES (CONCAT('Registration cancelled for Event ID ', evt_id), stud_id);
+    END IF;
+END$$
+DELIMITER ;
+
+-- Trigger 14: Registrations — move counters when payment status or team changes (skipped for bulk cancellations)
+DROP TRIGGER IF EXISTS after_registration_update;
+DELIMITER $$
+CREATE TRIGGER after_registration_update
+AFTER UPDATE ON registrations
+FOR EACH ROW
+BEGIN
+    DECLARE old_evt INT;
+    DECLARE new_evt INT;
+
+    IF IFNULL(@bulk_cancellation, 0) = 0
+       AND (NOT (OLD.Payment_Status <=> NEW.Payment_Status) OR NOT (OLD.PTeam_ID <=> NEW.PTeam_ID)) THEN
+        SELECT Event_ID INTO old_evt FROM participating_team WHERE PTeam_ID = OLD.PTeam_ID;
+        SELECT Event_ID INTO new_evt FROM participating_team WHERE PTeam_ID = NEW.PTeam_ID;
+        CALL BumpEventStats(old_evt, -1, OLD.Payment_Status, -1, 0, 0, 0, 0);
+        CALL BumpEventStats(new_evt, 1, NEW.Payment_Status, 1, 0, 0, 0, 0);
+    END IF;
+END$$
+DELIMITER ;
@@ -0,0 +1,69 @@
+-- V004: Audit_Logs range-partitioned by month on Performed_On, plus the archive manifest
+-- Appends always land in the newest partitions. Time-range queries read only the partitions
+-- they cover. Cold months can leave the live table whole (db/audit.py archives them to
+-- compressed files with EXCHANGE PARTITION, never with DELETE, so before_audit_delete still
+-- holds for every row).
+--
+-- InnoDB does not allow foreign keys on partitioned tables, so the three actor foreign keys
+-- are dropped; rows are only ever written by the triggers with ids taken from the rows that
+-- fired them, and the CHECK on exactly one actor stays in place.
+
+-- Drop the actor foreign keys (their names were generated by the server, so look them up)
+SET @drop_audit_fks = (
+    SELECT CONCAT('ALTER TABLE Audit_Logs ',
+                  GROUP_CONCAT(CONCAT('DROP FOREIGN KEY `', CONSTRAINT_NAME, '`') SEPARATOR ', '))
+    FROM information_schema.TABLE_CONSTRAINTS
+    WHERE TABLE_SCHEMA = DATABASE() AND LOWER(TABLE_NAME) = 'audit_logs' AND CONSTRAINT_TYPE = 'FOREIGN KEY'
+);
+SET @drop_audit_fks = IFNULL(@drop_audit_fks, 'DO 0');
+PREPARE drop_audit_fks FROM @drop_audit_fks;
+EXECUTE drop_audit_fks;
+DEALLOCATE PREPARE drop_audit_fks;
+
+-- The partitioning column must be part of every unique key
+ALTER TABLE Audit_Logs
+    MODIFY Performed_On TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (Log_ID, Performed_On),
+    ADD INDEX idx_audit_time (Performed_On, Log_ID),
+    ADD INDEX idx_audit_student_time (Student_ID, Performed_On),
+    ADD INDEX idx_audit_faculty_time (Faculty_ID, Performed_On),
+    ADD INDEX idx_audit_admin_time (Admin_ID, Performed_On);
+
+-- One partition per month from the oldest row to three months ahead, then a catch-all.
+-- Named pYYYYMM; db/audit.ensure_partitions() keeps adding months ahead of time.
+SET SESSION group_concat_max_len = 1048576;
+SET SESSION cte_max_recursion_depth = 10000;
+SET @audit_partitions = (
+    WITH RECURSIVE months (Month_Start) AS (
+        SELECT DATE_FORMAT(LEAST(IFNULL((SELECT MIN(Performed_On) FROM Audit_Logs), NOW()), NOW()), '%Y-%m-01')
+        UNION ALL
+        SELECT DATE_FORMAT(DATE_ADD(Month_Start, INTERVAL 1 MONTH), '%Y-%m-01') FROM months
+        WHERE Month_Start < DATE_FORMAT(DATE_ADD(NOW(), INTERVAL 3 MONTH), '%Y-%m-01')
+    )
+    SELECT CONCAT(
+        'ALTER TABLE Audit_Logs PARTITION BY RANGE (UNIX_TIMESTAMP(Performed_On)) (',
+        GROUP_CONCAT(
+            CONCAT('PARTITION p', DATE_FORMAT(Month_Start, '%Y%m'),
+                   ' VALUES LESS THAN (UNIX_TIMESTAMP(''', DATE_ADD(Month_Start, INTERVAL 1 MONTH), ' 00:00:00''))')
+            ORDER BY Month_Start SEPARATOR ', '),
+        ', PARTITION p_future VALUES LESS THAN MAXVALUE)')
+    FROM months
+);
+PREPARE partition_audit_logs FROM @audit_partitions;
+EXECUTE partition_audit_logs;
+DEALLOCATE PREPARE partition_audit_logs;
+
+-- One row per archived month: where its rows went and how to check them
+CREATE TABLE Audit_Archive (
+    Partition_Name VARCHAR(20) PRIMARY KEY,
+    Range_Start DATETIME NOT NULL,
+    Range_End DATETIME NOT NULL,
+    Row_Count INT NOT NULL,
+    Min_Log_ID INT,
+    Max_Log_ID INT,
+    Path VARCHAR(500) NOT NULL,
+    Format VARCHAR(10) NOT NULL,
+    SHA256 CHAR(64) NOT NULL,
+    Archived_On TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,99 @@
+-- V005: Change feed for the dashboard's live snapshot
+-- Every change that can alter an upcoming event's listing or metrics appends one Change_Log row
+-- naming the event (or NULL when many events may be affected, e.g. a venue rename). Change_ID
+-- grows monotonically, so db/change_feed.py asks "what changed since version N?" and reloads only
+-- those events. The registration, team, feedback, grievance and cancellation triggers all flow
+-- through Event_Stats, so the counters' own triggers cover them (bulk cancellation included).
+-- Appends only, no shared counter row: concurrent writers never wait on each other here.
+
+CREATE TABLE Change_Log (
+    Change_ID BIGINT AUTO_INCREMENT PRIMARY KEY,
+    Table_Name VARCHAR(40) NOT NULL,
+    Event_ID INT,
+    Changed_On TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    INDEX idx_change_table (Table_Name, Change_ID),
+    INDEX idx_change_time (Changed_On)
+);
+
+-- Current version of each tracked table
+CREATE OR REPLACE VIEW Table_Versions AS
+SELECT Table_Name, MAX(Change_ID) AS Version, MAX(Changed_On) AS Last_Changed
+FROM Change_Log
+GROUP BY Table_Name;
+
+-- Trigger 15: Event_Stats — log new counters (a new event, or a rebuild)
+DROP TRIGGER IF EXISTS after_event_stats_insert;
+DELIMITER $$
+CREATE TRIGGER after_event_stats_insert
+AFTER INSERT ON event_stats
+FOR EACH ROW
+BEGIN
+    INSERT INTO Change_Log (Table_Name, Event_ID) VALUES ('Event_Stats', NEW.Event_ID);
+END$$
+DELIMITER ;
+
+-- Trigger 16: Event_Stats — log counter moves (registrations, teams, feedback, grievances)
+DROP TRIGGER IF EXISTS after_event_stats_update;
+DELIMITER $$
+CREATE TRIGGER after_event_stats_update
+AFTER UPDATE ON event_stats
+FOR EACH ROW
+BEGIN
+    INSERT INTO Change_Log (Table_Name, Event_ID) VALUES ('Event_Stats', NEW.Event_ID);
+END$$
+DELIMITER ;
+
+-- Trigger 17: Event_Stats — log removed counters (a rebuild)
+DROP TRIGGER IF EXISTS after_event_stats_delete;
+DELIMITER $$
+CREATE TRIGGER after_event_stats_delete
+AFTER DELETE ON event_stats
+FOR EACH ROW
+BEGIN
+    INSERT INTO Change_Log (Table_Name, Event_ID) VALUES ('Event_Stats', OLD.Event_ID);
+END$$
+DELIMITER ;
+
+-- Trigger 18: Event — log edits (date, time, venue, faculty, name)
+DROP TRIGGER IF EXISTS after_event_update;
+DELIMITER $$
+CREATE TRIGGER after_event_update
+AFTER UPDATE ON event
+FOR EACH ROW
+BEGIN
+    INSERT INTO Change_Log (Table_Name, Event_ID) VALUES ('Event', NEW.Event_ID);
+END$$
+DELIMITER ;
+
+-- Trigger 19: Event — log deletions
+DROP TRIGGER IF EXISTS after_event_delete;
+DELIMITER $$
+CREATE TRIGGER after_event_delete
+AFTER DELETE ON event
+FOR EACH ROW
+BEGIN
+    INSERT INTO Change_Log (Table_Name, Event_ID) VALUES ('Event', OLD.Event_ID);
+END$$
+DELIMITER ;
+
+-- Trigger 20: Venue — names and capacities show on every event held there
+DROP TRIGGER IF EXISTS after_venue_update;
+DELIMITER $$
+CREATE TRIGGER after_venue_update
+AFTER UPDATE ON venue
+FOR EACH ROW
+BEGIN
+    INSERT INTO Change_Log (Table_Name, Event_ID) VALUES ('Venue', NULL);
+END$$
+DELIMITER ;
+
+-- Trigger 21: Faculty — names show on every event they are in charge of
+DROP TRIGGER IF EXISTS after_faculty_update;
+DELIMITER $$
+CREATE TRIGGER after_faculty_update
+AFTER UPDATE ON faculty
+FOR EACH ROW
+BEGIN
+    INSERT INTO Change_Log (Table_Name, Event_ID) VALUES ('Faculty', NULL);
+END$$
+DELIMITER ;
@@ -0,0 +1,7 @@
+-- V006: Covering index for a student's own registrations (db/students.py, Registration page cancel tab)
+-- Equality on Student_ID, the status filter and the join key all come from the index alone; the
+-- primary key (Registration_ID) is implicitly part of it. It also serves the Student_ID foreign
+-- key, so the server drops the single-column index it created for that key.
+
+-- I-7: Active registrations of one student (Student_ID = ? AND Payment_Status <> 'Cancelled')
+CREATE INDEX idx_reg_student_status ON Registrations (Student_ID, Payment_Status, PTeam_ID, Reg_Date);
@@ -0,0 +1,80 @@
+-- V007: Cheaper integrity checks on the registration write path
+-- PTeam_Members records the event it is for, and a unique (Event_ID, Student_ID) key replaces
+-- Trigger 7's COUNT join over pteam_members/participating_team: one index probe per member,
+-- taken by InnoDB itself, so two concurrent registrations of the same student cannot both pass.
+-- db/registrations.py reports a key violation with Trigger 7's message.
+--
+-- register_team() also sets @registration_batch = 1 for its own inserts: it checks the event
+-- once and writes the audit rows and the Event_Stats delta once for the whole team, so Triggers
+-- 4 and 9 step aside. Every other session leaves the variable NULL and behaves as before.
+--
+-- Creating the unique key fails if existing rows already break the rule (possible only for data
+-- loaded with the triggers disabled); list them with
+--   SELECT Event_ID, Student_ID, COUNT(*) FROM PTeam_Members GROUP BY Event_ID, Student_ID HAVING COUNT(*) > 1;
+
+ALTER TABLE PTeam_Members ADD COLUMN Event_ID INT;
+
+UPDATE PTeam_Members m
+JOIN Participating_Team pt ON m.PTeam_ID = pt.PTeam_ID
+SET m.Event_ID = pt.Event_ID;
+
+-- I-8: One team per student per event (NULL events, i.e. unknown teams, are not constrained)
+ALTER TABLE PTeam_Members ADD UNIQUE KEY uq_member_event (Event_ID, Student_ID);
+
+-- Trigger 7: PTeam Members — record the team's event (duplicate participation is rejected by uq_member_event)
+DROP TRIGGER IF EXISTS before_pteam_member_insert;
+DELIMITER $$
+CREATE TRIGGER before_pteam_member_insert
+BEFORE INSERT ON pteam_members
+FOR EACH ROW
+BEGIN
+    IF NEW.Event_ID IS NULL THEN
+        SELECT Event_ID INTO NEW.Event_ID FROM participating_team WHERE PTeam_ID = NEW.PTeam_ID;
+    END IF;
+END$$
+DELIMITER ;
+
+-- Trigger 4: Registrations — prevent registration for invalid or past event (checked once per team by batch writers)
+DROP TRIGGER IF EXISTS before_registration_insert;
+DELIMITER $$
+CREATE TRIGGER before_registration_insert
+BEFORE INSERT ON registrations
+FOR EACH ROW
+BEGIN
+    DECLARE ev_date DATE;
+
+    IF IFNULL(@registration_batch, 0) = 0 THEN
+        SELECT Date INTO ev_date FROM event e
+        JOIN participating_team p ON e.Event_ID = p.Event_ID
+        WHERE p.PTeam_ID = NEW.PTeam_ID;
+
+        IF ev_date IS NULL THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Cannot register: Event does not exist.';
+        ELSEIF ev_date < CURDATE() THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Cannot register: Event date is in the past.';
+        END IF;
+    END IF;
+END$$
+DELIMITER ;
+
+-- Trigger 9: Registrations — after insert, add entry to audit log and count it (written once per team by batch writers)
+DROP TRIGGER IF EXISTS after_registration_insert;
+DELIMITER $$
+CREATE TRIGGER after_registration_insert
+AFTER INSERT ON registrations
+FOR EACH ROW
+BEGIN
+    DECLARE evt_id INT;
+
+    IF IFNULL(@registration_batch, 0) = 0 THEN
+        SELECT Event_ID INTO evt_id FROM participating_team WHERE PTeam_ID = NEW.PTeam_ID;
+
+        INSERT INTO audit_logs (Action_Type, Student_ID)
+        VALUES (CONCAT('Registration done for Event ID ', evt_id), NEW.Student_ID);
+
+        CALL BumpEventStats(evt_id, 1, NEW.Payment_Status, 1, 0, 0, 0, 0);
+    END IF;
+END$$
+DELIMITER ;
@@ -0,0 +1,29 @@
+-- V008: Change_Log rows for everything the venue calendar shows (db/calendar.py)
+-- The calendar reads only Table_Name IN ('Event', 'Venue', 'Clubs') rows (idx_change_table), so
+-- registration traffic on Event_Stats never wakes it. New events were only logged through their
+-- Event_Stats row, and club renames not at all; both are logged under their own table here.
+
+-- Trigger 12: Event — create its counters row and log the new event
+DROP TRIGGER IF EXISTS after_event_insert;
+DELIMITER $$
+CREATE TRIGGER after_event_insert
+AFTER INSERT ON event
+FOR EACH ROW
+BEGIN
+    INSERT INTO Event_Stats (Event_ID) VALUES (NEW.Event_ID)
+    ON DUPLICATE KEY UPDATE Event_ID = Event_ID;
+
+    INSERT INTO Change_Log (Table_Name, Event_ID) VALUES ('Event', NEW.Event_ID);
+END$$
+DELIMITER ;
+
+-- Trigger 22: Clubs — names show on every event they organise
+DROP TRIGGER IF EXISTS after_clubs_update;
+DELIMITER $$
+CREATE TRIGGER after_clubs_update
+AFTER UPDATE ON clubs
+FOR EACH ROW
+BEGIN
+    INSERT INTO Change_Log (Table_Name, Event_ID) VALUES ('Clubs', NULL);
+END$$
+DELIMITER ;
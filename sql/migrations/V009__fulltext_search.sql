@@ -0,0 +1,9 @@
+-- V009: FULLTEXT indexes for searching grievance and feedback text (db/search.py, Search page)
+-- Without them a text search is a LIKE '%word%' scan of every row. The first FULLTEXT index on
+-- a table adds its hidden FTS_DOC_ID column, so each statement rebuilds its table once.
+
+-- I-9: Grievance text search (MATCH (Grievance_Text) AGAINST ...)
+ALTER TABLE Grievances ADD FULLTEXT INDEX ft_grievance_text (Grievance_Text);
+
+-- I-10: Feedback comment search (MATCH (Comments) AGAINST ...)
+ALTER TABLE Feedback ADD FULLTEXT INDEX ft_feedback_comments (Comments);
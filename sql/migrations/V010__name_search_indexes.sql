@@ -0,0 +1,19 @@
+-- V010: Name indexes for typeahead lookups (db/typeahead.py)
+-- A prefix match (Name LIKE 'abc%') is a range read on these, and ORDER BY name, key follows the
+-- index (the primary key is implicitly its last column), so the top k rows are read and nothing
+-- is sorted, whatever the size of the table.
+
+-- I-11: Events by name prefix; Date also filters upcoming events and breaks ties between repeated names
+CREATE INDEX idx_event_name_date ON Event (Event_Name, Date);
+
+-- I-12: Clubs by name prefix
+CREATE INDEX idx_club_name ON Clubs (Club_Name);
+
+-- I-13: Venues by name prefix
+CREATE INDEX idx_venue_name ON Venue (Venue_Name);
+
+-- I-14: Faculty by name prefix
+CREATE INDEX idx_faculty_name ON Faculty (Name);
+
+-- I-15: Students by name prefix
+CREATE INDEX idx_student_name ON Students (Name);
@@ -0,0 +1,75 @@
+-- V011: Event_Stats counters for deleted rows
+-- V002 only counted inserts and updates, so deleting a registration, feedback, grievance or team
+-- left its counts behind in Event_Stats until the next S-2 rebuild. These triggers take them back
+-- with negative deltas. Foreign key actions fire no triggers: the registrations a team delete
+-- detaches (fk_reg_pteam, ON DELETE SET NULL) are taken back by the team's own trigger.
+
+-- Trigger 23: Registrations — after delete, uncount it
+DROP TRIGGER IF EXISTS after_registration_delete;
+DELIMITER $$
+CREATE TRIGGER after_registration_delete
+AFTER DELETE ON registrations
+FOR EACH ROW
+BEGIN
+    DECLARE evt_id INT;
+    SELECT Event_ID INTO evt_id FROM participating_team WHERE PTeam_ID = OLD.PTeam_ID;
+
+    CALL BumpEventStats(evt_id, -1, OLD.Payment_Status, -1, 0, 0, 0, 0);
+END$$
+DELIMITER ;
+
+-- Trigger 24: Participating Team — before delete, uncount the team and the registrations it detaches
+DROP TRIGGER IF EXISTS before_pteam_delete;
+DELIMITER $$
+CREATE TRIGGER before_pteam_delete
+BEFORE DELETE ON participating_team
+FOR EACH ROW
+BEGIN
+    DECLARE total INT;
+    DECLARE paid INT;
+    DECLARE pending INT;
+    DECLARE cancelled INT;
+    SELECT COUNT(*), IFNULL(SUM(Payment_Status = 'Paid'), 0), IFNULL(SUM(Payment_Status = 'Pending'), 0),
+           IFNULL(SUM(Payment_Status = 'Cancelled'), 0)
+    INTO total, paid, pending, cancelled
+    FROM registrations WHERE PTeam_ID = OLD.PTeam_ID;
+
+    CALL BumpEventStats(OLD.Event_ID, -total, 'Paid', -paid, -1, 0, 0, 0);
+    CALL BumpEventStats(OLD.Event_ID, 0, 'Pending', -pending, 0, 0, 0, 0);
+    CALL BumpEventStats(OLD.Event_ID, 0, 'Cancelled', -cancelled, 0, 0, 0, 0);
+END$$
+DELIMITER ;
+
+-- Trigger 25: Feedback — after delete, take back the rating
+DROP TRIGGER IF EXISTS after_feedback_delete;
+DELIMITER $$
+CREATE TRIGGER after_feedback_delete
+AFTER DELETE ON feedback
+FOR EACH ROW
+BEGIN
+    CALL BumpEventStats(OLD.Event_ID, 0, NULL, 0, 0, -IFNULL(OLD.Rating, 0), -(OLD.Rating IS NOT NULL), 0);
+END$$
+DELIMITER ;
+
+-- Trigger 26: Grievances — after delete, uncount it
+DROP TRIGGER IF EXISTS after_grievance_delete;
+DELIMITER $$
+CREATE TRIGGER after_grievance_delete
+AFTER DELETE ON grievances
+FOR EACH ROW
+BEGIN
+    CALL BumpEventStats(OLD.Event_ID, 0, NULL, 0, 0, 0, 0, -1);
+END$$
+DELIMITER ;
+
+-- Repair the drift earlier deletes left behind (same values as S-2, without emptying the table)
+UPDATE Event_Stats s
+JOIN Event_Stats_Actual a ON a.Event_ID = s.Event_ID
+SET s.Total_Registrations = a.Total_Registrations,
+    s.Paid_Count = a.Paid_Count,
+    s.Pending_Count = a.Pending_Count,
+    s.Cancelled_Count = a.Cancelled_Count,
+    s.Team_Count = a.Team_Count,
+    s.Rating_Sum = a.Rating_Sum,
+    s.Rating_Count = a.Rating_Count,
+    s.Grievance_Count = a.Grievance_Count;